@@ -0,0 +1,107 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import ADMIN, User
+
+ENDPOINTS = (
+    "/api/v1/users/",
+    "/api/v1/users/{username}/",
+    "/api/v1/users/me/",
+    "/api/v1/categories/",
+    "/api/v1/genres/",
+    "/api/v1/titles/",
+    "/api/v1/titles/?genre={genre}",
+    "/api/v1/titles/?category={category}",
+    "/api/v1/titles/?year={year}",
+    "/api/v1/titles/?search={search}",
+    "/api/v1/titles/{title}/",
+    "/api/v1/titles/{title}/reviews/",
+    "/api/v1/titles/{title}/reviews/?cursor=",
+    "/api/v1/titles/{title}/reviews/{review}/",
+    "/api/v1/titles/{title}/reviews/{review}/comments/",
+    "/api/v1/titles/{title}/reviews/{review}/comments/?cursor=",
+    "/api/v1/titles/{title}/reviews/{review}/comments/{comment}/",
+)
+FULL_SCAN = re.compile(r"^SCAN (?!.*\b(USING\b.*\bINDEX|VIRTUAL TABLE)\b)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет EXPLAIN QUERY PLAN для запросов каждого эндпоинта API "
+        "и завершается ошибкой, если отфильтрованная выборка читает "
+        "таблицу целиком."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN поддерживается для SQLite.")
+        with transaction.atomic():
+            failures = self.explain_all(options["verbosity"])
+            transaction.set_rollback(True)
+        if failures:
+            raise CommandError(
+                "Полный просмотр таблицы: " + ", ".join(sorted(failures))
+            )
+        self.stdout.write(
+            self.style.SUCCESS("Все эндпоинты используют индексы")
+        )
+
+    def create_objects(self):
+        admin = User.objects.create(
+            username="explain-admin",
+            email="explain-admin@yamdb.fake",
+            role=ADMIN,
+        )
+        category = Category.objects.create(name="Explain", slug="explain")
+        genre = Genre.objects.create(name="Explain", slug="explain")
+        title = Title.objects.create(name="Explain", year=2000,
+                                     category=category)
+        title.genre.add(genre)
+        review = Review.objects.create(title=title, author=admin,
+                                       text="Explain", score=5)
+        comment = Comment.objects.create(review=review, author=admin,
+                                         text="Explain")
+        return admin, {
+            "username": admin.username,
+            "category": category.slug,
+            "genre": genre.slug,
+            "year": title.year,
+            "search": title.name,
+            "title": title.id,
+            "review": review.id,
+            "comment": comment.id,
+        }
+
+    def explain_all(self, verbosity):
+        admin, kwargs = self.create_objects()
+        client = APIClient()
+        client.force_authenticate(admin)
+        failures = set()
+        for pattern in ENDPOINTS:
+            url = pattern.format(**kwargs)
+            with CaptureQueriesContext(connection) as context:
+                client.get(url)
+            for query in context.captured_queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                problems = self.explain(query["sql"])
+                if problems:
+                    failures.add(pattern)
+                if problems or verbosity > 1:
+                    self.stdout.write(f"{pattern}\n  {query['sql']}")
+                    for line in problems:
+                        self.stdout.write(self.style.ERROR(f"    {line}"))
+        return failures
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = [row[-1] for row in cursor.fetchall()]
+        if " WHERE " not in sql:
+            return []
+        return [line for line in plan if FULL_SCAN.match(line)]
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновляет статистику планировщика SQLite (PRAGMA optimize или "
+        "полный ANALYZE) и переносит журнал WAL в файл базы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="Псевдоним базы из DATABASES.",
+        )
+        parser.add_argument(
+            "--analyze", action="store_true",
+            help="Пересобрать статистику всех таблиц и индексов.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=0,
+            help="Повторять каждые N секунд; 0 — выполнить один раз.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError("Команда поддерживает только SQLite.")
+        try:
+            while True:
+                self.optimize(connection, options["analyze"])
+                if not options["interval"]:
+                    break
+                connection.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+    def optimize(self, connection, analyze):
+        statement = "ANALYZE" if analyze else "PRAGMA optimize"
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+            message = f"{statement}: {time.perf_counter() - started:.2f} с"
+            cursor.execute("PRAGMA journal_mode")
+            if cursor.fetchone()[0] == "wal":
+                cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                busy, wal_pages, moved = cursor.fetchone()
+                message += (
+                    f", страниц WAL перенесено: {moved} из {wal_pages}"
+                )
+                if busy:
+                    message += " (база занята, перенос не завершён)"
+        self.stdout.write(self.style.SUCCESS(message))
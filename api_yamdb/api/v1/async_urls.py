@@ -0,0 +1,25 @@
+"""Маршруты API под ASGI: горячие списки каталога асинхронные
+(см. async_views) и идут раньше обычных маршрутов api.v1.urls.
+
+Под WSGI эти маршруты не подключаются: там асинхронное представление
+выполнялось бы через async_to_sync и только замедляло бы запрос.
+"""
+from django.urls import path, re_path
+
+from . import urls
+from .async_views import (
+    category_list,
+    genre_list,
+    review_list,
+    title_detail,
+    title_list,
+)
+
+urlpatterns = [
+    path("titles/", title_list),
+    re_path(r"^titles/(?P<pk>\d+)/$", title_detail),
+    path("categories/", category_list),
+    path("genres/", genre_list),
+    re_path(r"^titles/(?P<title_id>\d+)/reviews/$", review_list),
+    *urls.urlpatterns,
+]
@@ -0,0 +1,151 @@
+"""Асинхронные точки входа для горячих списков каталога под ASGI.
+
+В Django 3.2 синхронные представления под ASGI выполняются в одном
+общем потоке, поэтому запросы к каталогу идут строго по очереди. DRF
+3.12 асинхронных представлений не умеет, поэтому здесь вьюсет
+выполняется целиком, включая ORM и рендеринг, за один переход в
+ограниченный пул потоков `ASYNC_DB_THREADS`. Пока один запрос ждёт
+базу, остальные обслуживаются параллельно.
+
+Записи (POST/PATCH/DELETE) по-прежнему идут в общий поток, как и
+раньше. Закешированные списки категорий и жанров отдаются прямо из
+цикла событий, без перехода в поток, если кеш ответов в памяти
+процесса; чтение файлового или сетевого кеша блокирует, поэтому с ним
+кеш проверяется в том же переходе в пул, что и вьюсет.
+
+Маршруты подключаются только под ASGI (api.v1.async_urls): под WSGI
+async_to_sync вокруг каждого запроса лишь добавлял бы задержку, там
+работают обычные вьюсеты.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .cache import get_cache, response_key
+from .views import (
+    CategoryViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+
+READ_METHODS = ("GET", "HEAD")
+# Кеши, чтение которых не блокирует цикл событий.
+NON_BLOCKING_CACHES = (LocMemCache, DummyCache)
+
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix="db"
+)
+
+
+def in_db_thread(func, *args, **kwargs):
+    """Как обработчик запроса: соединения потока пула закрываются по
+    тем же правилам `CONN_MAX_AGE`, что и в обычном запросе."""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # run_in_executor не переносит contextvars, а по ним, например,
+    # api_yamdb.replicas выбирает базу для чтения.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        db_executor,
+        functools.partial(context.run, in_db_thread, func, *args, **kwargs),
+    )
+
+
+def render(view, request, **kwargs):
+    """Выполняет вьюсет и отдаёт уже отрисованный HttpResponse: у ответа
+    DRF обработчик Django снова вызвал бы render() в общем потоке."""
+    response = view(request, **kwargs)
+    if not hasattr(response, "render"):
+        return response
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+def cached_list(model, request):
+    """Ответ из кеша списков без перехода в поток или None.
+
+    Только для анонимных JSON-запросов: с токеном DRF должен проверить
+    его, а браузеру нужна HTML-страница API.
+    """
+    if (
+        "HTTP_AUTHORIZATION" in request.META
+        or "text/html" in request.META.get("HTTP_ACCEPT", "")
+        or "format" in request.GET
+    ):
+        return None
+    data = get_cache().get(response_key(model, request))
+    if data is None:
+        return None
+    return HttpResponse(
+        JSONRenderer().render(data), content_type="application/json"
+    )
+
+
+def cached_or_render(model, view, request, **kwargs):
+    response = cached_list(model, request)
+    if response is not None:
+        return response
+    return render(view, request, **kwargs)
+
+
+def async_viewset(viewset, actions, cached_model=None):
+    view = viewset.as_view(actions)
+    in_request_thread = sync_to_async(render, thread_sensitive=True)
+
+    async def async_view(request, **kwargs):
+        if request.method not in READ_METHODS:
+            return await in_request_thread(view, request, **kwargs)
+        if cached_model is None:
+            return await run_in_db_thread(render, view, request, **kwargs)
+        if not isinstance(get_cache(), NON_BLOCKING_CACHES):
+            return await run_in_db_thread(
+                cached_or_render, cached_model, view, request, **kwargs
+            )
+        response = cached_list(cached_model, request)
+        if response is not None:
+            return response
+        return await run_in_db_thread(render, view, request, **kwargs)
+
+    async_view.csrf_exempt = True
+    async_view.cls = viewset
+    return async_view
+
+
+title_list = async_viewset(TitleViewSet, {"get": "list", "post": "create"})
+title_detail = async_viewset(TitleViewSet, {
+    "get": "retrieve",
+    "put": "update",
+    "patch": "partial_update",
+    "delete": "destroy",
+})
+category_list = async_viewset(
+    CategoryViewSet,
+    {"get": "list", "post": "create"},
+    cached_model=CategoryViewSet.queryset.model,
+)
+genre_list = async_viewset(
+    GenreViewSet,
+    {"get": "list", "post": "create"},
+    cached_model=GenreViewSet.queryset.model,
+)
+review_list = async_viewset(ReviewViewSet, {"get": "list", "post": "create"})
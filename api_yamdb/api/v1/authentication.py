@@ -0,0 +1,202 @@
+"""JWT-аутентификация без запроса пользователя на каждый запрос.
+
+`get_token` записывает в access-токен имя, роль, флаги `is_staff`,
+`is_superuser` и версию токенов пользователя. По таким токенам
+`RoleClaimsJWTAuthentication` собирает `ClaimsUser` прямо из
+утверждений; в базу идёт только промах кеша версий. Версия меняется при
+смене роли, имени, флагов, при деактивации и выходе, после чего старые
+токены отклоняются. Токены без этих утверждений проверяются как обычно.
+Класс подключается по выбору (см. `TOKEN_VERSION_MEMCACHED` в настройках):
+кеш версий `TOKEN_VERSION_CACHE_ALIAS` должен быть общим для всех
+процессов, что проверяет api.v1.checks.
+
+Проверенные токены хранятся в `token_cache` процесса до истечения срока,
+так что повторный запрос с тем же токеном не проверяет подпись заново.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import ClaimsUser, User
+
+ROLE_CLAIMS = ("username", "role", "is_staff", "is_superuser")
+VERSION_CLAIM = "ver"
+REVOKED = -1
+
+
+def get_cache():
+    return caches[settings.TOKEN_VERSION_CACHE_ALIAS]
+
+
+def version_key(user_id):
+    return f"token-version:{user_id}"
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя; REVOKED, если его нет или он
+    деактивирован."""
+    cache = get_cache()
+    version = cache.get(version_key(user_id))
+    if version is None:
+        # С основной базы: на реплике отзыв токенов может ещё не появиться.
+        row = (
+            User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id)
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(
+            version_key(user_id), version,
+            settings.TOKEN_VERSION_CACHE_TIMEOUT,
+        )
+    return version
+
+
+class TokenCache:
+    """LRU проверенных токенов по sha256 исходной строки.
+
+    Запись живёт до `exp` токена и вытесняется самой старой при
+    переполнении. Версия токена проверяется при каждом запросе отдельно,
+    так что кеш не продлевает жизнь отозванным токенам.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.by_user = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(raw_token):
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, raw_token):
+        key = self.key(raw_token)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+
+    def put(self, raw_token, token):
+        if not self.maxsize:
+            return
+        key = self.key(raw_token)
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        with self.lock:
+            self._discard(key)
+            self.entries[key] = (token["exp"], user_id, token)
+            self.by_user.setdefault(user_id, set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._discard(next(iter(self.entries)))
+
+    def evict_user(self, user_id):
+        with self.lock:
+            for key in list(self.by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.by_user.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self.by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_user[entry[1]]
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+
+def forget_token_version(user_id):
+    """Сбрасывает закешированную версию и токены после коммита."""
+    def forget():
+        get_cache().delete(version_key(user_id))
+        token_cache.evict_user(user_id)
+
+    transaction.on_commit(forget)
+
+
+def revoke_tokens(user_id):
+    User.objects.filter(pk=user_id).update(
+        token_version=F("token_version") + 1
+    )
+    forget_token_version(user_id)
+
+
+def issue_access_token(user):
+    token = AccessToken.for_user(user)
+    for claim in ROLE_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        token = token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            token_cache.put(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if any(
+            claim not in validated_token
+            for claim in (*ROLE_CLAIMS, VERSION_CLAIM)
+        ):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+        if validated_token[VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed(
+                "Token has been revoked", code="token_revoked"
+            )
+        user = ClaimsUser(
+            pk=user_id,
+            token_version=validated_token[VERSION_CLAIM],
+            **{claim: validated_token[claim] for claim in ROLE_CLAIMS},
+        )
+        user._state.adding = False
+        user._state.db = User.objects.db
+        return user
@@ -0,0 +1,120 @@
+"""Пакетное создание произведений.
+
+Слаги категорий и жанров всей пачки разрешаются двумя запросами,
+произведения вставляются одним `bulk_create`, связи с жанрами — ещё
+одним. Ошибочные элементы возвращаются с индексами и не мешают
+сохранить остальные.
+"""
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.exceptions import ValidationError
+
+from reviews import search
+from reviews.models import Category, Genre, Title
+from reviews.suggest import catalog_entry, suggest_index
+
+from .serializers import ErrorMessage, TitleBulkItemSerializer
+
+BULK_LIMIT = 1000
+
+
+def collect_slugs(items):
+    categories, genres = set(), set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get("category"), str):
+            categories.add(item["category"])
+        if isinstance(item.get("genre"), list):
+            genres.update(
+                slug for slug in item["genre"] if isinstance(slug, str)
+            )
+    return categories, genres
+
+
+def validate_items(items):
+    """Возвращает пары (индекс, данные) для корректных элементов и
+    список ошибок вида {"index": ..., "errors": ...} для остальных."""
+    if not isinstance(items, list) or not items:
+        raise ValidationError(ErrorMessage.NOT_A_LIST)
+    if len(items) > BULK_LIMIT:
+        raise ValidationError(
+            ErrorMessage.TOO_MANY_ITEMS.format(limit=BULK_LIMIT)
+        )
+    category_slugs, genre_slugs = collect_slugs(items)
+    context = {
+        "categories": Category.objects.in_bulk(
+            category_slugs, field_name="slug"
+        ),
+        "genres": Genre.objects.in_bulk(genre_slugs, field_name="slug"),
+    }
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"index": index, "errors": serializer.errors})
+    return valid, errors
+
+
+def assign_pks(titles, using):
+    """Проставляет id, если СУБД не возвращает их из bulk_create.
+
+    Вызывается в той же транзакции сразу после вставки: SQLite держит
+    блокировку записи до коммита, поэтому последние len(titles) id
+    таблицы принадлежат именно этой пачке и идут в порядке вставки.
+    """
+    if titles[-1].pk is not None:
+        return
+    pks = list(
+        Title.objects.using(using)
+        .order_by("-pk")
+        .values_list("pk", flat=True)[:len(titles)]
+    )
+    for title, pk in zip(titles, reversed(pks)):
+        title.pk = pk
+
+
+def add_suggestions(titles):
+    for title in titles:
+        suggest_index.add(*catalog_entry(title))
+
+
+def create_titles(valid, using=DEFAULT_DB_ALIAS):
+    """Сохраняет проверенные элементы и возвращает созданные Title."""
+    if not valid:
+        return []
+    titles = [
+        Title(
+            name=data["name"],
+            description=data.get("description", ""),
+            year=data["year"],
+            category=data["category"],
+        )
+        for _, data in valid
+    ]
+    through = Title.genre.through
+    with transaction.atomic(using=using):
+        Title.objects.using(using).bulk_create(titles)
+        assign_pks(titles, using)
+        through.objects.using(using).bulk_create(
+            through(title_id=title.pk, genre_id=genre.pk)
+            for title, (_, data) in zip(titles, valid)
+            for genre in data["genre"]
+        )
+        # bulk_create не шлёт post_save: индексы обновляются здесь.
+        search.index_titles(titles, using)
+        transaction.on_commit(lambda: add_suggestions(titles), using=using)
+    return titles
+
+
+def bulk_create_titles(items):
+    valid, errors = validate_items(items)
+    titles = create_titles(valid)
+    return {
+        "created": [
+            {"index": index, "id": title.pk}
+            for (index, _), title in zip(valid, titles)
+        ],
+        "errors": errors,
+    }
@@ -0,0 +1,45 @@
+"""Кеш ответов справочников с версией на модель.
+
+Версия хранится в том же кеше и меняется после коммита каждой записи,
+поэтому старые ответы просто перестают находиться. Новая версия —
+случайный токен, а не инкремент: файловый кеш не умеет атомарный incr,
+и два одновременных сброса не должны слиться в одну версию.
+"""
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(model):
+    return f"response-version:{model._meta.label_lower}"
+
+
+def get_version(model):
+    cache = get_cache()
+    version = cache.get(version_key(model))
+    if version is None:
+        cache.add(version_key(model), uuid.uuid4().hex, None)
+        version = cache.get(version_key(model))
+    return version
+
+
+def bump_version(model):
+    transaction.on_commit(
+        lambda: get_cache().set(version_key(model), uuid.uuid4().hex, None)
+    )
+
+
+def response_key(model, request):
+    # request.GET есть и у HttpRequest, и у Request DRF.
+    params = urlencode(sorted(request.GET.lists()), doseq=True)
+    return (
+        f"response:{model._meta.label_lower}:{get_version(model)}:"
+        f"{request.get_host()}{request.path}?{params}"
+    )
@@ -0,0 +1,36 @@
+"""Проверки настроек API при запуске (`manage.py check`, runserver)."""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from rest_framework.settings import api_settings
+
+# Кеши, которые не видны другим процессам или серверам либо сами ходят
+# в базу на каждое чтение.
+UNSHARED_CACHES = {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+    "django.core.cache.backends.db.DatabaseCache",
+}
+
+
+@register(Tags.caches)
+def check_token_version_cache(app_configs, **kwargs):
+    from .authentication import RoleClaimsJWTAuthentication
+
+    if not any(
+        issubclass(authentication, RoleClaimsJWTAuthentication)
+        for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ):
+        return []
+    alias = settings.TOKEN_VERSION_CACHE_ALIAS
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend is not None and backend not in UNSHARED_CACHES:
+        return []
+    return [Error(
+        f"Кеш версий токенов {alias!r} не общий для процессов: отзыв "
+        "токена не дойдёт до других процессов.",
+        hint="Укажите в TOKEN_VERSION_CACHE_ALIAS Memcached или Redis "
+             "либо уберите RoleClaimsJWTAuthentication из "
+             "DEFAULT_AUTHENTICATION_CLASSES.",
+        id="api.E001",
+    )]
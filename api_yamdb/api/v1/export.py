@@ -0,0 +1,133 @@
+"""Потоковая выгрузка произведений, отзывов и комментариев.
+
+Строки читаются `QuerySet.iterator()` кусками по `CHUNK_SIZE`, поэтому
+память не зависит от размера таблицы. Как и в API, скрытые модерацией
+отзывы и комментарии (и комментарии к скрытым отзывам) не выгружаются.
+"""
+import csv
+import itertools
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+from reviews.models import Comment, Review, Title
+
+CHUNK_SIZE = 2000
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Нужен для выбора формата (`?format=ndjson` или Accept); сами
+    выгрузки отдаются потоком, а через рендерер проходят только ошибки."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(JSONRenderer):
+    """Как NDJSONRenderer: ошибки при выборе CSV отдаются в JSON."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+
+class Echo:
+    """Буфер для csv.writer, который просто возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def title_rows(since=None):
+    titles = (
+        Title.objects.order_by("id")
+        .values_list("id", "name", "year", "description", "category__slug",
+                     "score_sum", "review_count")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    Genres = Title.genre.through
+    while True:
+        chunk = list(itertools.islice(titles, CHUNK_SIZE))
+        if not chunk:
+            return
+        genres = {}
+        for title_id, slug in (
+            Genres.objects.filter(title_id__in=[row[0] for row in chunk])
+            .order_by("genre__slug")
+            .values_list("title_id", "genre__slug")
+        ):
+            genres.setdefault(title_id, []).append(slug)
+        for pk, name, year, description, category, total, count in chunk:
+            yield {
+                "id": pk,
+                "name": name,
+                "year": year,
+                "description": description,
+                "category": category,
+                "genre": genres.get(pk, []),
+                "rating": total / count if count else None,
+            }
+
+
+def review_rows(since=None):
+    reviews = Review.objects.filter(is_hidden=False)
+    if since is not None:
+        reviews = reviews.filter(pub_date__gte=since)
+    fields = ("id", "title_id", "author", "text", "score", "pub_date")
+    for row in reviews.order_by("pub_date", "id").values_list(
+        "id", "title_id", "author__username", "text", "score", "pub_date"
+    ).iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(fields, row))
+
+
+def comment_rows(since=None):
+    comments = Comment.objects.filter(
+        is_hidden=False, review__is_hidden=False
+    )
+    if since is not None:
+        comments = comments.filter(pub_date__gte=since)
+    fields = ("id", "review_id", "author", "text", "pub_date")
+    for row in comments.order_by("pub_date", "id").values_list(
+        "id", "review_id", "author__username", "text", "pub_date"
+    ).iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(fields, row))
+
+
+# Имя выгрузки -> (строки, есть ли pub_date для `since`).
+EXPORTS = {
+    "titles": (title_rows, False),
+    "reviews": (review_rows, True),
+    "comments": (comment_rows, True),
+}
+
+
+def batched(lines):
+    """Склеивает строки кусками, чтобы не отдавать по записи на итерацию."""
+    while True:
+        chunk = "".join(itertools.islice(lines, 200))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_ndjson(rows):
+    return batched(
+        json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        for row in rows
+    )
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+
+    def lines():
+        header = None
+        for row in rows:
+            if header is None:
+                header = list(row)
+                yield writer.writerow(header)
+            yield writer.writerow([
+                ",".join(value) if isinstance(value, list) else value
+                for value in row.values()
+            ])
+
+    return batched(lines())
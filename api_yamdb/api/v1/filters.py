@@ -1,13 +1,42 @@
+from django.db.models import SlugField
+from django.db.models.functions import Lower
 from django_filters import CharFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
+
+SlugField.register_lookup(Lower)
 
 
 class TitleFilter(FilterSet):
-    category = CharFilter(field_name="category__slug", lookup_expr="iexact")
-    genre = CharFilter(field_name="genre__slug", lookup_expr="iexact")
+    category = CharFilter(field_name="category__slug", method="filter_slug")
+    genre = CharFilter(field_name="genre__slug", method="filter_slug")
     name = CharFilter(field_name="name", lookup_expr="icontains")
 
     class Meta:
         model = Title
         fields = "__all__"
+
+    def filter_slug(self, queryset, name, value):
+        """Регистронезависимое сравнение slug через индекс по LOWER(slug).
+
+        В отличие от `iexact`, который в SQLite превращается в LIKE,
+        такое условие использует функциональный индекс.
+        """
+        return queryset.filter(**{f"{name}__lower": value.lower()})
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск `?search=` по названию и описанию.
+
+    Результаты упорядочены по релевантности (bm25 в SQLite FTS5).
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
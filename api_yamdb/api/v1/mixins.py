@@ -1,10 +1,14 @@
+from django.conf import settings
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
 )
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from .cache import get_cache, response_key
+
 
 class GetListCreateDeleteMixin(
     GenericViewSet, CreateModelMixin, ListModelMixin, DestroyModelMixin
@@ -12,3 +16,17 @@ class GetListCreateDeleteMixin(
     """Кастомный класс."""
 
     pass
+
+
+class CachedListMixin:
+    """Отдаёт список из кеша, пока версия модели не сменилась."""
+
+    def list(self, request, *args, **kwargs):
+        key = response_key(self.queryset.model, request)
+        cache = get_cache()
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,77 @@
+"""Массовая модерация отзывов и комментариев.
+
+Collector Django поднимает в память каждую удаляемую строку и шлёт по
+ней сигналы. Здесь отзывы и комментарии удаляются и скрываются
+запросами над множеством строк в одной транзакции, а рейтинги
+затронутых произведений пересчитываются там же.
+"""
+from django.db import connections, transaction
+
+from reviews.models import Comment, Review, Title
+
+RECOUNT_BATCH = 500
+
+
+def select(model, ids=None, author=None):
+    if ids is not None:
+        return model.objects.filter(pk__in=ids)
+    return model.objects.filter(author=author)
+
+
+def delete_rows(queryset):
+    """Удаляет строки выборки одним DELETE, без Collector и сигналов."""
+    connection = connections[queryset.db]
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    meta = queryset.model._meta
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(meta.db_table)} "
+            f"WHERE {connection.ops.quote_name(meta.pk.column)} IN ({sql})",
+            params,
+        )
+        return cursor.rowcount
+
+
+def recount(title_ids):
+    title_ids = sorted(title_ids)
+    for start in range(0, len(title_ids), RECOUNT_BATCH):
+        Title.recount_scores(title_ids[start:start + RECOUNT_BATCH])
+
+
+def moderate_reviews(action, reviews):
+    if action != "delete":
+        reviews = reviews.exclude(is_hidden=action == "hide")
+    title_ids = set(
+        reviews.order_by().values_list("title_id", flat=True).distinct()
+    )
+    comments = 0
+    if action == "delete":
+        # У Comment нет сигналов и зависимых строк: Collector удаляет их
+        # одним DELETE без выборки.
+        comments, _ = Comment.objects.filter(review__in=reviews).delete()
+        # Сигнал post_delete у Review заставил бы Collector загрузить все
+        # отзывы; рейтинги вместо этого пересчитываются ниже.
+        count = delete_rows(reviews)
+    else:
+        count = reviews.update(is_hidden=action == "hide")
+    recount(title_ids)
+    return {"reviews": count, "comments": comments}
+
+
+def moderate_comments(action, comments):
+    if action == "delete":
+        count, _ = comments.delete()
+    else:
+        count = comments.exclude(is_hidden=action == "hide").update(
+            is_hidden=action == "hide"
+        )
+    return {"reviews": 0, "comments": count}
+
+
+def moderate(target, action, ids=None, author=None):
+    """Применяет действие к отзывам/комментариям по списку id или автору
+    и возвращает число затронутых строк каждого вида."""
+    with transaction.atomic():
+        if target == "reviews":
+            return moderate_reviews(action, select(Review, ids, author))
+        return moderate_comments(action, select(Comment, ids, author))
@@ -0,0 +1,148 @@
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по дате публикации.
+
+    Курсор хранит весь ключ `(pub_date, id)` последней строки страницы,
+    и следующая страница выбирается условием по этому ключу, даже если
+    дата у тысяч отзывов одна. Любая страница стоит столько же, сколько
+    первая: без OFFSET и COUNT(*).
+    """
+
+    ordering = ("-pub_date", "-id")
+    # Разбор значений курсора по полям `ordering`; None — значение не
+    # разобрано.
+    position_parsers = (parse_datetime, int)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        # Пустой `?cursor=` декодируется в курсор без позиции.
+        self.cursor = self.decode_cursor(request)
+        position = self.cursor and self.cursor.position
+        reverse = bool(self.cursor and self.cursor.reverse)
+        fields = [field.lstrip("-") for field in self.ordering]
+        # Назад по ссылке `previous` идём в обратном порядке и
+        # разворачиваем страницу.
+        ordering = [
+            field.lstrip("-") if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(fields, ordering, position))
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+        if reverse:
+            self.has_next, self.has_previous = bool(self.page), has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None and bool(self.page)
+        return self.page
+
+    def after(self, fields, ordering, position):
+        """Строки строго после ключа `position` в порядке `ordering`:
+        (a, b) > (x, y) как a > x OR (a = x AND b > y)."""
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [
+                parse(value)
+                for parse, value in zip(self.position_parsers, values)
+            ]
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in values:
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        for index, field in enumerate(fields):
+            lookup = "lt" if ordering[index].startswith("-") else "gt"
+            condition |= Q(
+                **dict(zip(fields[:index], values[:index])),
+                **{f"{field}__{lookup}": values[index]},
+            )
+        return condition
+
+    def get_position(self, instance):
+        return json.dumps([
+            str(getattr(instance, field.lstrip("-")))
+            for field in self.ordering
+        ])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False,
+            position=self.get_position(self.page[-1]),
+        ))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=True,
+            position=self.get_position(self.page[0]),
+        ))
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """Пагинация по номеру страницы либо, при `?cursor`, курсорная.
+
+    Первую страницу в курсорном режиме отдаёт запрос с пустым `?cursor=`,
+    следующие — ссылки `next`/`previous` из ответа.
+    """
+
+    page_number_class = PageNumberPagination
+    cursor_class = PubDateCursorPagination
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        self.cursor = self.cursor_class()
+        self.paginator = self.page_number
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor.cursor_query_param in request.query_params:
+            self.paginator = self.cursor
+        else:
+            self.paginator = self.page_number
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.page_number.get_schema_operation_parameters(view)
+            + self.cursor.get_schema_operation_parameters(view)
+        )
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return self.paginator.display_page_controls
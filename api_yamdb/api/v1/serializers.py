@@ -1,12 +1,13 @@
 import re
-import uuid
 
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from reviews.models import (
     Category, Comment, Genre, Review, Title)
+from users.bloom import taken_names
 from users.models import User, CHOICES
 
 
@@ -18,38 +19,78 @@ class ErrorMessage:
     USERNAME_NOT_UNIQUE = "Username is not unique"
     EMAIL_NOT_UNIQUE = "Email is not unique"
     CONF_CODE_NOT_MATCH = "Confirmation code doesnt match the user"
+    NO_PUB_DATE = "This export has no publication date to filter by"
+    NOT_A_LIST = "Expected a non-empty list of titles"
+    TOO_MANY_ITEMS = "No more than {limit} titles per request"
+    SLUG_NOT_FOUND = "Object with slug={value} does not exist."
+    IDS_OR_AUTHOR = "Pass either ids or author"
+    USERNAME_OR_EMAIL = "Pass username or email"
 
 
-class SignUpSerializer(serializers.ModelSerializer):
+class SignUpSerializer(serializers.Serializer):
+    """Регистрация и повторный запрос кода.
+
+    Если фильтр Блума говорит, что имя и почта точно свободны, новый
+    пользователь вставляется сразу, а IntegrityError от гонки разбирается
+    одним запросом. Иначе сначала ищется существующий пользователь: для
+    повторной регистрации это единственный запрос.
+    """
+
+    email = serializers.EmailField(max_length=254)
+    username = serializers.CharField(max_length=150)
+
     def validate_username(self, name):
         if name == "me" or not re.match(r"^[\w.@+-]+\Z", name):
             raise serializers.ValidationError(ErrorMessage.BAD_NAME)
         return name
 
-    def is_valid(self, *, raise_exception=False):
-        if hasattr(self, 'initial_data'):
-            username = self.initial_data.get("username")
-            email = self.initial_data.get("email")
-            if User.objects.filter(username=username, email=email).exists():
-                self._validated_data = self.get_initial()
-                self._errors = {}
-                return True
-        return super().is_valid(raise_exception)
+    def existing(self, username, email):
+        """Пользователь с этими именем и почтой, ошибка, если занято
+        что-то одно, или None."""
+        users = User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).only("username", "email", "confirmation_code")
+        for user in users:
+            if user.username == username and user.email == email:
+                return user
+        if any(user.username == username for user in users):
+            raise serializers.ValidationError(
+                {"username": ErrorMessage.USERNAME_NOT_UNIQUE}
+            )
+        if users:
+            raise serializers.ValidationError(
+                {"email": ErrorMessage.EMAIL_NOT_UNIQUE}
+            )
+        return None
 
     def create(self, validated_data):
-        username = validated_data.get("username")
-        email = validated_data.get("email")
-        if User.objects.filter(username=username, email=email).exists():
-            return User.objects.get(**validated_data)
-        confirmation_code = uuid.uuid3(uuid.NAMESPACE_X500, email)
-        return User.objects.create(
-            **validated_data,
-            confirmation_code=confirmation_code
-        )
+        username = validated_data["username"]
+        email = validated_data["email"]
+        if any(taken_names.maybe_taken(username, email).values()):
+            user = self.existing(username, email)
+            if user is not None:
+                return user
+        try:
+            with transaction.atomic():
+                return User.objects.create(username=username, email=email)
+        except IntegrityError:
+            user = self.existing(username, email)
+        if user is None:
+            # Конфликтующего пользователя успели изменить или удалить.
+            raise serializers.ValidationError(
+                {"email": ErrorMessage.EMAIL_NOT_UNIQUE}
+            )
+        return user
+
+
+class AvailabilitySerializer(serializers.Serializer):
+    email = serializers.EmailField(max_length=254, required=False)
+    username = serializers.CharField(max_length=150, required=False)
 
-    class Meta:
-        model = User
-        fields = ["email", "username", ]
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError(ErrorMessage.USERNAME_OR_EMAIL)
+        return data
 
 
 class AuthSerializer(serializers.Serializer):
@@ -65,11 +106,44 @@ class AuthSerializer(serializers.Serializer):
             raise serializers.ValidationError(ErrorMessage.NO_CODE)
 
         user = get_object_or_404(User, username=username)
-        if confirmation_code != user.confirmation_code:
+        if confirmation_code != str(user.confirmation_code):
             raise serializers.ValidationError(ErrorMessage.CONF_CODE_NOT_MATCH)
         return data
 
 
+class SuggestSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, source="text")
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class ExportSerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+
+    def validate_since(self, since):
+        if not self.context["has_pub_date"]:
+            raise serializers.ValidationError(ErrorMessage.NO_PUB_DATE)
+        return since
+
+
+class ModerationSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=("reviews", "comments"))
+    action = serializers.ChoiceField(choices=("delete", "hide", "show"))
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=10000,
+    )
+    author = serializers.SlugRelatedField(
+        queryset=User.objects.all(), slug_field="username", required=False
+    )
+
+    def validate(self, data):
+        if ("ids" in data) == ("author" in data):
+            raise serializers.ValidationError(ErrorMessage.IDS_OR_AUTHOR)
+        return data
+
+
 class UserSerializer(serializers.ModelSerializer):
     role = serializers.ChoiceField(choices=CHOICES, default="user")
 
@@ -84,13 +158,6 @@ class UserSerializer(serializers.ModelSerializer):
         )
         model = User
 
-    def create(self, validated_data):
-        email = validated_data["email"]
-        confirmation_code = str(uuid.uuid3(uuid.NAMESPACE_X500, email))
-        return User.objects.create(
-            **validated_data, confirmation_code=confirmation_code
-        )
-
     def validate_username(self, name):
         if name == "me":
             raise serializers.ValidationError(ErrorMessage.BAD_NAME)
@@ -120,16 +187,14 @@ class CategorySerializer(serializers.ModelSerializer):
 class TitleRetrieveSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
-    rating = serializers.SerializerMethodField(read_only=True)
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
-        fields = "__all__"
+        fields = (
+            "id", "name", "year", "description", "genre", "category", "rating"
+        )
         model = Title
 
-    def get_rating(self, obj):
-        obj = obj.reviews.all().aggregate(rating=Avg("score"))
-        return obj["rating"]
-
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
@@ -144,6 +209,32 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Элемент пакетного создания: слаги сверяются со словарями из
+    контекста, поэтому проверка пачки не делает запросов на элемент."""
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta:
+        fields = ("name", "description", "year", "category", "genre")
+        model = Title
+
+    def lookup(self, kind, slug):
+        try:
+            return self.context[kind][slug]
+        except KeyError:
+            raise serializers.ValidationError(
+                ErrorMessage.SLUG_NOT_FOUND.format(value=slug)
+            )
+
+    def validate_category(self, slug):
+        return self.lookup("categories", slug)
+
+    def validate_genre(self, slugs):
+        return [self.lookup("genres", slug) for slug in dict.fromkeys(slugs)]
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -157,7 +248,7 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = '__all__'
+        fields = ('id', 'text', 'author', 'score', 'pub_date', 'title')
 
     def validate(self, data):
         request = self.context['request']
@@ -185,4 +276,4 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        fields = ('id', 'text', 'author', 'pub_date', 'review')
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre
+from users.models import User
+
+from .authentication import forget_token_version
+from .cache import bump_version
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def invalidate_responses(sender, **kwargs):
+    bump_version(sender)
+
+
+@receiver(post_save, sender=User)
+def invalidate_token_version(sender, instance, **kwargs):
+    if getattr(instance, "claims_changed", True):
+        forget_token_version(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    forget_token_version(instance.pk)
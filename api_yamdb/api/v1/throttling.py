@@ -0,0 +1,124 @@
+"""Ограничение частоты запросов маркерной корзиной в памяти процесса.
+
+Корзина хранится в виде GCRA: для ключа запоминается одно число —
+теоретическое время прихода следующего запроса. Проверка и списание
+маркера — одно обновление словаря под блокировкой, без кеша и базы.
+Лимиты считаются в каждом процессе отдельно: при N процессах клиент
+получает до N-кратной частоты.
+
+Частоты задаются в `REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]` в формате
+DRF ("10/min"): ёмкость корзины — число запросов, пополнение — за период.
+"""
+import threading
+import time
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+class BucketStore:
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self.limit = max_keys
+        self.lock = threading.Lock()
+        self.arrivals = {}
+
+    def take(self, key, interval, burst, now=None):
+        """Списывает маркер. Возвращает 0 или сколько секунд ждать."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            arrival = max(self.arrivals.get(key, now), now)
+            wait = arrival - now - (burst - 1) * interval
+            if wait > 0:
+                return wait
+            self.arrivals[key] = arrival + interval
+            if len(self.arrivals) > self.limit:
+                self.evict(now)
+            return 0
+
+    def evict(self, now):
+        """Удаляет полные корзины: их сброс ничего не меняет.
+
+        Частично опустошённые корзины не трогаются, иначе поток новых
+        ключей обнулял бы чужие лимиты. Пока таких корзин больше
+        `max_keys`, порог растёт вдвое, чтобы обход словаря оставался
+        редким; они полностью пополняются не позже чем за период.
+        """
+        full = [
+            key for key, arrival in self.arrivals.items() if arrival <= now
+        ]
+        for key in full:
+            del self.arrivals[key]
+        self.limit = max(self.max_keys, 2 * len(self.arrivals))
+
+    def clear(self):
+        with self.lock:
+            self.arrivals.clear()
+            self.limit = self.max_keys
+
+
+buckets = BucketStore()
+
+
+def parse_rate(rate):
+    """"10/min" -> (интервал между маркерами, ёмкость)."""
+    count, period = rate.split("/")
+    count = int(count)
+    return PERIODS[period[0]] / count, count
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.rate = rate and parse_rate(rate)
+        self.wait_time = None
+
+    def get_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"{self.scope}:user:{request.user.pk}"
+        return f"{self.scope}:ip:{self.get_ident(request)}"
+
+    def get_ident(self, request):
+        """Адрес клиента для анонимной корзины.
+
+        DRF без `NUM_PROXIES` берёт адрес из X-Forwarded-For, который
+        клиент подставляет сам и так получает новую корзину на каждый
+        запрос. Здесь без `NUM_PROXIES` используется REMOTE_ADDR; за
+        прокси число доверенных прокси задаётся в `NUM_PROXIES`.
+        """
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return super().get_ident(request)
+
+    def allow_request(self, request, view):
+        if not self.rate:
+            return True
+        self.wait_time = buckets.take(self.get_key(request), *self.rate)
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class SignUpThrottle(TokenBucketThrottle):
+    scope = "signup"
+
+
+class AvailableThrottle(TokenBucketThrottle):
+    scope = "available"
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = "token"
+
+
+class ReviewCreateThrottle(TokenBucketThrottle):
+    scope = "review_create"
+
+
+class CommentCreateThrottle(TokenBucketThrottle):
+    scope = "comment_create"
@@ -3,10 +3,17 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    available,
+    available_stats,
     CommentViewSet,
+    export,
     get_token,
+    log_out,
+    moderation,
     ReviewViewSet,
     sign_up,
+    suggest,
+    token_cache_stats,
     UserViewSet,
     CategoryViewSet,
     GenreViewSet,
@@ -28,5 +35,12 @@ router.register(
 urlpatterns = [
     path("", include(router.urls)),
     path("auth/signup/", sign_up),
+    path("auth/available/", available),
+    path("auth/available/stats/", available_stats),
     path("auth/token/", get_token),
+    path("auth/logout/", log_out),
+    path("auth/token-cache/", token_cache_stats),
+    path("suggest/", suggest),
+    path("export/<str:name>/", export),
+    path("moderation/", moderation),
 ]
@@ -1,25 +1,55 @@
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    renderer_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from reviews.models import Review, Comment, Category, Genre, Title
+from reviews.suggest import suggest_index
+from users.bloom import taken_names
 from users.models import User
+from users.outbox import enqueue
 
-from .permissions import IsAdmin, IsAuthorOrModerator, IsAdminOrReadOnly
-from .filters import TitleFilter
-from .mixins import GetListCreateDeleteMixin
+from .authentication import issue_access_token, revoke_tokens, token_cache
+from .bulk import bulk_create_titles
+from .export import (
+    CSVRenderer,
+    EXPORTS,
+    NDJSONRenderer,
+    stream_csv,
+    stream_ndjson,
+)
+from .moderation import moderate
+from .permissions import (
+    IsAdmin,
+    IsAdminOrReadOnly,
+    IsAuthorOrModerator,
+    IsModerator,
+)
+from .filters import TitleFilter, TitleSearchFilter
+from .mixins import CachedListMixin, GetListCreateDeleteMixin
+from .pagination import PageNumberOrCursorPagination
 from .serializers import (
     AuthSerializer,
+    AvailabilitySerializer,
+    ExportSerializer,
+    ModerationSerializer,
     ProfileSerializer,
     SignUpSerializer,
+    SuggestSerializer,
     UserSerializer,
     CategorySerializer,
     CommentSerializer,
@@ -28,27 +58,69 @@ from .serializers import (
     TitleRetrieveSerializer,
     TitleWriteSerializer,
 )
+from .throttling import (
+    AvailableThrottle,
+    CommentCreateThrottle,
+    ReviewCreateThrottle,
+    SignUpThrottle,
+    TokenThrottle,
+)
 
 
 @api_view(["POST"])
 @permission_classes((AllowAny,))
+@throttle_classes((SignUpThrottle,))
 def sign_up(request):
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    serializer.save()
-    username = serializer.validated_data.get("username")
-    user = User.objects.get(username=username)
-    send_mail(
-        subject=settings.DEFAULT_EMAIL_SUBJECT,
-        message=str(user.confirmation_code),
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=(user.email,),
-    )
+    # Пользователь и письмо с кодом записываются вместе: без письма в
+    # очереди пользователь так и не получил бы код.
+    with transaction.atomic():
+        user = serializer.save()
+        enqueue(
+            email=user.email,
+            subject=settings.DEFAULT_EMAIL_SUBJECT,
+            body=str(user.confirmation_code),
+        )
     return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
+@api_view(["GET"])
+@permission_classes((AllowAny,))
+@throttle_classes((AvailableThrottle,))
+def available(request):
+    """Свободны ли имя и почта. Точно свободные значения отсекает фильтр
+    Блума, база проверяет только возможные совпадения."""
+    serializer = AvailabilitySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    values = serializer.validated_data
+    lookups = Q()
+    for field, maybe_taken in taken_names.maybe_taken(**values).items():
+        if maybe_taken:
+            lookups |= Q(**{field: values[field]})
+    taken = set()
+    if lookups:
+        for user in User.objects.filter(lookups).only("username", "email"):
+            taken.update(
+                field for field in values
+                if getattr(user, field) == values[field]
+            )
+    return Response(
+        {field: field not in taken for field in values},
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes((IsAdmin,))
+def available_stats(request):
+    """Параметры и заполнение фильтра Блума процесса."""
+    return Response(taken_names.stats(), status=status.HTTP_200_OK)
+
+
 @api_view(["POST"])
 @permission_classes((AllowAny,))
+@throttle_classes((TokenThrottle,))
 def get_token(request):
     serializer = AuthSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -56,9 +128,68 @@ def get_token(request):
     username = serializer.validated_data["username"]
     user = get_object_or_404(User, username=username)
 
-    refresh = RefreshToken.for_user(user)
     return Response(
-        {"token": str(refresh.access_token)}, status=status.HTTP_200_OK
+        {"token": str(issue_access_token(user))}, status=status.HTTP_200_OK
+    )
+
+
+@api_view(["POST"])
+@permission_classes((IsAuthenticated,))
+def log_out(request):
+    revoke_tokens(request.user.pk)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(["GET"])
+@permission_classes((IsAdmin,))
+def token_cache_stats(request):
+    """Счётчики кеша токенов процесса, который обработал запрос."""
+    return Response(token_cache.stats(), status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes((AllowAny,))
+def suggest(request):
+    serializer = SuggestSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return Response(
+        suggest_index.query(**serializer.validated_data),
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["GET"])
+@permission_classes((IsAdmin,))
+@renderer_classes((NDJSONRenderer, CSVRenderer))
+def export(request, name):
+    if name not in EXPORTS:
+        raise NotFound()
+    rows, has_pub_date = EXPORTS[name]
+    serializer = ExportSerializer(
+        data=request.query_params, context={"has_pub_date": has_pub_date}
+    )
+    serializer.is_valid(raise_exception=True)
+    rows = rows(**serializer.validated_data)
+    if request.accepted_renderer.format == "csv":
+        content = stream_csv(rows)
+    else:
+        content = stream_ndjson(rows)
+    response = StreamingHttpResponse(
+        content, content_type=request.accepted_renderer.media_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{name}.{request.accepted_renderer.format}"'
+    )
+    return response
+
+
+@api_view(["POST"])
+@permission_classes((IsModerator,))
+def moderation(request):
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    return Response(
+        moderate(**serializer.validated_data), status=status.HTTP_200_OK
     )
 
 
@@ -85,6 +216,8 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def set_profile(self, request, pk=None):
         user = get_object_or_404(User, pk=request.user.id)
+        if request.method == "GET":
+            return Response(self.get_serializer(user).data)
         serializer = self.get_serializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -96,16 +229,24 @@ class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrModerator,)
+    pagination_class = PageNumberOrCursorPagination
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [CommentCreateThrottle()]
+        return super().get_throttles()
 
     def perform_create(self, serializer):
         review_id = self.kwargs.get("review_id")
-        review = get_object_or_404(Review, pk=review_id)
+        review = get_object_or_404(Review, pk=review_id, is_hidden=False)
         serializer.save(author=self.request.user, review=review)
 
     def get_queryset(self):
         review_id = self.kwargs.get("review_id")
-        review = get_object_or_404(Review, pk=review_id)
-        return review.comments.all()
+        review = get_object_or_404(Review, pk=review_id, is_hidden=False)
+        return review.comments.filter(is_hidden=False).select_related(
+            "author", "review"
+        )
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -113,6 +254,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrModerator,)
+    pagination_class = PageNumberOrCursorPagination
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [ReviewCreateThrottle()]
+        return super().get_throttles()
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get("title_id")
@@ -122,15 +269,22 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         title_id = self.kwargs.get("title_id")
         title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return title.reviews.filter(is_hidden=False).select_related(
+            "author", "title"
+        )
 
 
 class TitleViewSet(viewsets.ModelViewSet):
     """Вьюсет для произведения."""
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).all()
+    queryset = (
+        Title.objects
+        .select_related("category")
+        .prefetch_related("genre")
+        .order_by("id")
+    )
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
 
     def get_serializer_class(self):
@@ -138,8 +292,15 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleRetrieveSerializer
         return TitleWriteSerializer
 
+    @action(methods=("post",), detail=False, url_path="bulk")
+    def bulk(self, request):
+        result = bulk_create_titles(request.data)
+        if result["created"]:
+            return Response(result, status=status.HTTP_201_CREATED)
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
 
-class CategoryViewSet(GetListCreateDeleteMixin):
+class CategoryViewSet(CachedListMixin, GetListCreateDeleteMixin):
     """Вьюсет для категории."""
 
     queryset = Category.objects.all()
@@ -150,7 +311,7 @@ class CategoryViewSet(GetListCreateDeleteMixin):
     lookup_field = "slug"
 
 
-class GenreViewSet(GetListCreateDeleteMixin):
+class GenreViewSet(CachedListMixin, GetListCreateDeleteMixin):
     """Вьюсет для жанра."""
 
     queryset = Genre.objects.all()
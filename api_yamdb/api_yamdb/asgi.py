@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_asgi_application()
+
+# Фильтр занятых имён строится при старте, а не в первом запросе.
+from users.bloom import taken_names  # noqa: E402
+
+taken_names.build_at_startup()
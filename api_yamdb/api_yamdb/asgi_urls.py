@@ -0,0 +1,13 @@
+"""Корневой URLconf для ASGI (настройка ASGI_URLCONF).
+
+Отличается от api_yamdb.urls только тем, что API подключается из
+api.v1.async_urls.
+"""
+from django.urls import include, path
+
+from . import urls
+
+urlpatterns = [
+    path("api/v1/", include("api.v1.async_urls")),
+    *urls.urlpatterns,
+]
@@ -0,0 +1,184 @@
+"""Ограниченный пул соединений с базой внутри процесса.
+
+Пул не зависит от драйвера: соединение открывает `connect`, проверяет
+`check`. Свободное соединение проверяется перед выдачей, если пролежало
+дольше `check_after` секунд; простаивающие дольше `max_idle` и живущие
+дольше `max_lifetime` закрываются. Когда открыто `max_size` соединений,
+`acquire` ждёт освобождения до `timeout` секунд.
+
+После fork дочерний процесс начинает с пустым пулом. Унаследованные
+соединения он не закрывает и не использует: закрытие отправило бы
+серверу завершение сеанса через общий с родителем сокет.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Соединения родителя, унаследованные после fork: ссылки держатся, чтобы
+# сборщик мусора не закрыл их из дочернего процесса.
+_inherited = []
+
+
+class PoolTimeout(Exception):
+    """Все соединения пула заняты дольше `timeout` секунд."""
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, check, max_size=10, timeout=30,
+                 max_idle=300, check_after=30, max_lifetime=3600):
+        if max_size < 1:
+            raise ValueError('max_size должен быть положительным.')
+        self.connect = connect
+        self.check = check
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.max_lifetime = max_lifetime
+        self.reset()
+
+    def reset(self):
+        """Начинает с пустого пула, не закрывая прежние соединения."""
+        self.condition = threading.Condition()
+        # Свободные соединения: (соединение, время возврата); выдаются с
+        # конца, чтобы старые простаивали и закрывались по max_idle.
+        self.idle = deque()
+        # Время открытия каждого соединения пула по id(соединения).
+        self.opened = {}
+        # Места, занятые потоками, которые сейчас открывают соединение.
+        self.pending = 0
+        self.waiting = 0
+        self.connects = self.reuses = self.discards = 0
+
+    @property
+    def size(self):
+        return len(self.opened) + self.pending
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                self.expire()
+                if self.idle:
+                    connection, released = self.idle.pop()
+                    break
+                if self.size < self.max_size:
+                    # Место занимается до подключения, чтобы параллельные
+                    # потоки не превысили max_size.
+                    self.pending += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f'Все {self.max_size} соединений пула заняты.'
+                    )
+                self.waiting += 1
+                self.condition.wait(remaining)
+                self.waiting -= 1
+        if connection is None:
+            return self.open()
+        now = time.monotonic()
+        if (
+            now - self.opened[id(connection)] > self.max_lifetime
+            or (now - released > self.check_after
+                and not self.check(connection))
+        ):
+            self.discard(connection)
+            return self.acquire()
+        self.reuses += 1
+        return connection
+
+    def open(self):
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self.condition:
+                self.pending -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.pending -= 1
+            self.opened[id(connection)] = time.monotonic()
+            self.connects += 1
+        return connection
+
+    def release(self, connection, reusable=True):
+        with self.condition:
+            if id(connection) not in self.opened:
+                # Соединение открыто до fork в родительском процессе.
+                _inherited.append(connection)
+                return
+            if not reusable or (
+                time.monotonic() - self.opened[id(connection)]
+                > self.max_lifetime
+            ):
+                self.discard(connection)
+                return
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        with self.condition:
+            del self.opened[id(connection)]
+            self.discards += 1
+            self.condition.notify()
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def expire(self):
+        """Закрывает соединения, простаивающие дольше max_idle."""
+        deadline = time.monotonic() - self.max_idle
+        while self.idle and self.idle[0][1] < deadline:
+            self.discard(self.idle.popleft()[0])
+
+    def close_idle(self):
+        with self.condition:
+            while self.idle:
+                self.discard(self.idle.popleft()[0])
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'max_size': self.max_size,
+                'waiting': self.waiting,
+                'connects': self.connects,
+                'reuses': self.reuses,
+                'discards': self.discards,
+            }
+
+
+def get_pool(key, connect, check, **options):
+    """Возвращает пул процесса для ключа, создавая его при первом вызове."""
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(connect, check, **options)
+        return _pools[key]
+
+
+def close_pools():
+    """Закрывает свободные соединения всех пулов процесса."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
+
+
+def _after_fork():
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    for pool in _pools.values():
+        _inherited.extend(connection for connection, _ in pool.idle)
+        pool.reset()
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,90 @@
+"""PostgreSQL с пулом соединений внутри процесса.
+
+`OPTIONS['pool']` задаёт параметры `ConnectionPool` (`max_size`,
+`timeout`, `max_idle`, `check_after`, `max_lifetime`); остальные OPTIONS
+передаются psycopg2 как обычно. Закрытие соединения Django (в конце
+запроса при CONN_MAX_AGE = 0) возвращает его в пул, а следующий запрос
+получает уже открытое соединение без установки сеанса.
+"""
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.base import Database
+from django.utils.asyncio import async_unsafe
+from psycopg2 import extensions
+
+from ..pool import PoolTimeout, get_pool
+from .creation import DatabaseCreation
+
+RESETTABLE = (
+    extensions.TRANSACTION_STATUS_INTRANS,
+    extensions.TRANSACTION_STATUS_INERROR,
+)
+
+
+def is_alive(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except Database.Error:
+        return False
+    return True
+
+
+def reset(connection):
+    """Откатывает незавершённую транзакцию; False — соединение нельзя
+    отдавать другому запросу."""
+    if connection.closed:
+        return False
+    status = connection.get_transaction_status()
+    if status in RESETTABLE:
+        try:
+            connection.rollback()
+        except Database.Error:
+            return False
+        return True
+    return status == extensions.TRANSACTION_STATUS_IDLE
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        # Ключ — параметры подключения: тестовая база получает свой пул.
+        self.pool = get_pool(
+            tuple(sorted(conn_params.items())),
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            ),
+            is_alive,
+            **self.settings_dict['OPTIONS'].get('pool', {}),
+        )
+        try:
+            connection = self.pool.acquire()
+        except PoolTimeout as error:
+            raise Database.OperationalError(str(error)) from error
+        if 'isolation_level' not in self.settings_dict['OPTIONS']:
+            self.isolation_level = connection.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.in_atomic_block:
+            # Django оставит закрытое соединение в обёртке до выхода из
+            # блока, поэтому в пул оно не возвращается.
+            self.pool.release(self.connection, reusable=False)
+        else:
+            self.pool.release(
+                self.connection, reusable=reset(self.connection)
+            )
@@ -0,0 +1,11 @@
+from django.db.backends.postgresql import creation
+
+from ..pool import close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Свободные соединения пула к тестовой базе не дают её удалить.
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
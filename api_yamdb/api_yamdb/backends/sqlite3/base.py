@@ -0,0 +1,62 @@
+"""SQLite с прагмами на каждом соединении.
+
+Дополнительные ключи OPTIONS:
+
+* `pragmas` — словарь прагм, которые выполняются сразу после открытия
+  соединения (`journal_mode`, `synchronous`, `busy_timeout` и т. д.);
+* `transaction_mode` — режим `BEGIN` для `transaction.atomic()`. С
+  `IMMEDIATE` транзакция сразу берёт блокировку записи и ждёт её по
+  `busy_timeout`; отложенная транзакция, которая сначала читает, а потом
+  пишет, получает «database is locked» без ожидания;
+* `optimize_on_close` — выполнять `PRAGMA optimize` при закрытии
+  соединения, как рекомендует документация SQLite.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'EXCLUSIVE', 'IMMEDIATE')
+
+
+EXTRA_OPTIONS = ('pragmas', 'transaction_mode', 'optimize_on_close')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict['OPTIONS']
+        self.pragmas = options.get('pragmas', {})
+        self.transaction_mode = options.get('transaction_mode')
+        self.optimize_on_close = options.get('optimize_on_close', False)
+        if self.transaction_mode not in (None, *TRANSACTION_MODES):
+            raise ImproperlyConfigured(
+                f'transaction_mode должен быть одним из {TRANSACTION_MODES}.'
+            )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for key in EXTRA_OPTIONS:
+            params.pop(key, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+
+    def _close(self):
+        if self.connection is not None and self.optimize_on_close:
+            try:
+                self.connection.execute('PRAGMA optimize')
+            except base.Database.Error:
+                # База занята писателем: статистика обновится при
+                # закрытии другого соединения или по расписанию.
+                pass
+        super()._close()
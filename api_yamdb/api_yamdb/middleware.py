@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
+
+class ASGIUrlconfMiddleware:
+    """Под ASGI разрешает адреса по `ASGI_URLCONF`, с асинхронными
+    маршрутами каталога; под WSGI остаётся `ROOT_URLCONF`.
+
+    Работает в обоих режимах без перехода в поток: __call__ лишь
+    отдаёт результат get_response, синхронный или корутину.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = settings.ASGI_URLCONF
+        return self.get_response(request)
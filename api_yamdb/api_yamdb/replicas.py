@@ -0,0 +1,175 @@
+"""Чтение с реплик для безопасных запросов к вьюсетам api.v1.
+
+`ReplicaMiddleware` отмечает запрос: GET/HEAD/OPTIONS к вьюсету из
+`api.v1.views` читает с одной из реплик `DATABASE_REPLICAS`, остальные
+запросы работают с основной базой. После успешной записи клиент на
+`REPLICA_PIN_SECONDS` закрепляется за основной базой и сразу видит свои
+изменения, пока реплики догоняют; закрепления хранятся в общем для
+процессов кеше `REPLICA_PIN_CACHE_ALIAS`. Реплика, отставшая больше чем на
+`REPLICA_MAX_LAG` секунд, не получает чтений до следующей проверки.
+"""
+import contextvars
+import math
+import random
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+from rest_framework.viewsets import ViewSetMixin
+from rest_framework_simplejwt.settings import api_settings
+
+API_VIEWS = 'api.v1.views'
+# Отставание реплики PostgreSQL; 0, если она применила всё полученное:
+# иначе на простаивающей базе время последней транзакции растёт само.
+POSTGRES_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - "
+    "pg_last_xact_replay_timestamp()), 0) END"
+)
+
+replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+def is_api_viewset(view_func):
+    viewset = getattr(view_func, 'cls', None)
+    return (
+        viewset is not None
+        and issubclass(viewset, ViewSetMixin)
+        and viewset.__module__ == API_VIEWS
+    )
+
+
+def pin_key(request):
+    """Клиент для закрепления: пользователь из токена, иначе IP.
+
+    Подпись токена не проверяется: поддельный токен может лишь
+    направить чьи-то чтения на основную базу.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(header) == 2:
+        try:
+            claims = jwt.decode(
+                header[1], options={'verify_signature': False}
+            )
+            return f'replica-pin:user:{claims[api_settings.USER_ID_CLAIM]}'
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+    return f'replica-pin:ip:{BaseThrottle().get_ident(request)}'
+
+
+def get_pins():
+    return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+
+def measure_lag(alias):
+    """Отставание реплики в секундах; бесконечность, если она недоступна.
+    У SQLite репликации нет, и файлы считаются догнавшими."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(POSTGRES_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        return math.inf
+
+
+class ReplicaLag:
+    """Отставание реплик, измеренное не чаще раза в
+    `REPLICA_LAG_CHECK_INTERVAL` секунд в каждом процессе."""
+
+    def __init__(self):
+        self.measured = {}
+
+    def lag(self, alias, now=None):
+        now = time.monotonic() if now is None else now
+        measured_at, lag = self.measured.get(alias, (None, 0))
+        if (
+            measured_at is None
+            or now - measured_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+        ):
+            lag = measure_lag(alias)
+            self.measured[alias] = (now, lag)
+        return lag
+
+    def available(self, aliases):
+        if settings.REPLICA_MAX_LAG is None:
+            return aliases
+        return [
+            alias for alias in aliases
+            if self.lag(alias) <= settings.REPLICA_MAX_LAG
+        ]
+
+    def clear(self):
+        self.measured.clear()
+
+
+replica_lag = ReplicaLag()
+
+
+class PrimaryReplicaRouter:
+    """Чтения отмеченного запроса — на реплику, вне таких запросов
+    решает Django. Запись всегда идёт на основную базу, в том числе для
+    объектов, прочитанных с реплики."""
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads.get():
+            return None
+        replicas = replica_lag.available(settings.DATABASE_REPLICAS)
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if (
+            settings.DATABASE_REPLICAS
+            and settings.REPLICA_PIN_SECONDS
+            and isinstance(get_pins(), LocMemCache)
+        ):
+            raise ImproperlyConfigured(
+                'REPLICA_PIN_CACHE_ALIAS указывает на кеш в памяти '
+                'процесса: закрепление за основной базой не дойдёт до '
+                'других процессов. Укажите общий кеш.'
+            )
+
+    def __call__(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        if (
+            settings.DATABASE_REPLICAS
+            and settings.REPLICA_PIN_SECONDS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            get_pins().set(
+                pin_key(request), True, settings.REPLICA_PIN_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and is_api_viewset(view_func)
+            and not get_pins().get(pin_key(request))
+        ):
+            replica_reads.set(True)
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.ASGIUrlconfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -33,9 +34,13 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_yamdb.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
+# Под ASGI (api_yamdb.middleware): те же адреса плюс асинхронные
+# списки каталога из api.v1.async_urls.
+ASGI_URLCONF = 'api_yamdb.asgi_urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
@@ -63,6 +68,99 @@ DATABASES = {
     }
 }
 
+# Профиль production (DATABASE_PROFILE=production): WAL, чтобы читатели
+# не ждали писателя, ожидание блокировки вместо «database is locked» и
+# постоянные соединения. Статистику планировщика обновляет PRAGMA optimize
+# при закрытии соединения и manage.py optimize_db по расписанию.
+SQLITE_PRODUCTION = {
+    'ENGINE': 'api_yamdb.backends.sqlite3',
+    'CONN_MAX_AGE': 600,
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'optimize_on_close': True,
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'cache_size': -64 * 1024,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'development')
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update(SQLITE_PRODUCTION)
+elif DATABASE_PROFILE == 'postgresql':
+    # Параметры подключения из окружения; соединения берутся из пула
+    # процесса (api_yamdb.backends.pool) и возвращаются в него в конце
+    # запроса. Пул должен вмещать все потоки процесса, которые ходят в
+    # базу: потоки сервера и ASYNC_DB_THREADS.
+    DATABASES['default'] = {
+        'ENGINE': 'api_yamdb.backends.postgresql',
+        'NAME': os.getenv('POSTGRES_DB', 'yamdb'),
+        'USER': os.getenv('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.getenv('DB_POOL_SIZE', 20)),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            },
+        },
+    }
+
+# Реплики для чтения (api_yamdb.replicas): DB_REPLICAS — через запятую
+# имена баз (для SQLite — пути к файлам), для реплики на другом сервере
+# PostgreSQL — NAME@HOST; остальные параметры как у основной базы. Тесты
+# Django направляют реплики в тестовую основную базу.
+DATABASE_REPLICAS = []
+for location in filter(None, os.getenv('DB_REPLICAS', '').split(',')):
+    name, _, host = location.strip().partition('@')
+    alias = f'replica{len(DATABASE_REPLICAS) + 1}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    if host:
+        DATABASES[alias]['HOST'] = host
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['api_yamdb.replicas.PrimaryReplicaRouter']
+# Сколько секунд после записи клиент читает с основной базы.
+REPLICA_PIN_SECONDS = 5
+# Реплика, отставшая сильнее (секунды), не получает чтений; None — не
+# проверять. Отставание измеряется не чаще раза в интервал.
+REPLICA_MAX_LAG = None
+REPLICA_LAG_CHECK_INTERVAL = 1
+# Закрепления должны видеть все процессы: в памяти процесса (locmem)
+# запись в одном воркере не закрепляет чтения в другом, и такой кеш
+# ReplicaMiddleware не принимает. При нескольких серверах нужен общий
+# кеш (Memcached, Redis).
+REPLICA_PIN_CACHE_ALIAS = 'replica_pins'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+    'replica_pins': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'replica-pins',
+    },
+}
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Потоки, в которых асинхронные представления (api.v1.async_views)
+# выполняют запросы к базе; у каждого своё соединение.
+ASYNC_DB_THREADS = 8
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -94,14 +192,44 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 AUTH_USER_MODEL = 'users.User'
 
+# Аутентификация по утверждениям токена без запроса пользователя
+# (api.v1.authentication.RoleClaimsJWTAuthentication) включается
+# переменной TOKEN_VERSION_MEMCACHED — адресом Memcached для версий
+# токенов. Кеш должен быть общим для всех процессов и серверов, иначе
+# отзыв токена доходит до них только по истечении таймаута; с кешем в
+# памяти процесса, файлами или базой проверка api.E001 не пропустит
+# запуск. Без переменной работает обычная JWTAuthentication.
+AUTHENTICATION_CLASS = (
+    'rest_framework_simplejwt.authentication.JWTAuthentication'
+)
+TOKEN_VERSION_CACHE_ALIAS = 'default'
+if os.getenv('TOKEN_VERSION_MEMCACHED'):
+    CACHES['token_versions'] = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.getenv('TOKEN_VERSION_MEMCACHED'),
+    }
+    TOKEN_VERSION_CACHE_ALIAS = 'token_versions'
+    AUTHENTICATION_CLASS = 'api.v1.authentication.RoleClaimsJWTAuthentication'
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [AUTHENTICATION_CLASS],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    # api.v1.throttling: корзина на пользователя или IP в каждом процессе.
+    # IP берётся из REMOTE_ADDR; за обратным прокси задайте 'NUM_PROXIES'.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '10/min',
+        'available': '30/min',
+        'token': '20/min',
+        'review_create': '20/min',
+        'comment_create': '60/min',
+    },
 }
 
+# Сколько проверенных токенов держать в памяти каждого процесса.
+TOKEN_CACHE_SIZE = 10000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=10),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -111,3 +239,19 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'emails')
 DEFAULT_FROM_EMAIL = 'yamdb@yamdb.com'
 DEFAULT_EMAIL_SUBJECT = 'Confirmation code'
+
+# Фильтр Блума занятых имён и почты (users.bloom): минимальная ёмкость
+# в ключах (по два на пользователя) и доля ложных срабатываний. Память —
+# около 1.8 байта на ключ при 0.1%. Через общий для процессов кеш
+# CACHE_ALIAS загрузки просят процессы перестроить фильтр.
+SIGNUP_BLOOM = {
+    'CAPACITY': 100_000,
+    'ERROR_RATE': 0.001,
+    'CACHE_ALIAS': 'responses',
+}
+
+# Очередь писем (users.outbox, manage.py run_outbox): число попыток и
+# экспоненциальная задержка между ними в секундах.
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF = 60
+OUTBOX_MAX_BACKOFF = 60 * 60
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
 application = get_wsgi_application()
+
+# Фильтр занятых имён строится при старте, а не в первом запросе.
+from users.bloom import taken_names  # noqa: E402
+
+taken_names.build_at_startup()
@@ -0,0 +1,296 @@
+"""Синтетические данные для замеров на больших базах.
+
+Генераторы отдают строки в порядке `table_columns` со значениями, уже
+подготовленными для базы, как разбор CSV в `csv_import`, так что
+записываются они тем же `insert_rows`. Всё определяется зерном: один и
+тот же план на пустой базе даёт одни и те же строки.
+
+Число отзывов на произведение распределено по Ципфу: несколько
+произведений собирают большую часть отзывов, у длинного хвоста их по
+одному-два. Автор пишет не больше одного отзыва на произведение, поэтому
+отзывы произведения достаются подряд идущим пользователям из случайной
+перестановки.
+"""
+import bisect
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, chain, islice, repeat
+from operator import itemgetter
+
+from users.models import MODERATOR, USER, User
+
+from .models import Category, Comment, Genre, Review, Title
+
+WORDS = (
+    "тёмный", "последний", "северный", "тихий", "большой", "забытый",
+    "красный", "ночной", "старый", "далёкий", "город", "берег", "ветер",
+    "дом", "путь", "сад", "остров", "мост", "огонь", "лес", "голос", "свет",
+)
+REVIEW_TEXTS = (
+    "Смотрится на одном дыхании.",
+    "Сильное начало, но к финалу темп проседает.",
+    "Пересматриваю не первый раз и нахожу новое.",
+    "Слабый сценарий вытягивают актёры.",
+    "Красиво снято, но сюжет предсказуем.",
+    "Лучшее, что я видел за последние годы.",
+    "Не моё, хотя понимаю, почему это любят.",
+    "Крепкий середняк без откровений.",
+)
+COMMENT_TEXTS = (
+    "Согласен.",
+    "Совсем не согласен, финал как раз сильный.",
+    "Спасибо, теперь точно посмотрю.",
+    "А мне понравилось.",
+    "Точно подмечено.",
+)
+# Оценки смещены к 7–9, как у настоящих отзывов.
+SCORE_WEIGHTS = (1, 1, 2, 3, 5, 8, 13, 16, 12, 7)
+SCORES = tuple(range(1, 11))
+SCORE_CUMULATIVE = tuple(accumulate(SCORE_WEIGHTS))
+MODERATOR_SHARE = 0.01
+GENRES_PER_TITLE = (1, 3)
+FIRST_YEAR = 1920
+PERIOD = timedelta(days=5 * 365)
+# Подготовка даты для базы дороже всей остальной строки, поэтому даты
+# отзывов и комментариев выбираются из заранее подготовленного набора.
+DATE_POOL = 50_000
+# Сколько отзывов получают комментарии за один проход.
+COMMENT_BLOCK = 10_000
+
+
+@dataclass(frozen=True)
+class Plan:
+    users: int
+    titles: int
+    reviews: int
+    categories: int = 20
+    genres: int = 40
+    # Среднее число комментариев на отзыв (распределение Пуассона).
+    comments: float = 1.0
+    zipf: float = 1.1
+    seed: int = 0
+
+
+def review_counts(titles, reviews, users, exponent):
+    """Число отзывов на произведение по рангу: доля ранга k пропорциональна
+    1 / k ** exponent, но не больше числа пользователей."""
+    if reviews > titles * users:
+        raise ValueError(
+            f"{reviews} отзывов не поместятся: у {titles} произведений "
+            f"не больше {users} отзывов на каждое."
+        )
+    weights = [(rank + 1) ** -exponent for rank in range(titles)]
+    tails = list(accumulate(reversed(weights)))[::-1]
+    # Первые `capped` произведений упираются в число пользователей,
+    # остальным отзывы делятся пропорционально весам.
+    capped = 0
+    while (
+        capped < titles
+        and (reviews - capped * users) * weights[capped] / tails[capped]
+        > users
+    ):
+        capped += 1
+    rest = reviews - capped * users
+    counts = [users] * capped
+    fractions = []
+    for rank in range(capped, titles):
+        share = rest * weights[rank] / tails[capped]
+        counts.append(min(users, math.floor(share)))
+        fractions.append((share - counts[-1], rank))
+    leftover = reviews - sum(counts)
+    for _, rank in sorted(fractions, reverse=True):
+        if not leftover:
+            break
+        if counts[rank] < users:
+            counts[rank] += 1
+            leftover -= 1
+    return counts
+
+
+def poisson_table(mean, limit=64):
+    """Накопленные вероятности распределения Пуассона для bisect."""
+    probability = math.exp(-mean)
+    table = [probability]
+    for count in range(1, limit):
+        probability *= mean / count
+        table.append(table[-1] + probability)
+    return table
+
+
+class Rows:
+    """Собирает кортежи в порядке колонок модели из словаря значений
+    или из колонок целиком.
+
+    Поля, которых нет в словаре, получают значение по умолчанию,
+    подготовленное один раз. Даты и UUID генератор готовит сам через
+    `prepare`, остальные значения подходят базе как есть.
+    """
+
+    def __init__(self, model, connection):
+        self.connection = connection
+        fields = model._meta.concrete_fields
+        self.fields = {field.attname: field for field in fields}
+        self.defaults = {
+            field.attname: field.get_db_prep_save(
+                field.get_default(), connection
+            )
+            for field in fields
+            if not (field.has_default() and callable(field.default))
+        }
+        self.getter = itemgetter(*(field.attname for field in fields))
+
+    def __call__(self, values):
+        return self.getter({**self.defaults, **values})
+
+    def zip(self, **columns):
+        """Строки из колонок: на больших таблицах это в разы быстрее,
+        чем словарь на каждую строку."""
+        return zip(*(
+            columns[attname] if attname in columns
+            else repeat(self.defaults[attname])
+            for attname in self.fields
+        ))
+
+    def prepare(self, attname, value):
+        return self.fields[attname].get_db_prep_save(value, self.connection)
+
+
+class Generator:
+
+    def __init__(self, plan, connection, start_ids):
+        self.plan = plan
+        self.connection = connection
+        # Первый свободный id каждой модели: данные дописываются к уже
+        # существующим.
+        self.start = start_ids
+        # Коды подтверждения уникальны, поэтому дописанные пользователи
+        # не должны повторять случайные числа прежнего запуска.
+        self.rng = random.Random(f"{plan.seed}:{start_ids[User]}")
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def ids(self, model, count):
+        return range(self.start[model], self.start[model] + count)
+
+    def users(self):
+        rows = Rows(User, self.connection)
+        joined = rows.prepare("date_joined", self.now - PERIOD)
+        for pk in self.ids(User, self.plan.users):
+            yield rows({
+                "id": pk,
+                "username": f"user{pk}",
+                "email": f"user{pk}@yamdb.fake",
+                "role": (
+                    MODERATOR if self.rng.random() < MODERATOR_SHARE
+                    else USER
+                ),
+                "date_joined": joined,
+                "confirmation_code": rows.prepare(
+                    "confirmation_code",
+                    uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                ),
+            })
+
+    def slugged(self, model, prefix, count):
+        rows = Rows(model, self.connection)
+        for pk in self.ids(model, count):
+            yield rows({
+                "id": pk,
+                "name": f"{prefix.capitalize()} {pk}",
+                "slug": f"{prefix}-{pk}",
+            })
+
+    def categories(self):
+        return self.slugged(Category, "category", self.plan.categories)
+
+    def genres(self):
+        return self.slugged(Genre, "genre", self.plan.genres)
+
+    def titles(self):
+        rows = Rows(Title, self.connection)
+        categories = self.ids(Category, self.plan.categories)
+        for pk in self.ids(Title, self.plan.titles):
+            yield rows({
+                "id": pk,
+                "name": " ".join(self.rng.sample(WORDS, 3)).capitalize(),
+                "year": self.rng.randint(FIRST_YEAR, self.now.year - 1),
+                "description": self.rng.choice(("", *REVIEW_TEXTS)),
+                "category_id": self.rng.choice(categories),
+            })
+
+    def genre_titles(self):
+        rows = Rows(Title.genre.through, self.connection)
+        genres = self.ids(Genre, self.plan.genres)
+        pk = self.start[Title.genre.through]
+        for title_id in self.ids(Title, self.plan.titles):
+            count = min(self.rng.randint(*GENRES_PER_TITLE), len(genres))
+            for genre_id in self.rng.sample(genres, count):
+                yield rows({
+                    "id": pk, "title_id": title_id, "genre_id": genre_id,
+                })
+                pk += 1
+
+    def dates(self, rows, span):
+        """Подготовленные даты публикации в пределах `span` до `now`."""
+        seconds = int(span.total_seconds())
+        return [
+            rows.prepare(
+                "pub_date",
+                self.now - timedelta(seconds=self.rng.randrange(seconds)),
+            )
+            for _ in range(DATE_POOL)
+        ]
+
+    def reviews(self):
+        """Отзывы по произведениям; число отзывов — по Ципфу от ранга,
+        ранги случайно перемешаны между произведениями."""
+        plan = self.plan
+        rows = Rows(Review, self.connection)
+        counts = review_counts(
+            plan.titles, plan.reviews, plan.users, plan.zipf
+        )
+        self.rng.shuffle(counts)
+        authors = list(self.ids(User, plan.users))
+        self.rng.shuffle(authors)
+        # Срез длиной до plan.users с любого места без заворота.
+        authors += authors
+        dates = self.dates(rows, PERIOD)
+        choices = self.rng.choices
+        pk = self.start[Review]
+        for title_id, count in zip(self.ids(Title, plan.titles), counts):
+            offset = self.rng.randrange(plan.users)
+            yield from rows.zip(
+                id=range(pk, pk + count),
+                text=choices(REVIEW_TEXTS, k=count),
+                author_id=sorted(authors[offset:offset + count]),
+                pub_date=choices(dates, k=count),
+                title_id=repeat(title_id, count),
+                score=choices(SCORES, cum_weights=SCORE_CUMULATIVE, k=count),
+            )
+            pk += count
+
+    def comments(self, review_ids):
+        """Комментарии к отзывам: число на отзыв — по Пуассону."""
+        rows = Rows(Comment, self.connection)
+        table = poisson_table(self.plan.comments)
+        users = self.ids(User, self.plan.users)
+        dates = self.dates(rows, timedelta(days=1))
+        choices = self.rng.choices
+        pk = self.start[Comment]
+        review_ids = iter(review_ids)
+        while True:
+            block = list(islice(review_ids, COMMENT_BLOCK))
+            if not block:
+                break
+            counts = [bisect.bisect(table, self.rng.random()) for _ in block]
+            count = sum(counts)
+            yield from rows.zip(
+                id=range(pk, pk + count),
+                text=choices(COMMENT_TEXTS, k=count),
+                author_id=choices(users, k=count),
+                pub_date=choices(dates, k=count),
+                review_id=chain.from_iterable(map(repeat, block, counts)),
+            )
+            pk += count
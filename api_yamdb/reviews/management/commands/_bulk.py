@@ -0,0 +1,88 @@
+"""Общее для команд, которые пишут в таблицы в обход ORM."""
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Index
+
+from api.v1.cache import bump_version
+from reviews import search
+from reviews.models import Category, Genre, Title
+from reviews.suggest import suggest_index
+from users.bloom import taken_names
+
+
+def secondary_indexes(model):
+    """Неуникальные индексы модели, которые есть в базе: из Meta.indexes
+    и от полей с db_index, включая внешние ключи.
+
+    Имена и столбцы берутся из интроспекции базы; индексы по нескольким
+    столбцам вне Meta.indexes (например, созданные вручную) не трогаются.
+    """
+    with connection.cursor() as cursor:
+        existing = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    declared = {index.name: index for index in model._meta.indexes}
+    indexed = {
+        field.column: field.name
+        for field in model._meta.local_fields
+        if field.db_index and not field.unique
+    }
+    indexes = []
+    for name, constraint in existing.items():
+        if (
+            not constraint["index"]
+            or constraint["unique"]
+            or constraint["primary_key"]
+        ):
+            continue
+        if name in declared:
+            indexes.append(declared[name])
+        elif len(constraint["columns"]) == 1 and (
+            constraint["columns"][0] in indexed
+        ):
+            field = indexed[constraint["columns"][0]]
+            indexes.append(Index(fields=[field], name=name))
+    return indexes
+
+
+@contextmanager
+def deferred_indexes(models):
+    """Снимает вторичные индексы на время вставки и строит их заново
+    после: одна сортировка на индекс вместо вставки в каждое дерево на
+    каждой строке. Первичные ключи и уникальные ограничения остаются."""
+    indexes = [
+        (model, index)
+        for model in models
+        for index in secondary_indexes(model)
+    ]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        with connection.constraint_checks_disabled():
+            yield
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models]
+        )
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+def refresh_derived(models):
+    """Приводит в порядок всё, что вставка в обход ORM обходит стороной:
+    последовательности id, рейтинги, поисковый индекс, фильтр занятых
+    имён и кеши."""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    Title.recount_scores()
+    if search.is_enabled():
+        search.rebuild_index(connection)
+    suggest_index.invalidate()
+    taken_names.invalidate_all()
+    for model in (Category, Genre):
+        bump_version(model)
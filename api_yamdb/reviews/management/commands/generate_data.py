@@ -0,0 +1,132 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from reviews.csv_import import insert_rows
+from reviews.generator import Generator, Plan, review_counts
+from reviews.management.commands._bulk import (
+    deferred_indexes, refresh_derived,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+MODELS = (User, Category, Genre, Title, Title.genre.through, Review, Comment)
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу воспроизводимыми синтетическими данными для "
+        "замеров: пользователи, словари, произведения с числом отзывов по "
+        "Ципфу и комментарии. Строки пишутся пачками executemany в обход "
+        "ORM и дописываются к уже существующим."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--titles", type=int, default=10_000)
+        parser.add_argument(
+            "--reviews", type=int, default=100_000,
+            help="Всего отзывов; распределяются по произведениям по Ципфу.",
+        )
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--genres", type=int, default=40)
+        parser.add_argument(
+            "--comments", type=float, default=1.0,
+            help="Среднее число комментариев на отзыв.",
+        )
+        parser.add_argument(
+            "--zipf", type=float, default=1.1,
+            help="Показатель распределения Ципфа: чем больше, тем сильнее "
+                 "отзывы собираются у популярных произведений.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Зерно генератора: одинаковое зерно даёт те же данные.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10_000,
+            help="Сколько строк вставлять одним executemany; пачка пишется "
+                 "в одной транзакции.",
+        )
+        parser.add_argument(
+            "--keep-indexes", action="store_true",
+            help="Не снимать вторичные индексы на время вставки: быстрее, "
+                 "когда к большой базе дописывается немного строк.",
+        )
+
+    def handle(self, *args, **options):
+        for option in ("users", "titles", "categories", "genres",
+                       "batch_size"):
+            if options[option] < 1:
+                raise CommandError(
+                    f"--{option.replace('_', '-')} должен быть "
+                    "положительным."
+                )
+        if options["reviews"] < 0 or options["comments"] < 0:
+            raise CommandError(
+                "--reviews и --comments не могут быть отрицательными."
+            )
+        plan = Plan(
+            users=options["users"],
+            titles=options["titles"],
+            reviews=options["reviews"],
+            categories=options["categories"],
+            genres=options["genres"],
+            comments=options["comments"],
+            zipf=options["zipf"],
+            seed=options["seed"],
+        )
+        try:
+            review_counts(plan.titles, plan.reviews, plan.users, plan.zipf)
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.batch_size = options["batch_size"]
+        start = {
+            model: (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+            for model in MODELS
+        }
+        generator = Generator(plan, connection, start)
+        started = time.perf_counter()
+        with deferred_indexes(() if options["keep_indexes"] else MODELS):
+            written = sum((
+                self.write(User, generator.users()),
+                self.write(Category, generator.categories()),
+                self.write(Genre, generator.genres()),
+                self.write(Title, generator.titles()),
+                self.write(Title.genre.through, generator.genre_titles()),
+                self.write(Review, generator.reviews()),
+                self.write(
+                    Comment,
+                    generator.comments(generator.ids(Review, plan.reviews)),
+                ),
+            ))
+            loaded = time.perf_counter()
+        indexed = time.perf_counter()
+        refresh_derived(MODELS)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Всего {written} строк за {elapsed:.2f} с, "
+            f"{written / elapsed:.0f} строк/с: вставка "
+            f"{loaded - started:.2f} с, индексы {indexed - loaded:.2f} с, "
+            f"рейтинги и кеши {time.perf_counter() - indexed:.2f} с"
+        ))
+
+    def write(self, model, rows):
+        started = time.perf_counter()
+        written = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                insert_rows(model, batch, self.batch_size)
+            written += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{model._meta.db_table}: {written} строк, {elapsed:.2f} с, "
+            f"{written / elapsed if elapsed else 0:.0f} строк/с"
+        )
+        return written
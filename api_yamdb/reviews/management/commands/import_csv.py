@@ -0,0 +1,291 @@
+import csv
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
+
+from reviews.csv_import import (
+    SOURCES,
+    IdSet,
+    find_chunks,
+    insert_rows,
+    parse_chunk,
+    table_columns,
+)
+from reviews.management.commands._bulk import refresh_derived
+from reviews.models import Review
+
+DEFAULT_PATH = Path(settings.BASE_DIR) / "static" / "data"
+
+
+class Checkpoint:
+    """Смещение, до которого файл уже записан в базу.
+
+    Сохраняется после коммита каждого диапазона; если изменился файл
+    (размер, время правки) или база, старая отметка не используется.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and path.exists():
+            self.state = json.loads(path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def stamp(filename):
+        stat = filename.stat()
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "database": str(connection.settings_dict["NAME"]),
+        }
+
+    def offset(self, filename):
+        entry = self.state.get(filename.name)
+        if entry and entry["stamp"] == self.stamp(filename):
+            return entry["offset"]
+        return 0
+
+    def save(self, filename, offset):
+        if not self.path:
+            return
+        self.state[filename.name] = {
+            "stamp": self.stamp(filename), "offset": offset,
+        }
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.state), encoding="utf-8")
+        temporary.replace(self.path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает CSV из static/data в порядке зависимостей между "
+        "таблицами. Файлы режутся на диапазоны, которые разбираются в пуле "
+        "процессов и записываются одним писателем пачками executemany; "
+        "прерванная загрузка продолжается с последнего диапазона."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", type=Path, default=DEFAULT_PATH,
+            help="Каталог с CSV-файлами.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Сколько строк вставлять одним executemany.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=16 << 20,
+            help="Размер диапазона файла в байтах; диапазон пишется в "
+                 "одной транзакции.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Число процессов разбора; 1 — разбирать в этом процессе.",
+        )
+        parser.add_argument(
+            "--checkpoint", type=Path,
+            help="Файл отметок: с ним прерванная загрузка продолжается "
+                 "с последнего записанного диапазона.",
+        )
+        parser.add_argument(
+            "--rejects", type=Path,
+            help="CSV, куда записать отклонённые строки с причиной.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_dir():
+            raise CommandError(f"Каталог {path} не найден.")
+        for option in ("batch_size", "chunk_size", "workers"):
+            if options[option] < 1:
+                raise CommandError(
+                    f"--{option.replace('_', '-')} должен быть "
+                    "положительным."
+                )
+        self.options = options
+        self.verbosity = options["verbosity"]
+        self.known = {}
+        self.checkpoint = Checkpoint(
+            options["checkpoint"] and Path(options["checkpoint"])
+        )
+        self.rejects = None
+        rejects_file = None
+        if options["rejects"]:
+            rejects_file = open(
+                options["rejects"], "w", encoding="utf-8", newline=""
+            )
+            self.rejects = csv.writer(rejects_file)
+            self.rejects.writerow(("file", "position", "reason", "row"))
+        pool = None
+        if options["workers"] > 1:
+            pool = ProcessPoolExecutor(
+                options["workers"], initializer=django.setup
+            )
+        try:
+            for index, source in enumerate(SOURCES):
+                filename = path / source.filename
+                if not filename.exists():
+                    self.stdout.write(
+                        f"{source.filename}: нет файла, пропущен"
+                    )
+                    continue
+                self.import_file(index, filename, pool)
+        finally:
+            if pool:
+                pool.shutdown()
+            if rejects_file:
+                rejects_file.close()
+        self.finish()
+
+    def known_ids(self, model):
+        # Ссылки идут только на уже загруженные таблицы, поэтому карту id
+        # достаточно один раз прочитать из базы при первом обращении,
+        # а дальше дополнять вставленными строками.
+        if model not in self.known:
+            self.known[model] = IdSet(
+                model.objects.values_list("pk", flat=True).iterator()
+            )
+        return self.known[model]
+
+    def parsed_chunks(self, index, filename, chunks, pool):
+        """Результаты разбора по порядку диапазонов.
+
+        В работе не больше двух диапазонов на процесс, так что память
+        ограничена размером диапазона, а не файла.
+        """
+        if pool is None:
+            for start, end in chunks:
+                yield end, parse_chunk(index, filename, start, end)
+            return
+        pending = deque()
+        chunks = iter(chunks)
+        for start, end in chunks:
+            pending.append(
+                (end, pool.submit(parse_chunk, index, filename, start, end))
+            )
+            if len(pending) >= 2 * self.options["workers"]:
+                end, future = pending.popleft()
+                yield end, future.result()
+        while pending:
+            end, future = pending.popleft()
+            yield end, future.result()
+
+    def validate(self, source, rows):
+        columns = table_columns(source.model)
+        pk = columns.index(source.model._meta.pk.attname)
+        references = [
+            (attname, columns.index(attname), self.known_ids(model))
+            for attname, model in source.references.items()
+        ]
+        loaded = self.known_ids(source.model)
+        for row in rows:
+            if row[pk] in loaded:
+                self.existing += 1
+                continue
+            missing = [
+                attname for attname, position, known in references
+                if row[position] is not None and row[position] not in known
+            ]
+            if missing:
+                self.reject(
+                    source, f"id={row[pk]}",
+                    f"нет связанных объектов: {', '.join(missing)}",
+                    dict(zip(columns, row)),
+                )
+                continue
+            loaded.add(row[pk])
+            yield row
+
+    def reject(self, source, position, reason, row):
+        self.rejected += 1
+        if self.rejects:
+            self.rejects.writerow((
+                source.filename, position, reason,
+                json.dumps(row, ensure_ascii=False, default=str),
+            ))
+        if self.verbosity > 1:
+            self.stderr.write(f"{source.filename}:{position}: {reason}")
+
+    def insert(self, source, rows):
+        """Вставляет строки пачками. Пачку, нарушившую ограничение базы
+        (уникальность пары отзыва, имени, slug), повторяет по строке в
+        точках сохранения и отклоняет только виноватые строки."""
+        batch_size = self.options["batch_size"]
+        inserted = 0
+        for position in range(0, len(rows), batch_size):
+            batch = rows[position:position + batch_size]
+            try:
+                with transaction.atomic():
+                    insert_rows(source.model, batch, batch_size)
+                inserted += len(batch)
+            except IntegrityError:
+                inserted += self.insert_each(source, batch)
+        return inserted
+
+    def insert_each(self, source, rows):
+        columns = table_columns(source.model)
+        pk = columns.index(source.model._meta.pk.attname)
+        inserted = 0
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    insert_rows(source.model, [row], 1)
+                inserted += 1
+            except IntegrityError as error:
+                # На отклонённую строку не должны ссылаться следующие.
+                self.known_ids(source.model).discard(row[pk])
+                self.reject(
+                    source, f"id={row[pk]}",
+                    "нарушено ограничение базы: "
+                    + str(error).splitlines()[0],
+                    dict(zip(columns, row)),
+                )
+        return inserted
+
+    def import_file(self, index, filename, pool):
+        source = SOURCES[index]
+        self.rejected = 0
+        self.existing = 0
+        inserted = 0
+        resume_from = self.checkpoint.offset(filename)
+        chunks = [
+            (start, end)
+            for start, end in find_chunks(
+                filename, self.options["chunk_size"]
+            )
+            if end > resume_from
+        ]
+        started = time.perf_counter()
+        parsed_bytes = 0
+        for end, (rows, rejected) in self.parsed_chunks(
+            index, filename, chunks, pool
+        ):
+            for position, reason, row in rejected:
+                self.reject(source, position, reason, row)
+            rows = list(self.validate(source, rows))
+            with transaction.atomic():
+                inserted += self.insert(source, rows)
+            self.checkpoint.save(filename, end)
+        if chunks:
+            parsed_bytes = chunks[-1][1] - chunks[0][0]
+        elapsed = time.perf_counter() - started
+        resumed = f", продолжено с байта {resume_from}" if resume_from else ""
+        self.stdout.write(
+            f"{source.filename}: {inserted} строк, уже было "
+            f"{self.existing}, отклонено {self.rejected}, {elapsed:.2f} с, "
+            f"{inserted / elapsed if elapsed else 0:.0f} строк/с, "
+            f"{parsed_bytes / (elapsed or 1) / (1 << 20):.1f} МБ/с{resumed}"
+        )
+
+    def finish(self):
+        refresh_derived([source.model for source in SOURCES])
+        self.stdout.write(self.style.SUCCESS(
+            f"Рейтинги пересчитаны для {Review.objects.count()} отзывов"
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from reviews import search
+
+
+class Command(BaseCommand):
+    help = "Пересоздаёт полнотекстовый индекс произведений (SQLite FTS5)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "Индекс FTS5 есть только в SQLite, на других СУБД поиск "
+                "работает без него."
+            )
+        try:
+            search.create_index(connection)
+        except OperationalError as error:
+            raise CommandError(f"SQLite собран без FTS5: {error}")
+        count = search.rebuild_index(connection)
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано произведений: {count}")
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-17 04:13
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_pub_date_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.IntegerField(blank=True, db_index=True, validators=[django.core.validators.MaxValueValidator(2026)]),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.text.Lower('slug'), name='category_slug_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(django.db.models.functions.text.Lower('slug'), name='genre_slug_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['author', '-pub_date', '-id'], name='comment_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', '-pub_date', '-id'], name='review_author_pub_date_idx'),
+        ),
+    ]
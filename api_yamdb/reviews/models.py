@@ -1,11 +1,14 @@
 from datetime import datetime
 
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Lower
 
 from users.models import User
 
 TWENTY: int = 20
+SCORE_FIELDS = ("score_sum", "review_count")
 
 
 class Category(models.Model):
@@ -14,6 +17,9 @@ class Category(models.Model):
 
     class Meta:
         verbose_name_plural = "Категории"
+        indexes = [
+            models.Index(Lower("slug"), name="category_slug_lower_idx"),
+        ]
 
     def __str__(self):
         return self.slug
@@ -25,6 +31,9 @@ class Genre(models.Model):
 
     class Meta:
         verbose_name_plural = "Жанры"
+        indexes = [
+            models.Index(Lower("slug"), name="genre_slug_lower_idx"),
+        ]
 
     def __str__(self):
         return self.slug
@@ -49,6 +58,8 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name="titles",
     )
+    score_sum = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name_plural = "Произведения"
@@ -56,6 +67,60 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Счётчики оценок пишет только add_scores/recount_scores: иначе
+        сохранение устаревшего экземпляра (PATCH, админка) затёрло бы
+        отзывы, добавленные после его загрузки."""
+        if not self._state.adding and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key
+                ]
+            kwargs["update_fields"] = [
+                name for name in update_fields
+                if name not in SCORE_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def rating(self):
+        if not self.review_count:
+            return None
+        return self.score_sum / self.review_count
+
+    @classmethod
+    def add_scores(cls, title_id, score_delta, count_delta):
+        """Сдвигает сумму оценок и число отзывов произведения."""
+        cls.objects.filter(pk=title_id).update(
+            score_sum=F("score_sum") + score_delta,
+            review_count=F("review_count") + count_delta,
+        )
+
+    @classmethod
+    def recount_scores(cls, title_ids=None):
+        """Пересчитывает сумму оценок и число отзывов одним UPDATE.
+
+        Нужен после записей в обход Review.save(): bulk_create,
+        QuerySet.update() и QuerySet.delete() без сигналов.
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef("pk"), is_hidden=False
+        ).order_by()
+        reviews = reviews.values("title")
+        titles = cls.objects.all()
+        if title_ids is not None:
+            titles = titles.filter(pk__in=title_ids)
+        return titles.update(
+            score_sum=Coalesce(Subquery(
+                reviews.annotate(total=Sum("score")).values("total")
+            ), 0),
+            review_count=Coalesce(Subquery(
+                reviews.annotate(total=Count("pk")).values("total")
+            ), 0),
+        )
+
 
 class Review(models.Model):
     text = models.TextField(
@@ -70,6 +135,7 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True,
+        db_index=True,
     )
     title = models.ForeignKey(
         Title,
@@ -90,10 +156,25 @@ class Review(models.Model):
             ),
         ]
     )
+    is_hidden = models.BooleanField(
+        verbose_name='Скрыт модератором',
+        default=False,
+        editable=False,
+    )
 
     class Meta:
         verbose_name_plural = "Отзывы"
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -104,6 +185,58 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:TWENTY]
 
+    @property
+    def scores(self):
+        """Вклад отзыва в рейтинг: (title_id, score) или None у скрытого."""
+        if self.is_hidden:
+            return None
+        return (self.title_id, self.score)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"title_id", "score", "is_hidden"} <= set(field_names):
+            instance._loaded_scores = instance.scores
+        return instance
+
+    def stored_scores(self, using):
+        """Вклад строки в базе до сохранения; None, если её ещё нет.
+
+        Нужен, когда экземпляр создан с явным pk или загружен без полей
+        рейтинга (`.only()`, `.defer()`) и снимка `_loaded_scores` нет.
+        """
+        if self.pk is None:
+            return None
+        row = Review._base_manager.using(using).filter(pk=self.pk).values_list(
+            "title_id", "score", "is_hidden"
+        ).first()
+        if row is None or row[2]:
+            return None
+        return row[:2]
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(
+            Review, instance=self
+        )
+        with transaction.atomic(using=using):
+            if kwargs.get("force_insert"):
+                loaded = None
+            elif not self._state.adding and hasattr(self, "_loaded_scores"):
+                loaded = self._loaded_scores
+            else:
+                loaded = self.stored_scores(using)
+            super().save(*args, **kwargs)
+            current = self.scores
+            if loaded and current and loaded[0] == current[0]:
+                if loaded[1] != current[1]:
+                    Title.add_scores(current[0], current[1] - loaded[1], 0)
+            else:
+                if loaded:
+                    Title.add_scores(loaded[0], -loaded[1], -1)
+                if current:
+                    Title.add_scores(current[0], current[1], 1)
+            self._loaded_scores = current
+
 
 class Comment(models.Model):
     text = models.TextField(
@@ -118,6 +251,7 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True,
+        db_index=True,
     )
     review = models.ForeignKey(
         Review,
@@ -125,10 +259,25 @@ class Comment(models.Model):
         related_name='comments',
         verbose_name='Отзыв',
     )
+    is_hidden = models.BooleanField(
+        verbose_name='Скрыт модератором',
+        default=False,
+        editable=False,
+    )
 
     class Meta:
         verbose_name_plural = "Комментарии"
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:TWENTY]
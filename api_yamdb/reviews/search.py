@@ -0,0 +1,126 @@
+"""Полнотекстовый индекс произведений на SQLite FTS5.
+
+Индекс хранится в виртуальной таблице `reviews_title_fts`, где rowid
+совпадает с id произведения. На других СУБД, а также если SQLite собран
+без FTS5, поиск откатывается к `icontains` по названию и описанию.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "reviews_title_fts"
+TOKEN_RE = re.compile(r"\w+")
+
+_enabled = {}
+
+
+def is_enabled(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    key = (using, str(connection.settings_dict["NAME"]))
+    if key not in _enabled:
+        with connection.cursor() as cursor:
+            _enabled[key] = (
+                FTS_TABLE in connection.introspection.table_names(cursor)
+            )
+    return _enabled[key]
+
+
+def forget_tables():
+    """Сбрасывает кеш проверки таблицы: нужен после её создания/удаления."""
+    _enabled.clear()
+
+
+def create_index(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+    forget_tables()
+
+
+def drop_index(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    forget_tables()
+
+
+def rebuild_index(connection):
+    """Заполняет индекс заново из `reviews_title` одним запросом."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, description) "
+            "SELECT id, name, description FROM reviews_title"
+        )
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def index_title(title, using=DEFAULT_DB_ALIAS):
+    if not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name, description) "
+            "VALUES (%s, %s, %s)",
+            (title.pk, title.name, title.description),
+        )
+
+
+def index_titles(titles, using=DEFAULT_DB_ALIAS):
+    """Добавляет в индекс пачку произведений одним executemany."""
+    if not titles or not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name, description) "
+            "VALUES (%s, %s, %s)",
+            [(title.pk, title.name, title.description) for title in titles],
+        )
+
+
+def unindex_title(title_id, using=DEFAULT_DB_ALIAS):
+    if not is_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", (title_id,)
+        )
+
+
+def match_expression(query):
+    """Переводит ввод пользователя в запрос FTS5: все слова по префиксу."""
+    return " ".join(
+        f'"{token}"*' for token in TOKEN_RE.findall(query.lower())
+    )
+
+
+def search_titles(queryset, query):
+    """Фильтрует произведения по запросу и упорядочивает их по bm25.
+
+    Совпадения выбираются подзапросом к индексу в том же SQL, поэтому
+    остальные фильтры, подсчёт и пагинация видят их все.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return queryset
+    if not is_enabled(queryset.db):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    table = connections[queryset.db].ops.quote_name(
+        queryset.model._meta.db_table
+    )
+    return queryset.filter(pk__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+        (expression,),
+    )).annotate(search_rank=RawSQL(
+        f"SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+        f"AND rowid = {table}.id",
+        (expression,),
+    )).order_by("search_rank", "pk")
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Category, Genre, Review, Title
+from .suggest import catalog_entry, suggest_index
+
+
+@receiver(post_delete, sender=Review)
+def subtract_review_score(sender, instance, **kwargs):
+    """Убирает оценку удалённого отзыва из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении вместе с автором или
+    произведением: Collector выполняет его в своей транзакции.
+    """
+    scores = getattr(instance, "_loaded_scores", instance.scores)
+    if scores:
+        Title.add_scores(scores[0], -scores[1], -1)
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, using, **kwargs):
+    search.index_title(instance, using)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, using, **kwargs):
+    search.unindex_title(instance.pk, using)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def update_suggestion(sender, instance, using, **kwargs):
+    # Индекс живёт вне базы: меняется только после коммита, иначе откат
+    # оставил бы в подсказках несохранённые записи.
+    entry = catalog_entry(instance)
+    transaction.on_commit(lambda: suggest_index.add(*entry), using=using)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def remove_suggestion(sender, instance, using, **kwargs):
+    key, _ = catalog_entry(instance)
+    transaction.on_commit(lambda: suggest_index.remove(key), using=using)
@@ -0,0 +1,279 @@
+"""Индекс подсказок по названиям произведений, жанров и категорий.
+
+Индекс живёт в памяти процесса. Точные префиксы слов ищутся двоичным
+поиском по отсортированному списку слов; если их меньше, чем нужно,
+кандидаты с опечатками отбираются по общим триграммам и ранжируются по
+расстоянию Левенштейна между запросом и началом слова.
+Сигналы моделей обновляют индекс инкрементно, а раз в `max_age` секунд
+он перестраивается целиком, чтобы подхватить изменения других процессов.
+Перестройка идёт в фоновом потоке, запросы тем временем обслуживает
+прежний индекс; синхронно строится только первый индекс.
+"""
+import bisect
+import itertools
+import re
+import threading
+import time
+
+from django.db import connections
+
+WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    return text.lower().replace("ё", "е")
+
+
+def trigrams(word):
+    """Триграммы начала слова: конец не дополняется, чтобы запрос-префикс
+    делил с полным словом все свои триграммы."""
+    padded = f"  {word}"
+    return {padded[idx:idx + 3] for idx in range(len(padded) - 2)}
+
+
+def allowed_typos(query):
+    if len(query) < 4:
+        return 0
+    if len(query) < 8:
+        return 1
+    return 2
+
+
+def prefix_distance(query, word, limit):
+    """Расстояние Левенштейна от `query` до ближайшего префикса `word`."""
+    previous = list(range(len(word) + 1))
+    for row, char in enumerate(query, 1):
+        current = [row]
+        for col, other in enumerate(word, 1):
+            current.append(min(
+                previous[col] + 1,
+                current[col - 1] + 1,
+                previous[col - 1] + (char != other),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous)
+
+
+class SuggestIndex:
+    """Индекс строится по словарю: триграммы указывают на различные слова,
+    а слова — на записи, поэтому проверка опечаток не зависит от числа
+    названий, в которых слово встречается."""
+
+    def __init__(self, loader, max_age=60):
+        self.loader = loader
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.built_at = None
+        self.generation = 0
+        self.refresher = None
+        # Изменения, пришедшие во время перестройки: применяются к новому
+        # индексу, чтобы он не потерял их.
+        self.changes = None
+        self.entries = {}
+        self.vocabulary = {}
+        self.words = []
+        self.postings = {}
+
+    def ensure_built(self):
+        if self.built_at is None:
+            # Первый индекс строит один запрос, остальные ждут его.
+            with self.build_lock:
+                if self.built_at is None:
+                    self.rebuild()
+        elif time.monotonic() - self.built_at > self.max_age:
+            self.refresh()
+
+    def refresh(self):
+        """Перестраивает индекс в фоновом потоке, если он ещё не запущен."""
+        with self.lock:
+            if self.refresher is not None:
+                return
+            self.refresher = threading.Thread(
+                target=self._refresh, name="suggest-index", daemon=True
+            )
+        self.refresher.start()
+
+    def _refresh(self):
+        try:
+            with self.build_lock:
+                self.rebuild()
+        finally:
+            connections.close_all()
+            self.refresher = None
+
+    def invalidate(self):
+        """Перестроить индекс при следующем запросе, например после
+        массовой загрузки в обход сигналов."""
+        self.generation += 1
+        self.built_at = None
+
+    def rebuild(self):
+        with self.lock:
+            generation = self.generation
+            self.changes = []
+        try:
+            entries, vocabulary, postings = self._load()
+        except BaseException:
+            with self.lock:
+                self.changes = None
+            raise
+        with self.lock:
+            self.entries = entries
+            self.vocabulary = vocabulary
+            self.words = sorted(vocabulary)
+            self.postings = postings
+            changes, self.changes = self.changes, None
+            for change, *args in changes:
+                change(*args)
+            if generation == self.generation:
+                self.built_at = time.monotonic()
+
+    def _load(self):
+        entries = {}
+        vocabulary = {}
+        for key, payload in self.loader():
+            names = tuple(WORD_RE.findall(normalize(payload["name"])))
+            entries[key] = (payload, names)
+            for word in names:
+                vocabulary.setdefault(word, set()).add(key)
+        postings = {}
+        for word in vocabulary:
+            for gram in trigrams(word):
+                postings.setdefault(gram, set()).add(word)
+        return entries, vocabulary, postings
+
+    def add(self, key, payload):
+        with self.lock:
+            if self.changes is not None:
+                self.changes.append((self._add, key, payload))
+            if self.built_at is not None:
+                self._add(key, payload)
+
+    def remove(self, key):
+        with self.lock:
+            if self.changes is not None:
+                self.changes.append((self._remove, key))
+            if self.built_at is not None:
+                self._remove(key)
+
+    def _add(self, key, payload):
+        self._remove(key)
+        names = tuple(WORD_RE.findall(normalize(payload["name"])))
+        self.entries[key] = (payload, names)
+        for word in names:
+            keys = self.vocabulary.setdefault(word, set())
+            if not keys:
+                bisect.insort(self.words, word)
+                for gram in trigrams(word):
+                    self.postings.setdefault(gram, set()).add(word)
+            keys.add(key)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for word in entry[1]:
+            keys = self.vocabulary.get(word)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if keys:
+                continue
+            del self.vocabulary[word]
+            del self.words[bisect.bisect_left(self.words, word)]
+            for gram in trigrams(word):
+                words = self.postings.get(gram)
+                if words is not None:
+                    words.discard(word)
+                    if not words:
+                        del self.postings[gram]
+
+    def query(self, text, limit=10):
+        words = WORD_RE.findall(normalize(text))
+        if not words:
+            return []
+        self.ensure_built()
+        # Последнее слово пользователь ещё набирает, по нему и ищем.
+        query = words[-1]
+        with self.lock:
+            found = self._prefix_matches(query, limit)
+            if len(found) < limit:
+                for key in self._typo_matches(query, limit):
+                    found.setdefault(key, None)
+            return [self.entries[key][0] for key in list(found)[:limit]]
+
+    def _prefix_matches(self, query, limit):
+        """Записи со словом, начинающимся с `query`, в порядке слов:
+        точное совпадение слова раньше его продолжений."""
+        found = {}
+        position = bisect.bisect_left(self.words, query)
+        for word in itertools.islice(self.words, position, None):
+            if len(found) >= limit or not word.startswith(query):
+                break
+            for key in sorted(self.vocabulary[word], key=self._name_length):
+                found.setdefault(key, None)
+        return found
+
+    def _typo_matches(self, query, limit):
+        typos = allowed_typos(query)
+        if not typos:
+            return []
+        postings = sorted(
+            (self.postings.get(gram, set()) for gram in trigrams(query)),
+            key=len,
+        )
+        # Каждая ошибка портит не больше трёх триграмм, поэтому слово
+        # обязано встретиться хотя бы в одной из самых редких.
+        threshold = max(1, len(postings) - 3 * typos)
+        candidates = set().union(*postings[:len(postings) - threshold + 1])
+        distances = {}
+        ranked = []
+        for word in candidates:
+            shared = sum(word in words for words in postings)
+            if shared < threshold:
+                continue
+            prefix = word[:len(query) + typos]
+            if prefix not in distances:
+                distances[prefix] = prefix_distance(query, prefix, typos)
+            if distances[prefix] <= typos:
+                ranked.append((distances[prefix], -shared, word))
+        ranked.sort()
+        found = {}
+        for _, _, word in ranked:
+            if len(found) >= limit:
+                break
+            for key in sorted(self.vocabulary[word], key=self._name_length):
+                found.setdefault(key, None)
+        return list(found)
+
+    def _name_length(self, key):
+        return len(self.entries[key][0]["name"])
+
+
+def catalog_entry(instance):
+    """Ключ и полезная нагрузка подсказки для произведения/жанра/категории."""
+    kind = instance._meta.model_name
+    payload = {"type": kind, "name": instance.name}
+    if kind == "title":
+        payload["id"] = instance.pk
+    else:
+        payload["slug"] = instance.slug
+    return (kind, instance.pk), payload
+
+
+def load_catalog():
+    from .models import Category, Genre, Title
+
+    for model, fields in (
+        (Title, ("name",)),
+        (Genre, ("name", "slug")),
+        (Category, ("name", "slug")),
+    ):
+        for instance in model.objects.only(*fields).iterator():
+            yield catalog_entry(instance)
+
+
+suggest_index = SuggestIndex(load_catalog)
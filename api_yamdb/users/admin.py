@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutboxEmail, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -19,3 +19,11 @@ class UserAdmin(admin.ModelAdmin):
 
 
 admin.site.register(User, UserAdmin)
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('email', 'attempts', 'next_attempt_at', 'last_error')
+    search_fields = ('email',)
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -0,0 +1,251 @@
+"""Фильтр Блума занятых имён и адресов почты.
+
+Отрицательный ответ фильтра точен: имя или адрес точно не заняты и базу
+можно не спрашивать. Положительный может быть ложным с вероятностью
+`SIGNUP_BLOOM["ERROR_RATE"]` и проверяется запросом.
+
+Фильтр строится при старте сервера (wsgi.py, asgi.py), пополняется
+сигналом при сохранении пользователя и раз в `REFRESH_INTERVAL` секунд
+дочитывает пользователей, созданных другими процессами. Пропуски в id
+дочитываются ещё `GAP_TTL` секунд: на PostgreSQL транзакция с меньшим id
+может закоммититься позже. Переименования в других процессах подхватывает
+полная перестройка раз в `MAX_AGE`, а загрузки в обход сигналов
+(import_csv, generate_data) вызывают `invalidate_all()`, и все процессы
+перестраивают фильтр при следующем дочитывании. Перестройка уже
+построенного фильтра идёт в фоновом потоке.
+"""
+import hashlib
+import math
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(
+            -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        ))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, value):
+        # Двойное хеширование: k позиций из двух половин одного blake2b.
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + index * second) % self.size
+            for index in range(self.hashes)
+        )
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(value)
+        )
+
+    def current_error_rate(self):
+        """Оценка вероятности ложного срабатывания при текущем заполнении."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** (
+            self.hashes
+        )
+
+
+class TakenNames:
+    REFRESH_INTERVAL = 5
+    MAX_AGE = 60 * 60
+    # Сколько секунд ждать пользователей с пропущенными id и сколько
+    # пропусков подряд запоминать: больший разрыв — явные id загрузки,
+    # после которой фильтр перестраивается целиком.
+    GAP_TTL = 60
+    MAX_GAP = 1000
+    VERSION_KEY = "taken-names-version"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.built_at = None
+        self.refreshed_at = None
+        self.max_pk = 0
+        self.gaps = {}
+        self.version = None
+        self.rebuilder = None
+        # Ключи, добавленные во время перестройки: попадут и в новый
+        # фильтр.
+        self.pending = None
+
+    @staticmethod
+    def keys(username=None, email=None):
+        """Пары (поле, ключ фильтра) для переданных значений."""
+        if username is not None:
+            yield "username", f"u:{username}"
+        if email is not None:
+            yield "email", f"e:{email}"
+
+    @staticmethod
+    def get_cache():
+        return caches[settings.SIGNUP_BLOOM["CACHE_ALIAS"]]
+
+    def users(self, after_pk=0, gaps=()):
+        from .models import User
+
+        users = Q(pk__gt=after_pk)
+        if gaps:
+            users |= Q(pk__in=gaps)
+        return (
+            User.objects.filter(users)
+            .order_by("pk")
+            .values_list("pk", "username", "email")
+            .iterator()
+        )
+
+    def rebuild(self):
+        from .models import User
+
+        version = self.get_cache().get(self.VERSION_KEY)
+        with self.lock:
+            self.pending = []
+        config = settings.SIGNUP_BLOOM
+        try:
+            # Два ключа на пользователя и запас вдвое до следующей
+            # перестройки.
+            capacity = max(config["CAPACITY"], 4 * User.objects.count())
+            bloom = BloomFilter(capacity, config["ERROR_RATE"])
+            max_pk = 0
+            for pk, username, email in self.users():
+                for _, key in self.keys(username, email):
+                    bloom.add(key)
+                max_pk = pk
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+        with self.lock:
+            for key in self.pending:
+                bloom.add(key)
+            self.pending = None
+            self.filter = bloom
+            self.max_pk = max_pk
+            self.gaps = {}
+            self.version = version
+            self.built_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """Дочитывает пользователей, созданных после последнего чтения,
+        и тех, чьи id остались пропущенными."""
+        if self.get_cache().get(self.VERSION_KEY) != self.version:
+            self.rebuild_in_background()
+            return
+        now = time.monotonic()
+        gaps = [
+            pk for pk, seen_at in self.gaps.items()
+            if now - seen_at < self.GAP_TTL
+        ]
+        rows = list(self.users(self.max_pk, gaps))
+        with self.lock:
+            self.gaps = {pk: self.gaps[pk] for pk in gaps}
+            for pk, username, email in rows:
+                for _, key in self.keys(username, email):
+                    self.filter.add(key)
+                self.gaps.pop(pk, None)
+                if pk > self.max_pk:
+                    if pk - self.max_pk <= self.MAX_GAP:
+                        for missing in range(self.max_pk + 1, pk):
+                            self.gaps[missing] = now
+                    self.max_pk = pk
+            self.refreshed_at = now
+
+    def rebuild_in_background(self):
+        """Перестраивает фильтр в фоновом потоке; запросы тем временем
+        проверяет прежний фильтр."""
+        with self.lock:
+            if self.rebuilder is not None:
+                return
+            self.rebuilder = threading.Thread(
+                target=self._rebuild, name="taken-names", daemon=True
+            )
+        self.rebuilder.start()
+
+    def _rebuild(self):
+        try:
+            self.rebuild()
+        finally:
+            connections.close_all()
+            self.rebuilder = None
+
+    def build_at_startup(self):
+        """Строит фильтр при старте сервера, а не в первом запросе. Если
+        база ещё не готова (например, до миграций), фильтр построит
+        первый запрос."""
+        try:
+            self.rebuild()
+        except DatabaseError:
+            pass
+
+    def ensure_built(self):
+        now = time.monotonic()
+        if self.built_at is None:
+            self.rebuild()
+        elif now - self.built_at > self.MAX_AGE:
+            self.rebuild_in_background()
+        elif now - self.refreshed_at > self.REFRESH_INTERVAL:
+            self.refresh()
+
+    def invalidate(self):
+        """Перестроить фильтр этого процесса при следующем обращении."""
+        self.built_at = None
+
+    def invalidate_all(self):
+        """Перестроить фильтр во всех процессах, например после загрузки
+        пользователей в обход сигналов: остальные процессы увидят новую
+        версию после коммита при очередном дочитывании."""
+        self.invalidate()
+        transaction.on_commit(lambda: self.get_cache().set(
+            self.VERSION_KEY, uuid.uuid4().hex, None
+        ))
+
+    def add(self, username, email):
+        with self.lock:
+            for _, key in self.keys(username, email):
+                if self.pending is not None:
+                    self.pending.append(key)
+                if self.filter is not None:
+                    self.filter.add(key)
+
+    def maybe_taken(self, username=None, email=None):
+        """{поле: bool} для переданных значений; False — точно свободно."""
+        self.ensure_built()
+        return {
+            field: key in self.filter
+            for field, key in self.keys(username, email)
+        }
+
+    def stats(self):
+        self.ensure_built()
+        bloom = self.filter
+        return {
+            "capacity": bloom.capacity,
+            "error_rate": bloom.error_rate,
+            "current_error_rate": round(bloom.current_error_rate(), 8),
+            "bits": bloom.size,
+            "hashes": bloom.hashes,
+            "memory_bytes": len(bloom.bits),
+            "entries": bloom.count,
+        }
+
+
+taken_names = TakenNames()
@@ -0,0 +1,69 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from users.outbox import send_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет письма из очереди OutboxEmail пачками через одно "
+        "соединение почтового бэкенда."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100,
+            help="Сколько писем забирать за проход.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Разобрать очередь и выйти.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть положительным.")
+        self.options = options
+        self.sent = self.failed = 0
+        connection = get_connection()
+        try:
+            while True:
+                self.drain(connection)
+                if options["once"]:
+                    break
+                connection.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Отправлено писем: {self.sent}, ошибок: {self.failed}"
+        ))
+
+    def drain(self, connection):
+        """Отправляет пачки, пока очередь не опустеет."""
+        while True:
+            try:
+                sent, failed = send_batch(
+                    connection, self.options["batch_size"]
+                )
+            except Exception as error:
+                # Почтовый сервер недоступен: забранные письма вернутся
+                # в очередь по окончании аренды.
+                if self.options["once"]:
+                    raise CommandError(f"Ошибка отправки: {error!r}")
+                self.stderr.write(f"Ошибка отправки: {error!r}")
+                return
+            if not (sent or failed):
+                return
+            self.sent += sent
+            self.failed += failed
+            if self.options["verbosity"] > 1:
+                self.stdout.write(f"Отправлено: {sent}, ошибок: {failed}")
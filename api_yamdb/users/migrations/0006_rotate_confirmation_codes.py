@@ -0,0 +1,28 @@
+import uuid
+
+from django.db import migrations
+
+
+def rotate_codes(apps, schema_editor):
+    """Коды подтверждения раньше выводились из почты через uuid3, и их мог
+    вычислить любой. Выданные так коды заменяются случайными."""
+    User = apps.get_model('users', 'User')
+    users = [
+        user for user in User.objects.only('email', 'confirmation_code')
+        if user.confirmation_code == uuid.uuid3(uuid.NAMESPACE_X500,
+                                                user.email)
+    ]
+    for user in users:
+        user.confirmation_code = uuid.uuid4()
+    User.objects.bulk_update(users, ['confirmation_code'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_outbox_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(rotate_codes, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,15 @@
 import uuid
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router
+from django.utils import timezone
 
 ADMIN = 'admin'
 MODERATOR = 'moderator'
 USER = 'user'
 
+# Поля, которые попадают в access-токен и сбрасывают его при изменении.
+TOKEN_FIELDS = ('username', 'role', 'is_staff', 'is_superuser', 'is_active')
+
 CHOICES = (
     (ADMIN, ADMIN),
     (MODERATOR, MODERATOR),
@@ -36,6 +40,7 @@ class User(AbstractUser):
         editable=False,
         unique=True
     )
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     @property
     def is_admin(self):
@@ -50,3 +55,76 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ['username', ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(TOKEN_FIELDS) <= set(field_names):
+            instance._loaded_claims = instance.token_claims
+        return instance
+
+    @property
+    def token_claims(self):
+        return tuple(getattr(self, field) for field in TOKEN_FIELDS)
+
+    def save(self, *args, **kwargs):
+        """Меняет версию токенов, если изменилось то, что в них записано:
+        выданные раньше токены после этого не принимаются."""
+        if self._state.adding and self.pk is None:
+            loaded = None
+        elif not self._state.adding and hasattr(self, "_loaded_claims"):
+            loaded = self._loaded_claims
+        else:
+            # Загружен без полей токена или создан с явным pk: сравнивать
+            # приходится со строкой в базе.
+            loaded = User._base_manager.using(
+                kwargs.get("using") or router.db_for_write(User)
+            ).filter(pk=self.pk).values_list(*TOKEN_FIELDS).first()
+        self.claims_changed = loaded != self.token_claims
+        if loaded is not None and self.claims_changed:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_claims = self.token_claims
+
+
+class ClaimsUser(User):
+    """Пользователь, собранный из утверждений access-токена без запроса.
+
+    Заполнены только поля из токена, поэтому сохранять его нельзя; для
+    внешних ключей и проверок прав он ведёт себя как обычный User.
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("ClaimsUser is built from a token and is read-only")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("ClaimsUser is built from a token and is read-only")
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ждущее отправки `manage.py run_outbox`.
+
+    На адрес держится одна строка: повторная регистрация обновляет её,
+    а не ставит второе письмо. Отправленные строки удаляются.
+    """
+    email = models.EmailField('email', max_length=254, unique=True)
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    attempts = models.PositiveIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now, db_index=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('next_attempt_at', 'id')
+
+    def __str__(self):
+        return self.email
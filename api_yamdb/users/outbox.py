@@ -0,0 +1,119 @@
+"""Очередь исходящих писем в базе.
+
+`enqueue` ставит или обновляет письмо на адрес и сразу возвращается,
+`send_batch` забирает созревшие письма и отправляет их через одно
+соединение почтового бэкенда. Неудачная отправка откладывается с
+экспоненциальной задержкой до `OUTBOX_MAX_ATTEMPTS` попыток.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+# На столько откладываются забранные письма: если отправитель упадёт,
+# их заберёт следующий проход.
+LEASE = timedelta(minutes=5)
+
+
+def enqueue(email, subject, body):
+    """Ставит письмо на адрес; ожидающее письмо на тот же адрес
+    заменяется, а не дублируется.
+
+    Одна вставка с ON CONFLICT (SQLite и PostgreSQL) вместо вставки в
+    точке сохранения и UPDATE: письмо ставится в транзакции регистрации,
+    и конфликт не прерывает её.
+    """
+    values = {
+        "email": email,
+        "subject": subject,
+        "body": body,
+        "attempts": 0,
+        "next_attempt_at": timezone.now(),
+        "last_error": "",
+    }
+    connection = connections[router.db_for_write(OutboxEmail)]
+    quote = connection.ops.quote_name
+    meta = OutboxEmail._meta
+    columns = {
+        name: quote(meta.get_field(name).column) for name in values
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(meta.db_table)} "
+            f"({', '.join(columns.values())}) "
+            f"VALUES ({', '.join(['%s'] * len(values))}) "
+            f"ON CONFLICT ({columns['email']}) DO UPDATE SET "
+            + ", ".join(
+                f"{column} = excluded.{column}"
+                for name, column in columns.items() if name != "email"
+            ),
+            [
+                meta.get_field(name).get_db_prep_save(value, connection)
+                for name, value in values.items()
+            ],
+        )
+
+
+def backoff(attempts):
+    delay = settings.OUTBOX_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.OUTBOX_MAX_BACKOFF))
+
+
+def claim(batch_size):
+    """Забирает созревшие письма и откладывает их на время аренды.
+
+    Возвращает письма и конец аренды: по нему видно, что строку не
+    обновила повторная регистрация, пока письмо отправлялось.
+    """
+    now = timezone.now()
+    lease_until = now + LEASE
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                next_attempt_at__lte=now,
+                attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+            )[:batch_size]
+        )
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=lease_until)
+    return emails, lease_until
+
+
+def send_batch(connection, batch_size):
+    """Отправляет одну пачку и возвращает (отправлено, ошибок)."""
+    emails, lease_until = claim(batch_size)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    connection.open()
+    for email in emails:
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=(email.email,),
+            connection=connection,
+        )
+        try:
+            message.send()
+        except Exception as error:
+            attempts = email.attempts + 1
+            OutboxEmail.objects.filter(
+                pk=email.pk, next_attempt_at=lease_until
+            ).update(
+                attempts=attempts,
+                last_error=repr(error),
+                next_attempt_at=timezone.now() + backoff(attempts),
+            )
+            failed.append(email.pk)
+        else:
+            sent.append(email.pk)
+    OutboxEmail.objects.filter(
+        pk__in=sent, next_attempt_at=lease_until
+    ).delete()
+    return len(sent), len(failed)
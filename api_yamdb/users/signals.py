@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .bloom import taken_names
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def remember_taken_names(sender, instance, **kwargs):
+    taken_names.add(instance.username, instance.email)
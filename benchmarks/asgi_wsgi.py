@@ -0,0 +1,175 @@
+"""Пропускная способность чтения каталога под WSGI и ASGI.
+
+Один и тот же проект поднимается gunicorn (gthread, WSGI) и uvicorn
+(ASGI) с одинаковым числом процессов; у gunicorn потоков столько же,
+сколько потоков базы у асинхронных представлений (`ASYNC_DB_THREADS`).
+Серверы ставятся отдельно: `pip install gunicorn uvicorn`.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.asgi_wsgi [процессов] [параллельность] [запросов]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+from benchmarks.utils import (BASE_DIR, PROJECT_DIR, median, percentile,
+                              print_table, setup_django)
+
+WORKERS = 2
+CONCURRENCY = 32
+REQUESTS = 2000
+PORT = 8765
+ENDPOINTS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?genre=genre-1',
+    '/api/v1/titles/{title_id}/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/categories/',
+    '/api/v1/genres/',
+)
+
+
+def seed():
+    from django.core.management import call_command
+
+    from reviews.models import Category, Genre, Review, Title
+    from users.models import User
+
+    call_command('migrate', verbosity=0)
+    categories = Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(10)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(20)
+    )
+    genres = list(Genre.objects.all())
+    categories = list(Category.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000,
+              category=categories[idx % len(categories)])
+        for idx in range(2000)
+    )
+    through = Title.genre.through
+    through.objects.bulk_create(
+        through(title_id=title_id, genre_id=genres[title_id % 20].id)
+        for title_id in Title.objects.values_list('id', flat=True)
+    )
+    User.objects.bulk_create(
+        User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+        for idx in range(200)
+    )
+    title = Title.objects.order_by('id').first()
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=7)
+        for author in User.objects.all()
+    )
+    Title.recount_scores()
+    return title.id
+
+
+def server_command(kind, workers):
+    bind = f'127.0.0.1:{PORT}'
+    if kind == 'wsgi':
+        from django.conf import settings
+        return [
+            sys.executable, '-m', 'gunicorn', 'api_yamdb.wsgi:application',
+            '--workers', str(workers), '--worker-class', 'gthread',
+            '--threads', str(settings.ASYNC_DB_THREADS), '--bind', bind,
+            '--log-level', 'warning',
+        ]
+    return [
+        sys.executable, '-m', 'uvicorn', 'api_yamdb.asgi:application',
+        '--workers', str(workers), '--host', '127.0.0.1',
+        '--port', str(PORT), '--log-level', 'warning', '--no-access-log',
+    ]
+
+
+def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Сервер не ответил на {url}')
+
+
+def get(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return status, (time.perf_counter() - started) * 1000
+
+
+def load(url, concurrency, requests):
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(get, [url] * requests))
+        elapsed = time.perf_counter() - started
+    errors = sum(status != 200 for status, _ in results)
+    timings = [timing for _, timing in results]
+    return (
+        f'{requests / elapsed:.0f}',
+        f'{median(timings):.1f}',
+        f'{percentile(timings, 99):.1f}',
+        errors,
+    )
+
+
+def main():
+    missing = [name for name in ('gunicorn', 'uvicorn') if not find_spec(name)]
+    if missing:
+        sys.exit(f'Нужны серверы: pip install {" ".join(missing)}')
+    workers, concurrency, requests = (
+        int(value) for value in
+        (sys.argv[1:] + [WORKERS, CONCURRENCY, REQUESTS][len(sys.argv) - 1:])
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'BENCHMARK_DB': f'{tmp}/bench.sqlite3',
+            'BENCHMARK_CACHE': f'{tmp}/cache',
+            'DJANGO_SETTINGS_MODULE': 'benchmarks.settings',
+            'PYTHONPATH': os.pathsep.join((str(BASE_DIR), str(PROJECT_DIR))),
+        }
+        os.environ.update(env)
+        setup_django('benchmarks.settings')
+        title_id = seed()
+        base_url = f'http://127.0.0.1:{PORT}'
+        rows = []
+        for kind in ('wsgi', 'asgi'):
+            server = subprocess.Popen(
+                server_command(kind, workers), cwd=PROJECT_DIR, env=env
+            )
+            try:
+                wait_ready(f'{base_url}/api/v1/genres/')
+                for endpoint in ENDPOINTS:
+                    url = base_url + endpoint.format(title_id=title_id)
+                    # Прогрев: кеш ответов и соединения всех процессов.
+                    load(url, concurrency, concurrency * 2)
+                    rows.append(
+                        (kind, endpoint, *load(url, concurrency, requests))
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+    print_table(
+        ('server', 'endpoint', 'req/s', 'p50_ms', 'p99_ms', 'errors'), rows
+    )
+
+
+if __name__ == '__main__':
+    main()
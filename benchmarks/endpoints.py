@@ -0,0 +1,525 @@
+"""Замер всех маршрутов api/v1: списки, детали, фильтры, вложенные
+ресурсы и запись.
+
+База заполняется командой `generate_data` заданного размера, затем
+каждый сценарий из `cases` выполняется последовательно сначала через
+тестовый клиент Django, потом через настоящий HTTP-сервер. Для каждого
+сценария печатаются p50/p95/p99 задержки, запросы к базе и байты на
+ответ; те же числа пишутся в JSON, который удобно сравнивать между
+коммитами (`--compare` печатает разницу с прошлым прогоном). Маршруты,
+которые не покрыл ни один сценарий, попадают в `uncovered`.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.endpoints --reviews 100000 --output endpoints.json
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from io import StringIO
+
+from benchmarks.utils import (BASE_DIR, QueryCounter, live_server, median,
+                              percentile, print_table, setup_django,
+                              test_database)
+
+REQUESTS = 100
+CLIENTS = ('test_client', 'live_server')
+EXPECTED = {'GET': 200, 'POST': 201, 'PATCH': 200, 'DELETE': 204}
+
+
+@dataclass
+class Case:
+    """Сценарий: один запрос, повторяемый `--requests` раз.
+
+    В `path` и строковых значениях `data` подставляются поля контекста
+    и номер повтора `{i}`; значения-списки и словари контекста берутся
+    по номеру повтора. Если задан `store`, id созданного объекта
+    запоминается в контексте под этим именем для следующих сценариев.
+    """
+
+    name: str
+    kind: str
+    method: str
+    path: str
+    data: object = None
+    user: str = 'admin'
+    status: int = None
+    store: str = None
+
+    @property
+    def expected(self):
+        return self.status or EXPECTED[self.method]
+
+
+def cases():
+    title = {
+        'name': 'Замер {i}', 'year': 2000, 'category': '{category}',
+        'genre': ['{genre}'],
+    }
+    return [
+        Case('api root', 'list', 'GET', '/api/v1/'),
+        Case('users', 'list', 'GET', '/api/v1/users/'),
+        Case('users search', 'filtered', 'GET',
+             '/api/v1/users/?search={username}'),
+        Case('user', 'detail', 'GET', '/api/v1/users/{username}/'),
+        Case('me', 'detail', 'GET', '/api/v1/users/me/', user='reader'),
+        Case('me update', 'write', 'PATCH', '/api/v1/users/me/',
+             {'bio': 'Замер {i}'}, user='reader'),
+        Case('user create', 'write', 'POST', '/api/v1/users/',
+             {'username': 'bench{i}', 'email': 'bench{i}@yamdb.fake'}),
+        Case('user update', 'write', 'PATCH', '/api/v1/users/bench{i}/',
+             {'bio': 'Замер {i}'}),
+        Case('user delete', 'write', 'DELETE', '/api/v1/users/bench{i}/'),
+        Case('categories', 'list', 'GET', '/api/v1/categories/'),
+        Case('category create', 'write', 'POST', '/api/v1/categories/',
+             {'name': 'Замер {i}', 'slug': 'bench-{i}'}),
+        Case('category delete', 'write', 'DELETE',
+             '/api/v1/categories/bench-{i}/'),
+        Case('genres', 'list', 'GET', '/api/v1/genres/'),
+        Case('genre create', 'write', 'POST', '/api/v1/genres/',
+             {'name': 'Замер {i}', 'slug': 'bench-{i}'}),
+        Case('genre delete', 'write', 'DELETE', '/api/v1/genres/bench-{i}/'),
+        Case('titles', 'list', 'GET', '/api/v1/titles/'),
+        Case('titles by genre', 'filtered', 'GET',
+             '/api/v1/titles/?genre={genre}'),
+        Case('titles by category', 'filtered', 'GET',
+             '/api/v1/titles/?category={category}&year=2000'),
+        Case('titles by name', 'filtered', 'GET',
+             '/api/v1/titles/?name={word}'),
+        Case('titles search', 'filtered', 'GET',
+             '/api/v1/titles/?search={word}'),
+        Case('title', 'detail', 'GET', '/api/v1/titles/{title}/'),
+        Case('title create', 'write', 'POST', '/api/v1/titles/', title,
+             store='new_title'),
+        Case('title update', 'write', 'PATCH', '/api/v1/titles/{new_title}/',
+             {'description': 'Замер {i}'}),
+        Case('title delete', 'write', 'DELETE',
+             '/api/v1/titles/{new_title}/'),
+        Case('titles bulk', 'write', 'POST', '/api/v1/titles/bulk/',
+             [title] * 10),
+        Case('reviews', 'nested', 'GET', '/api/v1/titles/{title}/reviews/'),
+        Case('reviews cursor', 'nested', 'GET',
+             '/api/v1/titles/{title}/reviews/?cursor='),
+        Case('review', 'detail', 'GET',
+             '/api/v1/titles/{title}/reviews/{review}/'),
+        Case('review create', 'write', 'POST',
+             '/api/v1/titles/{fresh_title}/reviews/',
+             {'text': 'Замер {i}', 'score': 7}, store='new_review'),
+        Case('review update', 'write', 'PATCH',
+             '/api/v1/titles/{fresh_title}/reviews/{new_review}/',
+             {'score': 8}),
+        Case('review delete', 'write', 'DELETE',
+             '/api/v1/titles/{fresh_title}/reviews/{new_review}/'),
+        Case('comments', 'nested', 'GET',
+             '/api/v1/titles/{title}/reviews/{review}/comments/'),
+        Case('comment', 'detail', 'GET',
+             '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/'),
+        Case('comment create', 'write', 'POST',
+             '/api/v1/titles/{title}/reviews/{review}/comments/',
+             {'text': 'Замер {i}'}, store='new_comment'),
+        Case('comment update', 'write', 'PATCH',
+             '/api/v1/titles/{title}/reviews/{review}/comments/'
+             '{new_comment}/', {'text': 'Замер {i}'}),
+        Case('comment delete', 'write', 'DELETE',
+             '/api/v1/titles/{title}/reviews/{review}/comments/'
+             '{new_comment}/'),
+        Case('signup', 'write', 'POST', '/api/v1/auth/signup/',
+             {'username': 'signup{i}', 'email': 'signup{i}@yamdb.fake'},
+             user=None, status=200),
+        Case('available', 'detail', 'GET',
+             '/api/v1/auth/available/?username={username}&email=free{i}'
+             '@yamdb.fake', user=None),
+        Case('available stats', 'detail', 'GET',
+             '/api/v1/auth/available/stats/'),
+        Case('token', 'write', 'POST', '/api/v1/auth/token/',
+             {'username': '{username}', 'confirmation_code': '{code}'},
+             user=None, status=200),
+        Case('logout', 'write', 'POST', '/api/v1/auth/logout/',
+             user='reader', status=204),
+        Case('token cache', 'detail', 'GET', '/api/v1/auth/token-cache/'),
+        Case('suggest', 'filtered', 'GET', '/api/v1/suggest/?q={word}'),
+        Case('export titles', 'list', 'GET', '/api/v1/export/titles/'),
+        Case('export reviews', 'filtered', 'GET',
+             '/api/v1/export/reviews/?since={since}'),
+        Case('moderation hide', 'write', 'POST', '/api/v1/moderation/',
+             {'target': 'comments', 'action': 'hide',
+              'ids': ['{hidden}']}, user='moderator', status=200),
+        Case('moderation show', 'write', 'POST', '/api/v1/moderation/',
+             {'target': 'comments', 'action': 'show',
+              'ids': ['{hidden}']}, user='moderator', status=200),
+    ]
+
+
+def seed(options):
+    """Заполняет базу и возвращает контекст сценариев."""
+    from django.core.management import call_command
+    from django.db.models import Count
+
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import ADMIN, MODERATOR, User
+
+    call_command(
+        'generate_data', users=options.users, titles=options.titles,
+        reviews=options.reviews, seed=options.seed, stdout=StringIO(),
+    )
+    users = {
+        'admin': User.objects.create(
+            username='bench-admin', email='admin@bench.fake', role=ADMIN
+        ),
+        'moderator': User.objects.create(
+            username='bench-moderator', email='moderator@bench.fake',
+            role=MODERATOR,
+        ),
+        'reader': User.objects.create(
+            username='bench-reader', email='reader@bench.fake'
+        ),
+    }
+    # Самое популярное произведение и самый обсуждаемый его отзыв:
+    # худший случай для вложенных списков.
+    title = Title.objects.order_by('-review_count', 'id').first()
+    review = title.reviews.annotate(
+        comments_total=Count('comments')
+    ).order_by('-comments_total', 'id').first()
+    comments = list(review.comments.order_by('id').values_list(
+        'id', flat=True
+    )[:2])
+    author = User.objects.order_by('id').first()
+    return {
+        'users': users,
+        'title': title.id,
+        'review': review.id,
+        'comment': comments[0],
+        'hidden': comments[-1],
+        # Произведения без отзывов администратора: по одному на повтор.
+        'fresh_title': list(Title.objects.order_by('id').values_list(
+            'id', flat=True
+        )),
+        'category': Category.objects.order_by('id').first().slug,
+        'genre': Genre.objects.order_by('id').first().slug,
+        'word': title.name.split()[0].lower(),
+        'username': author.username,
+        'code': str(author.confirmation_code),
+        # Выгрузка примерно сотни последних отзывов.
+        'since': list(Review.objects.order_by('-pub_date').values_list(
+            'pub_date', flat=True
+        )[:100])[-1].isoformat(),
+        'counts': {
+            model._meta.model_name: model.objects.count()
+            for model in (User, Title, Review, Comment)
+        },
+    }
+
+
+def fill(value, context, index, escape=str):
+    """Подставляет контекст в строку, список или словарь сценария;
+    `escape` готовит подставляемые значения, например, для адреса."""
+    if isinstance(value, str):
+        fields = {
+            name: escape(
+                field[index] if isinstance(field, (list, dict)) else field
+            )
+            for name, field in context.items()
+            if f'{{{name}}}' in value
+        }
+        return value.format(i=index, **fields)
+    if isinstance(value, list):
+        return [fill(item, context, index) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, context, index)
+                for key, item in value.items()}
+    return value
+
+
+def authorization(user):
+    from api.v1.authentication import issue_access_token
+
+    if user is None:
+        return {}
+    # Токен выпускается заново: выход из системы отзывает прежние.
+    user.refresh_from_db()
+    return {'HTTP_AUTHORIZATION': f'Bearer {issue_access_token(user)}'}
+
+
+class TestClient:
+    name = 'test_client'
+
+    def __init__(self):
+        from rest_framework.test import APIClient
+
+        self.client = APIClient()
+
+    def __call__(self, method, path, data, headers):
+        started = time.perf_counter()
+        response = getattr(self.client, method.lower())(
+            path, data, format='json', **headers
+        )
+        content = (
+            b''.join(response.streaming_content) if response.streaming
+            else response.content
+        )
+        return (
+            response.status_code, (time.perf_counter() - started) * 1000,
+            content,
+        )
+
+
+class HttpClient:
+    name = 'live_server'
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def __call__(self, method, path, data, headers):
+        request = urllib.request.Request(
+            self.base_url + path, method=method,
+            data=None if data is None else json.dumps(data).encode(),
+            headers={
+                'Content-Type': 'application/json',
+                **({'Authorization': headers['HTTP_AUTHORIZATION']}
+                   if headers else {}),
+            },
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                content = response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            content = error.read()
+            status = error.code
+        return status, (time.perf_counter() - started) * 1000, content
+
+
+def prepare(case, context, index):
+    return (
+        fill(case.path, context, index,
+             lambda field: urllib.parse.quote(str(field), safe='')),
+        fill(case.data, context, index),
+        authorization(context['users'].get(case.user)),
+    )
+
+
+def run_case(client, case, context, indexes):
+    """Выполняет сценарий и сводит задержки, запросы и байты."""
+    from django.urls import resolve
+
+    if case.method == 'GET':
+        # Прогрев: соединения с базой, кеши процесса и ответов.
+        client(case.method, *prepare(case, context, indexes[0]))
+    timings, queries, sizes, errors = [], [], [], 0
+    with QueryCounter() as counter:
+        for index in indexes:
+            path, data, headers = prepare(case, context, index)
+            before = counter.count
+            status, elapsed, content = client(
+                case.method, path, data, headers
+            )
+            timings.append(elapsed)
+            queries.append(counter.count - before)
+            sizes.append(len(content))
+            errors += status != case.expected
+            if case.store and status == case.expected:
+                context.setdefault(case.store, {})[index] = (
+                    json.loads(content)['id']
+                )
+    return {
+        'client': client.name,
+        'name': case.name,
+        'kind': case.kind,
+        'method': case.method,
+        'route': resolve(path.split('?')[0]).route,
+        'requests': len(timings),
+        'errors': errors,
+        'p50_ms': round(median(timings), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'queries': round(sum(queries) / len(queries), 2),
+        'max_queries': max(queries),
+        'bytes': round(sum(sizes) / len(sizes)),
+    }
+
+
+def api_routes():
+    """Маршруты api/v1 в виде `ResolverMatch.route`, кроме вариантов с
+    суффиксом формата и маршрутов роутера, перекрытых более ранними
+    (например, асинхронными представлениями каталога)."""
+    from django.urls import URLResolver, get_resolver, resolve, reverse
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = URLResolver._join_route(prefix, str(pattern.pattern))
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, route)
+            elif 'format' not in pattern.pattern.regex.groupindex:
+                yield route, pattern
+
+    routes = []
+    for route, pattern in walk(get_resolver().url_patterns, ''):
+        if not route.startswith('api/v1/'):
+            continue
+        if pattern.name:
+            sample = reverse(pattern.name, kwargs={
+                group: '1' for group in pattern.pattern.regex.groupindex
+            })
+            if resolve(sample).route != route:
+                continue
+        if route not in routes:
+            routes.append(route)
+    return routes
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, path):
+    """Печатает разницу p50 и запросов с прошлым прогоном."""
+    with open(path, encoding='utf-8') as file:
+        previous = {
+            (row['client'], row['name']): row
+            for row in json.load(file)['results']
+        }
+    rows = []
+    for row in results:
+        old = previous.get((row['client'], row['name']))
+        if old is None:
+            continue
+        rows.append((
+            row['client'], row['name'], old['p50_ms'], row['p50_ms'],
+            f"{(row['p50_ms'] / old['p50_ms'] - 1) * 100:+.0f}%"
+            if old['p50_ms'] else '-',
+            old['queries'], row['queries'],
+        ))
+    print_table(
+        ('client', 'case', 'old_p50', 'p50', 'change', 'old_queries',
+         'queries'),
+        rows,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--requests', type=int, default=REQUESTS,
+        help='Повторов каждого сценария на каждом клиенте.',
+    )
+    parser.add_argument(
+        '--clients', nargs='+', choices=CLIENTS, default=CLIENTS,
+    )
+    parser.add_argument('--output', default='endpoints.json')
+    parser.add_argument(
+        '--compare', metavar='JSON',
+        help='Прошлый прогон, с которым сравнить результаты.',
+    )
+    return parser.parse_args()
+
+
+def run_clients(options, context):
+    from reviews.models import Title
+
+    results = []
+    for position, name in enumerate(options.clients):
+        # Пакетно созданные произведения не удаляются сценариями, а
+        # следующий клиент должен видеть те же списки и выгрузки.
+        Title.objects.filter(name__startswith='Замер ').delete()
+        # Номера повторов у клиентов не пересекаются: созданные
+        # объекты получают новые имена, а отзывы — новые произведения.
+        indexes = range(
+            position * options.requests, (position + 1) * options.requests
+        )
+        if name == 'test_client':
+            client = TestClient()
+            results.extend(
+                run_case(client, case, context, indexes)
+                for case in cases()
+            )
+            continue
+        with live_server() as base_url:
+            client = HttpClient(base_url)
+            results.extend(
+                run_case(client, case, context, indexes)
+                for case in cases()
+            )
+    return results
+
+
+def main():
+    options = parse_args()
+    setup_django()
+    # Ответы 4xx сценариев считаются в errors, в журнал они не нужны.
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+
+    if options.titles < options.requests * len(options.clients):
+        raise SystemExit(
+            'Отзывы администратора пишутся на разные произведения: нужно '
+            '--titles не меньше --requests на каждый клиент.'
+        )
+    unthrottled = override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {
+            scope: None
+            for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+        },
+    })
+    with tempfile.TemporaryDirectory() as tmp, unthrottled, \
+            test_database(f'{tmp}/endpoints.sqlite3'):
+        context = seed(options)
+        results = run_clients(options, context)
+        vendor = connection.vendor
+    covered = {row['route'] for row in results}
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'database': vendor,
+            'dataset': context['counts'],
+            'requests': options.requests,
+        },
+        'results': results,
+        'uncovered': [
+            route for route in api_routes() if route not in covered
+        ],
+    }
+    with open(options.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print_table(
+        ('client', 'case', 'kind', 'errors', 'p50_ms', 'p95_ms', 'p99_ms',
+         'queries', 'bytes'),
+        [
+            tuple(row[key] for key in (
+                'client', 'name', 'kind', 'errors', 'p50_ms', 'p95_ms',
+                'p99_ms', 'queries', 'bytes',
+            ))
+            for row in results
+        ],
+    )
+    if report['uncovered']:
+        print('Маршруты без сценариев:', *report['uncovered'], sep='\n  ')
+    if options.compare:
+        compare(results, options.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Замер массовой модерации: скрыть, вернуть и удалить все отзывы
+одного автора вместе с комментариями.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.moderation [число отзывов]
+"""
+import sys
+import time
+
+from benchmarks.utils import print_table, setup_django, test_database
+
+ROWS = 100_000
+
+
+def seed(rows):
+    from reviews.models import Comment, Review, Title
+    from users.models import User
+
+    spammer = User.objects.create(username='spammer',
+                                  email='spammer@yamdb.fake')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000) for idx in range(rows)
+    )
+    Review.objects.bulk_create(
+        Review(title_id=title_id, author=spammer, text='Спам', score=1)
+        for title_id in Title.objects.values_list('id', flat=True)
+    )
+    Comment.objects.bulk_create(
+        Comment(review_id=review_id, author=spammer, text='Спам')
+        for review_id in Review.objects.values_list('id', flat=True)
+    )
+    Title.recount_scores()
+    return spammer
+
+
+def main():
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from api.v1.moderation import moderate
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with test_database():
+        spammer = seed(rows)
+        results = []
+        for target, action in (
+            ('reviews', 'hide'),
+            ('reviews', 'show'),
+            ('comments', 'delete'),
+            ('reviews', 'delete'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                affected = moderate(target, action, author=spammer)
+                elapsed = time.perf_counter() - started
+            results.append((
+                target, action, affected[target], len(context),
+                f'{elapsed:.2f}',
+            ))
+        print_table(
+            ('target', 'action', 'rows', 'queries', 'seconds'), results
+        )
+
+
+if __name__ == '__main__':
+    main()
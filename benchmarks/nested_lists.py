@@ -0,0 +1,63 @@
+"""Замер списков отзывов и комментариев при разном размере страницы.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.nested_lists
+"""
+from benchmarks.utils import (measure, median, print_table, setup_django,
+                              test_database)
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def seed(rows):
+    from reviews.models import Category, Comment, Review, Title
+    from users.models import User
+
+    User.objects.bulk_create(
+        User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+        for idx in range(rows)
+    )
+    users = list(User.objects.all())
+    category = Category.objects.create(name='Фильм', slug='films')
+    title = Title.objects.create(name='Бенчмарк', year=2000,
+                                 category=category)
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text=f'review {idx}', score=5)
+        for idx, author in enumerate(users)
+    )
+    review = Review.objects.filter(title=title).first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text=f'comment {idx}')
+        for idx, author in enumerate(users)
+    )
+    return title, review
+
+
+def main():
+    setup_django()
+    from rest_framework.pagination import PageNumberPagination
+    from rest_framework.test import APIClient
+
+    with test_database():
+        title, review = seed(max(PAGE_SIZES))
+        client = APIClient()
+        urls = {
+            'reviews': f'/api/v1/titles/{title.id}/reviews/',
+            'comments': (
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            ),
+        }
+        rows = []
+        for page_size in PAGE_SIZES:
+            PageNumberPagination.page_size = page_size
+            for name, url in urls.items():
+                timings, queries = measure(lambda: client.get(url))
+                rows.append(
+                    (name, page_size, queries, f'{median(timings):.1f}')
+                )
+        print_table(('endpoint', 'page_size', 'queries', 'median_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+"""Настройки для серверов, которые запускают замеры в отдельных процессах:
+база и кеш ответов берутся из переменных окружения."""
+import os
+
+from api_yamdb.settings import *  # noqa: F401,F403
+from api_yamdb.settings import CACHES, DATABASES
+
+DEBUG = False
+DATABASES['default']['NAME'] = os.environ['BENCHMARK_DB']
+CACHES['responses']['LOCATION'] = os.environ['BENCHMARK_CACHE']
@@ -0,0 +1,95 @@
+"""Нагрузочный замер регистрации через настоящий HTTP-сервер.
+
+Параллельно шлёт новые, повторные и конфликтующие регистрации и
+печатает req/s, задержки и число запросов к базе на регистрацию.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.signup [число регистраций] [параллельность]
+"""
+import logging
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import (QueryCounter, live_server, median, percentile,
+                              print_table, setup_django, test_database)
+
+REQUESTS = 500
+CONCURRENCY = 8
+
+
+def post(url, data):
+    request = urllib.request.Request(
+        url, data=urllib.parse.urlencode(data).encode(), method='POST'
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return status, (time.perf_counter() - started) * 1000
+
+
+def run(url, payloads, concurrency):
+    with QueryCounter() as counter, ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        results = list(pool.map(lambda data: post(url, data), payloads))
+        elapsed = time.perf_counter() - started
+    statuses = {status for status, _ in results}
+    timings = [timing for _, timing in results]
+    return (
+        ','.join(map(str, sorted(statuses))),
+        f'{len(payloads) / elapsed:.0f}',
+        f'{counter.count / len(payloads):.1f}',
+        f'{median(timings):.1f}',
+        f'{percentile(timings, 99):.1f}',
+    )
+
+
+def main():
+    setup_django()
+    # Ответы 400 на конфликтующие регистрации ожидаемы.
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else CONCURRENCY
+    new = [
+        {'email': f'bench{idx}@yamdb.fake', 'username': f'bench{idx}'}
+        for idx in range(requests)
+    ]
+    conflicts = [
+        {'email': f'other{idx}@yamdb.fake', 'username': f'bench{idx}'}
+        for idx in range(requests)
+    ]
+    from django.conf import settings
+    from django.test import override_settings
+
+    # Все запросы идут с одного адреса: лимит регистраций отключается.
+    unthrottled = override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'signup': None},
+    })
+    with tempfile.TemporaryDirectory() as tmp, unthrottled, \
+            test_database(f'{tmp}/signup.sqlite3'), \
+            live_server() as base_url:
+        url = f'{base_url}/api/v1/auth/signup/'
+        rows = [
+            (name, requests, concurrency, *run(url, payloads, concurrency))
+            for name, payloads in (
+                ('new', new), ('repeat', new), ('conflict', conflicts),
+            )
+        ]
+    print_table(
+        ('signup', 'requests', 'threads', 'status', 'req/s',
+         'queries/req', 'p50_ms', 'p99_ms'),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
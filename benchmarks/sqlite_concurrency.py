@@ -0,0 +1,170 @@
+"""Чтение и запись отзывов из нескольких потоков: SQLite по умолчанию
+против профиля production (WAL, прагмы, BEGIN IMMEDIATE).
+
+Каждый профиль замеряется в отдельном процессе на своём файле базы.
+Читатели листают отзывы произведения, писатели добавляют комментарии и
+меняют оценку отзыва в транзакции «прочитать, затем записать».
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.sqlite_concurrency [читателей] [писателей] [секунд]
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import (BASE_DIR, PROJECT_DIR, percentile,
+                              print_table, setup_django)
+
+READERS = 8
+WRITERS = 4
+DURATION = 5
+PROFILES = ('development', 'production')
+
+
+def seed():
+    from django.core.management import call_command
+
+    from reviews.models import Review, Title
+    from users.models import User
+
+    call_command('migrate', verbosity=0)
+    title = Title.objects.create(name='Произведение', year=2000)
+    User.objects.bulk_create(
+        User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+        for idx in range(100)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for author in User.objects.all()
+    )
+    Title.recount_scores()
+    return title.id
+
+
+class Worker(threading.Thread):
+
+    def __init__(self, operation, deadline):
+        super().__init__()
+        self.operation = operation
+        self.deadline = deadline
+        self.timings = []
+        self.locked = 0
+
+    def run(self):
+        from django.db import OperationalError, connection
+
+        try:
+            while time.monotonic() < self.deadline:
+                started = time.perf_counter()
+                try:
+                    self.operation()
+                except OperationalError as error:
+                    if 'locked' not in str(error):
+                        raise
+                    self.locked += 1
+                    continue
+                self.timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+
+
+def run_profile(readers, writers, duration):
+    """Замер в текущем процессе; профиль задан переменной окружения."""
+    setup_django('benchmarks.settings')
+    from django.db import connection, transaction
+
+    from reviews.models import Comment, Review
+
+    title_id = seed()
+    review_ids = list(
+        Review.objects.filter(title_id=title_id).values_list('id', flat=True)
+    )
+    connection.close()
+
+    def read():
+        list(
+            Review.objects.filter(title_id=title_id)
+            .select_related('author').order_by('-pub_date')[:5]
+        )
+
+    def write():
+        review_id = random.choice(review_ids)
+        with transaction.atomic():
+            review = Review.objects.get(pk=review_id)
+            review.score = review.score % 10 + 1
+            review.save()
+        Comment.objects.create(
+            review_id=review_id, author_id=review.author_id, text='Ответ'
+        )
+
+    deadline = time.monotonic() + duration
+    workers = (
+        [Worker(read, deadline) for _ in range(readers)]
+        + [Worker(write, deadline) for _ in range(writers)]
+    )
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    result = {}
+    for kind, group in (('read', workers[:readers]),
+                        ('write', workers[readers:])):
+        timings = [timing for worker in group for timing in worker.timings]
+        result[kind] = {
+            'ops': len(timings) / duration,
+            'p99': percentile(timings, 99) if timings else 0,
+            'locked': sum(worker.locked for worker in group),
+        }
+    print(json.dumps(result))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run_profile(*(int(value) for value in sys.argv[2:]))
+        return
+    readers, writers, duration = (
+        int(value) for value in
+        (sys.argv[1:] + [READERS, WRITERS, DURATION][len(sys.argv) - 1:])
+    )
+    rows = []
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                'DATABASE_PROFILE': profile,
+                'BENCHMARK_DB': f'{tmp}/bench.sqlite3',
+                'BENCHMARK_CACHE': f'{tmp}/cache',
+                'PYTHONPATH': os.pathsep.join(
+                    (str(BASE_DIR), str(PROJECT_DIR))
+                ),
+            }
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.sqlite_concurrency',
+                 '--run', str(readers), str(writers), str(duration)],
+                cwd=BASE_DIR, env=env, check=True, capture_output=True,
+                text=True,
+            ).stdout
+        result = json.loads(output.splitlines()[-1])
+        rows.append((
+            profile,
+            f"{result['read']['ops']:.0f}",
+            f"{result['read']['p99']:.1f}",
+            f"{result['write']['ops']:.0f}",
+            f"{result['write']['p99']:.1f}",
+            result['read']['locked'] + result['write']['locked'],
+        ))
+    print_table(
+        ('profile', 'reads/s', 'read_p99_ms', 'writes/s', 'write_p99_ms',
+         'locked'),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
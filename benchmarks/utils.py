@@ -0,0 +1,152 @@
+"""Общие помощники для скриптов замеров производительности."""
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = BASE_DIR / 'api_yamdb'
+
+
+def setup_django(settings_module='api_yamdb.settings'):
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(name=None):
+    """Создаёт чистую тестовую базу на время замера и удаляет её после.
+
+    `name` задаёт имя тестовой базы; для SQLite — путь к файлу, нужный,
+    когда к базе параллельно ходят несколько потоков сервера.
+    """
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    if name is not None:
+        connection.settings_dict['TEST']['NAME'] = str(name)
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def live_server(host='127.0.0.1'):
+    """Поднимает WSGI-сервер Django в потоке и отдаёт его адрес.
+
+    Как LiveServerTestCase: база SQLite в памяти передаётся серверу одним
+    общим соединением, иначе потоки не видят тестовых данных.
+    """
+    from django.db import connections
+    from django.test.testcases import LiveServerThread, _StaticFilesHandler
+
+    overrides = {
+        connection.alias: connection for connection in connections.all()
+        if connection.vendor == 'sqlite'
+        and connection.is_in_memory_db()
+    }
+    for connection in overrides.values():
+        connection.inc_thread_sharing()
+    server = LiveServerThread(host, _StaticFilesHandler, overrides)
+    server.daemon = True
+    server.start()
+    server.is_ready.wait()
+    if server.error:
+        raise server.error
+    try:
+        yield f'http://{host}:{server.port}'
+    finally:
+        server.terminate()
+        server.join()
+        for connection in overrides.values():
+            connection.dec_thread_sharing()
+
+
+class QueryCounter:
+    """Считает запросы к базе из всех потоков, в том числе из потоков
+    сервера, которые открывают свои соединения."""
+
+    def __init__(self, using='default'):
+        self.using = using
+        self.count = 0
+        self.lock = threading.Lock()
+        self.wrapped = []
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def wrap(self, connection, **kwargs):
+        if connection.alias == self.using and self not in (
+            connection.execute_wrappers
+        ):
+            connection.execute_wrappers.append(self)
+            self.wrapped.append(connection)
+
+    def __enter__(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        connection_created.connect(self.wrap)
+        for connection in connections.all():
+            self.wrap(connection)
+        return self
+
+    def __exit__(self, *exc_info):
+        from django.db.backends.signals import connection_created
+
+        connection_created.disconnect(self.wrap)
+        for connection in self.wrapped:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+        self.wrapped.clear()
+
+
+def measure(func, repeat=5):
+    """Возвращает время вызовов `func` в миллисекундах и число запросов."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(context.captured_queries)
+    return timings, queries
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(row[idx])) for row in [header, *rows])
+        for idx in range(len(header))
+    ]
+    for row in [header, *rows]:
+        print('  '.join(
+            str(cell).rjust(width) for cell, width in zip(row, widths)
+        ))
+
+
+def median(values):
+    return statistics.median(values)
@@ -0,0 +1,33 @@
+import pytest
+from django.conf import settings
+from django.urls import URLResolver, get_resolver
+from rest_framework.views import APIView
+
+from api.v1.authentication import RoleClaimsJWTAuthentication
+
+
+def view_classes(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from view_classes(pattern.url_patterns)
+        else:
+            view_class = getattr(pattern.callback, 'cls', None)
+            if view_class is not None:
+                yield view_class
+
+
+@pytest.fixture
+def claims_authentication(monkeypatch):
+    """Включает RoleClaimsJWTAuthentication, как TOKEN_VERSION_MEMCACHED.
+
+    Классы аутентификации DRF запоминает при импорте представлений,
+    поэтому настройку заменяют у самих представлений.
+    """
+    default = APIView.authentication_classes
+    for urlconf in (settings.ROOT_URLCONF, settings.ASGI_URLCONF):
+        for view_class in set(view_classes(get_resolver(urlconf).url_patterns)):
+            if view_class.authentication_classes == default:
+                monkeypatch.setattr(
+                    view_class, 'authentication_classes',
+                    [RoleClaimsJWTAuthentication],
+                )
@@ -0,0 +1,33 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
+from api.v1.throttling import buckets
+from users.bloom import taken_names
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # База между тестами очищается без сигналов, кеш ответов и версий
+    # токенов — вместе с ней.
+    aliases = (settings.RESPONSE_CACHE_ALIAS, settings.TOKEN_VERSION_CACHE_ALIAS)
+    for alias in aliases:
+        caches[alias].clear()
+    yield
+    for alias in aliases:
+        caches[alias].clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_taken_names():
+    # Фильтр Блума переживает очистку базы: перестраиваем его в каждом тесте.
+    taken_names.invalidate()
+    yield
+    taken_names.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def reset_throttle_buckets():
+    buckets.clear()
+    yield
+    buckets.clear()
@@ -0,0 +1,101 @@
+import uuid
+from contextlib import contextmanager
+from http import HTTPStatus
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
+from users.bloom import taken_names
+from users.models import User
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+DATA = {'email': 'new@yamdb.fake', 'username': 'new_user'}
+
+
+@pytest.fixture(autouse=True)
+def built_filter(db, monkeypatch):
+    # Фильтр строится при старте процесса, а не в замеряемом запросе.
+    monkeypatch.setattr(taken_names, 'REFRESH_INTERVAL', 3600)
+    taken_names.rebuild()
+
+
+@contextmanager
+def assert_statements(count):
+    """Как django_assert_num_queries, но без BEGIN: SQLite открывает
+    транзакцию отдельным запросом, PostgreSQL — нет."""
+    with CaptureQueriesContext(connection) as context:
+        yield
+    statements = [
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith('BEGIN')
+    ]
+    assert len(statements) == count, '\n'.join(statements)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test00SignupQueries:
+
+    def test_01_new_signup(self, client):
+        # Одна транзакция: вставка пользователя в точке сохранения и
+        # вставка письма.
+        with assert_statements(4):
+            response = client.post(SIGNUP_URL, data=DATA)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_repeat_signup(self, client):
+        client.post(SIGNUP_URL, data=DATA)
+        # Фильтр Блума знает имя: выборка существующего пользователя и
+        # замена письма одной вставкой с ON CONFLICT.
+        with assert_statements(2):
+            response = client.post(SIGNUP_URL, data=DATA)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный POST-запрос к `{SIGNUP_URL}` с '
+            'теми же данными возвращает ответ со статусом 200.'
+        )
+
+    @pytest.mark.parametrize('data,field', (
+        ({'email': 'new@yamdb.fake', 'username': 'other'}, 'email'),
+        ({'email': 'other@yamdb.fake', 'username': 'new_user'}, 'username'),
+    ))
+    def test_03_conflict(self, client, data, field):
+        client.post(SIGNUP_URL, data=DATA)
+        with assert_statements(1):
+            response = client.post(SIGNUP_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert field in response.json(), (
+            f'Проверьте, что при занятом поле `{field}` ошибка относится '
+            'к нему.'
+        )
+
+    def test_04_code_not_derived_from_email(self, client, admin_client):
+        admin_client.post('/api/v1/users/', data={
+            'username': 'guessed', 'email': 'guessed@yamdb.fake'
+        })
+        client.post(SIGNUP_URL, data=DATA)
+        for username, email in (
+            ('guessed', 'guessed@yamdb.fake'),
+            (DATA['username'], DATA['email']),
+        ):
+            response = client.post('/api/v1/auth/token/', data={
+                'username': username,
+                'confirmation_code': str(
+                    uuid.uuid3(uuid.NAMESPACE_X500, email)
+                ),
+            })
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что код подтверждения нельзя вычислить по '
+                'адресу почты.'
+            )
+
+    def test_05_user_rolled_back_without_email(self, client, monkeypatch):
+        def broken_enqueue(**kwargs):
+            raise DatabaseError('outbox unavailable')
+
+        monkeypatch.setattr('api.v1.views.enqueue', broken_enqueue)
+        with pytest.raises(DatabaseError):
+            client.post(SIGNUP_URL, data=DATA)
+        assert not User.objects.filter(username=DATA['username']).exists(), (
+            'Проверьте, что пользователь не создаётся, если письмо с кодом '
+            'не удалось поставить в очередь.'
+        )
@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+BULK_URL = '/api/v1/titles/bulk/'
+
+
+def create_dictionaries():
+    Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.create(name='Ужасы', slug='horror')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+def item(idx, **fields):
+    return {
+        'name': f'Произведение {idx}',
+        'year': 2000,
+        'category': 'films',
+        'genre': ['horror', 'comedy'],
+        **fields,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test04TitleBulk:
+
+    def test_01_bulk_requires_admin(self, client, user_client):
+        create_dictionaries()
+        responses = (
+            client.post(
+                BULK_URL, data=[item(0)], content_type='application/json'
+            ),
+            user_client.post(BULK_URL, data=[item(0)], format='json'),
+        )
+        for response in responses:
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что POST-запрос к `{BULK_URL}` доступен только '
+                'администратору.'
+            )
+        assert not Title.objects.exists()
+
+    def test_02_bulk_create(self, admin_client):
+        create_dictionaries()
+        response = admin_client.post(
+            BULK_URL,
+            data=[item(idx) for idx in range(5)],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{BULK_URL}` '
+            'возвращает ответ со статусом 201.'
+        )
+        created = response.json()['created']
+        titles = Title.objects.order_by('id')
+        assert [entry['id'] for entry in created] == [
+            title.id for title in titles
+        ], (
+            'Проверьте, что ответ содержит id созданных произведений в '
+            'порядке элементов запроса.'
+        )
+        assert [title.name for title in titles] == [
+            f'Произведение {idx}' for idx in range(5)
+        ]
+        for title in titles:
+            assert title.category.slug == 'films'
+            assert sorted(title.genre.values_list('slug', flat=True)) == [
+                'comedy', 'horror'
+            ], 'Проверьте, что пакетное создание сохраняет жанры.'
+
+    def test_03_bulk_partial_errors(self, admin_client):
+        create_dictionaries()
+        data = [
+            item(0),
+            item(1, category='unknown'),
+            item(2, genre=['horror', 'missing']),
+            item(3, year='дветыщи'),
+            'не объект',
+            item(5, genre=['horror', 'horror']),
+        ]
+        response = admin_client.post(
+            BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        result = response.json()
+        assert [entry['index'] for entry in result['created']] == [0, 5], (
+            'Проверьте, что корректные элементы пачки сохраняются, даже если '
+            'в других есть ошибки.'
+        )
+        errors = {entry['index']: entry['errors'] for entry in result['errors']}
+        assert set(errors) == {1, 2, 3, 4}, (
+            'Проверьте, что ошибки возвращаются с индексами элементов.'
+        )
+        assert 'category' in errors[1]
+        assert 'genre' in errors[2]
+        assert 'year' in errors[3]
+        assert Title.objects.get(name='Произведение 5').genre.count() == 1
+
+    def test_04_bulk_all_invalid(self, admin_client):
+        create_dictionaries()
+        for data in ([], {'name': 'Не список'}, [item(0, category='x')]):
+            response = admin_client.post(
+                BULK_URL, data=data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{BULK_URL}` без корректных '
+                'элементов возвращает ответ со статусом 400.'
+            )
+        assert not Title.objects.exists()
+
+    def test_05_bulk_queries(self, admin_client, django_assert_max_num_queries):
+        create_dictionaries()
+        data = [item(idx) for idx in range(50)]
+        # Пользователь токена, категории, жанры, SAVEPOINT, вставка
+        # произведений, их id, вставка связей, индекс поиска, RELEASE.
+        with django_assert_max_num_queries(9):
+            response = admin_client.post(
+                BULK_URL, data=data, format='json'
+            )
+        assert len(response.json()['created']) == 50
+        assert Title.objects.filter(name__startswith='Произведение').count() == 50
+
+    def test_06_bulk_indexes_search(self, admin_client, client):
+        create_dictionaries()
+        admin_client.post(
+            BULK_URL,
+            data=[item(0, name='Солярис')],
+            format='json',
+        )
+        response = client.get('/api/v1/titles/', {'search': 'солярис'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Солярис'
+        ], (
+            'Проверьте, что произведения из пакетного создания попадают в '
+            'поисковый индекс.'
+        )
@@ -0,0 +1,52 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+TITLES_URL = '/api/v1/titles/'
+
+
+def create_catalog(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+    return Title.objects.order_by('id').first()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test04TitleQueries:
+
+    @pytest.mark.parametrize('size', (1, 5, 20))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   size):
+        create_catalog(size)
+        # COUNT(*) пагинации, страница с категориями, жанры страницы.
+        with django_assert_num_queries(3):
+            response = client.get(TITLES_URL)
+        assert response.json()['results'][0]['genre'], (
+            f'Проверьте, что ответ на GET-запрос к `{TITLES_URL}` '
+            'содержит жанры произведений.'
+        )
+
+    def test_02_title_filtered_list_queries(self, client,
+                                            django_assert_num_queries):
+        create_catalog(10)
+        with django_assert_num_queries(3):
+            client.get(TITLES_URL, {'genre': 'horror', 'category': 'films'})
+
+    def test_03_title_detail_queries(self, client, django_assert_num_queries):
+        title = create_catalog(3)
+        with django_assert_num_queries(2):
+            response = client.get(f'{TITLES_URL}{title.id}/')
+        assert response.json()['category'] == {
+            'name': 'Фильм', 'slug': 'films'
+        }, (
+            f'Проверьте, что ответ на GET-запрос к `{TITLES_URL}{{title_id}}/`'
+            ' содержит категорию произведения.'
+        )
@@ -0,0 +1,89 @@
+import pytest
+from django.db import connection
+
+from reviews import search as search_module
+from reviews.models import Category, Title
+
+TITLES_URL = '/api/v1/titles/'
+
+
+def search(client, query):
+    response = client.get(TITLES_URL, {'search': query})
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test04TitleSearch:
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Ранжирование и поиск по префиксу — на SQLite FTS5.',
+    )
+    def test_01_search_ranks_and_prefixes(self, client):
+        Title.objects.create(
+            name='Крепкий орешек', year=1988,
+            description='Полицейский против террористов, как Терминатор.'
+        )
+        Title.objects.create(
+            name='Терминатор', year=1984, description='Терминатор вернётся.'
+        )
+        Title.objects.create(name='Титаник', year=1997)
+
+        assert search(client, 'термин') == ['Терминатор', 'Крепкий орешек'], (
+            f'Проверьте, что `?search=` в `{TITLES_URL}` ищет по началу слова '
+            'в названии и описании и ставит более релевантные выше.'
+        )
+        assert search(client, 'крепкий ОРЕШ') == ['Крепкий орешек'], (
+            f'Проверьте, что `?search=` в `{TITLES_URL}` не зависит от '
+            'регистра и требует совпадения всех слов запроса.'
+        )
+        assert search(client, 'матрица') == [], (
+            f'Проверьте, что `?search=` в `{TITLES_URL}` без совпадений '
+            'возвращает пустой список.'
+        )
+
+    def test_02_search_follows_changes(self, client):
+        title = Title.objects.create(name='Мост через реку Квай', year=1957)
+        title.name = 'Хороший, плохой, злой'
+        title.save()
+        assert search(client, 'квай') == [], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+        assert search(client, 'злой') == [title.name]
+
+        title.delete()
+        assert search(client, 'злой') == [], (
+            'Проверьте, что удалённое произведение пропадает из поиска.'
+        )
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Ранжирование и поиск по префиксу — на SQLite FTS5.',
+    )
+    def test_03_search_with_filters_sees_all_matches(self, client):
+        category = Category.objects.create(name='Аниме', slug='anime')
+        Title.objects.bulk_create(
+            Title(name=f'Альфа {idx}', year=2000) for idx in range(1100)
+        )
+        # Длинное описание опускает произведение в конец выдачи по bm25.
+        Title.objects.create(
+            name='Альфа последняя', year=2000, category=category,
+            description='Очень длинное описание без нужного слова. ' * 20,
+        )
+        search_module.rebuild_index(connection)
+
+        response = client.get(TITLES_URL, {'search': 'альфа'})
+        assert response.json()['count'] == 1101, (
+            f'Проверьте, что `?search=` в `{TITLES_URL}` считает все '
+            'совпадения, а не только первую тысячу.'
+        )
+        response = client.get(
+            TITLES_URL, {'search': 'альфа', 'category': 'anime'}
+        )
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Альфа последняя'], (
+            'Проверьте, что поиск сочетается с фильтрами по всем '
+            'совпадениям.'
+        )
@@ -0,0 +1,112 @@
+import json
+from base64 import b64encode
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import quote, urlencode
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test05ReviewCursorPagination:
+
+    def create_reviews(self, django_user_model, size):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(size):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'review {idx}', score=5
+            )
+        # Одинаковая дата: порядок страниц держится только на `id`.
+        Review.objects.update(
+            pub_date=datetime(2023, 4, 1, tzinfo=timezone.utc)
+        )
+        return title
+
+    def test_01_cursor_walks_all_reviews(self, client, django_user_model,
+                                         django_assert_num_queries):
+        title = self.create_reviews(django_user_model, 12)
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        seen = []
+        while url:
+            # Произведение и страница, без COUNT(*) на любой глубине.
+            with django_assert_num_queries(2):
+                response = client.get(url)
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме ответ не содержит `count`.'
+            )
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert seen == expected, (
+            'Проверьте, что курсорная пагинация отдаёт каждый отзыв ровно '
+            'один раз в порядке (`pub_date`, `id`) по убыванию.'
+        )
+
+    def test_02_page_number_is_default(self, client, django_user_model):
+        title = self.create_reviews(django_user_model, 3)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json().get('count') == 3, (
+            'Проверьте, что без параметра `cursor` используется пагинация '
+            'по номеру страницы.'
+        )
+
+    def test_03_ties_beyond_offset_cutoff(self, client, django_user_model):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(1100)
+        )
+        published = datetime(2023, 4, 1, tzinfo=timezone.utc)
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5,
+                   pub_date=published)
+            for author in django_user_model.objects.all()
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        seen, pages = [], []
+        while url:
+            data = client.get(url).json()
+            pages.append(data)
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert len(seen) == len(set(seen)) == 1100, (
+            'Проверьте, что курсор хранит весь ключ (`pub_date`, `id`) и '
+            'проходит любое число отзывов с одинаковой датой.'
+        )
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` возвращает на прошлую страницу.'
+        )
+
+    @pytest.mark.parametrize('position', (
+        ['abc', 'x'],
+        [1, 2],
+        [None, None],
+        ['2020-01-01T00:00:00Z', 'zz'],
+        ['2020-13-01T00:00:00Z', 1],
+        [['2020-01-01T00:00:00Z'], 1],
+        {'pub_date': '2020-01-01T00:00:00Z'},
+    ))
+    def test_04_tampered_cursor(self, client, django_user_model, position):
+        title = self.create_reviews(django_user_model, 1)
+        cursor = b64encode(
+            urlencode({'p': json.dumps(position)}).encode()
+        ).decode()
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor={quote(cursor)}'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор с подменёнными значениями отклоняется '
+            'ответом 404, а не ошибкой сервера.'
+        )
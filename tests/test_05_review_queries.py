@@ -0,0 +1,47 @@
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+def create_discussion(django_user_model, size):
+    title = Title.objects.create(name='Терминатор', year=1984)
+    for idx in range(size):
+        author = django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text=f'review {idx}', score=5
+        )
+        Comment.objects.create(
+            review=review, author=author, text=f'comment {idx}'
+        )
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test05ReviewQueries:
+
+    @pytest.mark.parametrize('size', (1, 5))
+    def test_01_review_list_queries(self, client, django_user_model,
+                                    django_assert_num_queries, size):
+        title, _ = create_discussion(django_user_model, size)
+        # Произведение, COUNT(*) пагинации, страница с авторами.
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['results'][0]['author'], (
+            'Проверьте, что ответ на GET-запрос к '
+            '`/api/v1/titles/{title_id}/reviews/` содержит автора отзыва.'
+        )
+
+    @pytest.mark.parametrize('size', (1, 5))
+    def test_02_comment_list_queries(self, client, django_user_model,
+                                     django_assert_num_queries, size):
+        title, review = create_discussion(django_user_model, size)
+        Comment.objects.bulk_create(
+            Comment(review=review, author=review.author, text='ещё')
+            for _ in range(size)
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        # Отзыв, COUNT(*) пагинации, страница с авторами и отзывом.
+        with django_assert_num_queries(3):
+            client.get(url)
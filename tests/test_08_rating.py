@@ -0,0 +1,96 @@
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregate:
+
+    def get_title(self, title_id):
+        return Title.objects.get(pk=title_id)
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user,
+                                       user_client, moderator,
+                                       moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.review_count) == (15, 3), (
+            'Проверьте, что при создании отзыва сумма оценок и число '
+            'отзывов произведения обновляются.'
+        )
+
+        user_review = next(r for r in reviews if r['author'] == user.username)
+        user_client.patch(f'{url}{user_review["id"]}/', data={'score': 8})
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.review_count) == (18, 3), (
+            'Проверьте, что при изменении оценки отзыва сумма оценок '
+            'произведения пересчитывается.'
+        )
+
+        user_client.delete(f'{url}{user_review["id"]}/')
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.review_count) == (10, 2), (
+            'Проверьте, что при удалении отзыва его оценка убирается из '
+            'рейтинга произведения.'
+        )
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.json().get('rating') == 5, (
+            'Проверьте, что поле `rating` произведения равно средней оценке '
+            'оставшихся отзывов.'
+        )
+
+    def test_02_rating_on_author_cascade(self, admin_client, admin, user,
+                                         user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+
+        user.delete()
+        title = self.get_title(title_id)
+        assert (title.score_sum, title.review_count) == (5, 1), (
+            'Проверьте, что при удалении автора его отзывы убираются из '
+            'рейтинга произведения.'
+        )
+
+    def test_03_save_without_snapshot(self, user, admin):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=6
+        )
+        partial = Review.objects.only('id', 'text').get(pk=review.pk)
+        partial.text = 'Исправленный отзыв'
+        partial.save()
+        rebuilt = Review(
+            pk=review.pk, title=title, author=user, text='Заново', score=9,
+            pub_date=review.pub_date,
+        )
+        rebuilt.save()
+        title = self.get_title(title.pk)
+        assert (title.score_sum, title.review_count) == (9, 1), (
+            'Проверьте, что сохранение уже существующего отзыва без снимка '
+            'оценки (`.only()`, явный pk) не считает его новым.'
+        )
+
+    def test_04_stale_title_save_keeps_counters(self, user):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        stale = Title.objects.get(pk=title.pk)
+        Review.objects.create(title=title, author=user, text='Отзыв', score=7)
+        stale.name = 'Терминатор 2'
+        stale.save()
+        title = self.get_title(title.pk)
+        assert title.name == 'Терминатор 2'
+        assert (title.score_sum, title.review_count) == (7, 1), (
+            'Проверьте, что сохранение устаревшего произведения не '
+            'затирает сумму оценок и число отзывов.'
+        )
+        stale.save(update_fields=['year', 'review_count'])
+        assert self.get_title(title.pk).review_count == 1
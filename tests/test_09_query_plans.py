@@ -0,0 +1,12 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Планы запросов SQLite.'
+)
+@pytest.mark.django_db(transaction=True)
+def test_endpoints_use_indexes():
+    # Команда завершается CommandError, если эндпоинт читает таблицу целиком.
+    call_command('explain_endpoints')
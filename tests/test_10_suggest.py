@@ -0,0 +1,133 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from reviews.models import Category, Genre, Title
+from reviews.suggest import SuggestIndex, suggest_index
+
+SUGGEST_URL = '/api/v1/suggest/'
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    suggest_index.invalidate()
+    yield
+    suggest_index.invalidate()
+
+
+def suggest(client, query, **params):
+    response = client.get(SUGGEST_URL, {'q': query, **params})
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{SUGGEST_URL}` возвращает ответ со '
+        'статусом 200.'
+    )
+    return response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Suggest:
+
+    def test_01_suggest_across_models(self, client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        Genre.objects.create(name='Триллер', slug='thriller')
+        Category.objects.create(name='Театр', slug='theatre')
+
+        assert suggest(client, 'терм') == [
+            {'type': 'title', 'id': title.id, 'name': 'Терминатор'}
+        ], (
+            f'Проверьте, что `{SUGGEST_URL}` подсказывает произведения по '
+            'началу названия.'
+        )
+        assert suggest(client, 'трилер') == [
+            {'type': 'genre', 'slug': 'thriller', 'name': 'Триллер'}
+        ], (
+            f'Проверьте, что `{SUGGEST_URL}` находит жанры с опечаткой.'
+        )
+        assert suggest(client, 'тетр')[0] == {
+            'type': 'category', 'slug': 'theatre', 'name': 'Театр'
+        }, (
+            f'Проверьте, что `{SUGGEST_URL}` ставит ближайшее совпадение '
+            'первым.'
+        )
+
+    def test_02_suggest_typos_and_words(self, client):
+        Title.objects.create(name='Крепкий орешек', year=1988)
+        Title.objects.create(name='Терминатор', year=1984)
+
+        names = [item['name'] for item in suggest(client, 'термниатор')]
+        assert names == ['Терминатор'], (
+            f'Проверьте, что `{SUGGEST_URL}` терпит две опечатки в длинном '
+            'запросе.'
+        )
+        names = [item['name'] for item in suggest(client, 'ореш')]
+        assert names == ['Крепкий орешек'], (
+            f'Проверьте, что `{SUGGEST_URL}` ищет по началу любого слова.'
+        )
+
+    def test_03_suggest_follows_changes(self, client):
+        suggest(client, 'мост')
+        title = Title.objects.create(name='Мост через реку Квай', year=1957)
+        assert len(suggest(client, 'мост')) == 1, (
+            'Проверьте, что новое произведение сразу попадает в подсказки.'
+        )
+        title.delete()
+        assert suggest(client, 'мост') == [], (
+            'Проверьте, что удалённое произведение пропадает из подсказок.'
+        )
+
+    def test_03_01_rolled_back_changes_ignored(self, client):
+        title = Title.objects.create(name='Мост через реку Квай', year=1957)
+        suggest(client, 'мост')
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Title.objects.create(name='Мостовая', year=2000)
+                title.delete()
+                raise RuntimeError
+        assert [item['name'] for item in suggest(client, 'мост')] == [
+            'Мост через реку Квай'
+        ], (
+            'Проверьте, что подсказки меняются только после коммита: '
+            'откаченные создание и удаление не попадают в индекс.'
+        )
+
+    def test_04_suggest_validation(self, client):
+        response = client.get(SUGGEST_URL, {'q': 'мост', 'limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{SUGGEST_URL}` проверяет параметр `limit`.'
+        )
+
+
+class Test10SuggestIndex:
+
+    def test_01_stale_index_rebuilt_in_background(self):
+        names = ['Старое']
+        release = threading.Event()
+
+        def loader():
+            if names[0] != 'Старое':
+                assert release.wait(5)
+            yield ('title', 1), {'name': names[0]}
+
+        index = SuggestIndex(loader, max_age=-1)
+        assert index.query('стар') == [{'name': 'Старое'}]
+        names[0] = 'Новое'
+        assert index.query('стар') == [{'name': 'Старое'}], (
+            'Проверьте, что пока индекс перестраивается, запросы '
+            'обслуживает прежний индекс.'
+        )
+        refresher = index.refresher
+        assert refresher is not None and refresher.is_alive()
+        index.query('стар')
+        assert index.refresher is refresher, (
+            'Проверьте, что одновременно идёт не больше одной перестройки.'
+        )
+        index.add(('title', 2), {'name': 'Добавленное'})
+        release.set()
+        refresher.join(5)
+        index.max_age = 60
+        assert index.query('нов', limit=1) == [{'name': 'Новое'}]
+        assert index.query('добав') == [{'name': 'Добавленное'}], (
+            'Проверьте, что изменения во время перестройки не теряются.'
+        )
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    @pytest.mark.parametrize(
+        'url,create',
+        (
+            ('/api/v1/categories/', create_categories),
+            ('/api/v1/genres/', create_genre),
+        )
+    )
+    def test_01_list_cached_until_change(self, client, admin_client,
+                                          django_assert_num_queries,
+                                          url, create):
+        objects = create(admin_client)
+        count = client.get(url).json()['count']
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.json()['count'] == count, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из кеша '
+            'без запросов к базе.'
+        )
+        with django_assert_num_queries(2):
+            client.get(url, {'search': objects[0]['name']})
+
+        response = admin_client.post(
+            url, data={'name': 'Новое', 'slug': 'new-slug'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(url).json()['count'] == count + 1, (
+            f'Проверьте, что после POST-запроса к `{url}` кеш списка '
+            'сбрасывается.'
+        )
+
+        admin_client.delete(f'{url}new-slug/')
+        assert client.get(url).json()['count'] == count, (
+            f'Проверьте, что после DELETE-запроса к `{url}` кеш списка '
+            'сбрасывается.'
+        )
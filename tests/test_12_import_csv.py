@@ -0,0 +1,143 @@
+import json
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.csv_import import (SOURCES, find_chunks, parse_chunk,
+                                 table_columns)
+from reviews.models import Comment, Genre, Review, Title
+
+REVIEWS_CSV = settings.BASE_DIR / 'static' / 'data' / 'review.csv'
+REVIEWS_SOURCE = [source.model for source in SOURCES].index(Review)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ImportCsv:
+
+    def test_01_import_static_data(self):
+        call_command('import_csv', batch_size=10, stdout=StringIO())
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        title = Title.objects.get(pk=1)
+        assert title.review_count == 2 and title.rating == 10, (
+            'Проверьте, что после импорта рейтинги произведений '
+            'пересчитываются.'
+        )
+        assert str(Review.objects.get(pk=1).pub_date.date()) == '2019-09-24', (
+            'Проверьте, что импорт сохраняет `pub_date` из CSV.'
+        )
+
+        out = StringIO()
+        call_command('import_csv', stdout=out)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что повторный импорт пропускает уже загруженные '
+            'строки.'
+        )
+        assert 'уже было 72' in out.getvalue()
+
+    def test_02_import_rejects_bad_rows(self, tmp_path):
+        (tmp_path / 'genre.csv').write_text(
+            'id,name,slug\n1,Драма,drama\nx,Ошибка,bad\n', encoding='utf-8'
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Терминатор,1984,\n', encoding='utf-8'
+        )
+        (tmp_path / 'genre_title.csv').write_text(
+            'id,title_id,genre_id\n1,1,1\n2,1,7\n', encoding='utf-8'
+        )
+        out = StringIO()
+        call_command('import_csv', path=tmp_path, stdout=out)
+
+        assert list(Genre.objects.values_list('slug', flat=True)) == [
+            'drama'
+        ]
+        assert Title.objects.get(pk=1).genre.count() == 1, (
+            'Проверьте, что строки со ссылкой на несуществующий объект '
+            'отклоняются, а остальные загружаются.'
+        )
+        assert 'genre_title.csv: 1 строк, уже было 0, отклонено 1' in (
+            out.getvalue()
+        )
+
+    def test_03_parallel_import_resumes(self, tmp_path):
+        checkpoint = tmp_path / 'checkpoint.json'
+        rejects = tmp_path / 'rejects.csv'
+        call_command(
+            'import_csv', workers=2, chunk_size=512, checkpoint=checkpoint,
+            rejects=rejects, stdout=StringIO()
+        )
+        assert Review.objects.count() == 72, (
+            'Проверьте, что параллельный импорт загружает все отзывы.'
+        )
+        assert rejects.read_text(encoding='utf-8').count('\n') == 1
+
+        # Имитируем обрыв после первого диапазона отзывов.
+        start, end = find_chunks(REVIEWS_CSV, 512)[0]
+        rows, _ = parse_chunk(REVIEWS_SOURCE, REVIEWS_CSV, start, end)
+        state = json.loads(checkpoint.read_text(encoding='utf-8'))
+        state['review.csv']['offset'] = end
+        state['comments.csv']['offset'] = 0
+        checkpoint.write_text(json.dumps(state), encoding='utf-8')
+        pk = table_columns(Review).index('id')
+        Review.objects.exclude(id__in=[row[pk] for row in rows]).delete()
+        kept = Review.objects.count()
+
+        out = StringIO()
+        call_command(
+            'import_csv', workers=2, chunk_size=512, checkpoint=checkpoint,
+            stdout=out
+        )
+        assert Review.objects.count() == 72
+        assert f'review.csv: {72 - kept} строк, уже было 0' in (
+            out.getvalue()
+        ), (
+            'Проверьте, что импорт продолжается с отметки и не разбирает '
+            'заново уже записанные диапазоны.'
+        )
+
+    def test_04_unique_violations_are_rejected(self, tmp_path):
+        (tmp_path / 'users.csv').write_text(
+            'id,username,email,role,bio,first_name,last_name\n'
+            '1,bingobongo,bingo@yamdb.fake,user,,,\n'
+            '2,bingobongo,other@yamdb.fake,user,,,\n'
+            '3,capt_obvious,capt@yamdb.fake,user,,,\n',
+            encoding='utf-8',
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Терминатор,1984,\n', encoding='utf-8'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,Отлично,1,10,2019-09-24T21:08:21.567Z\n'
+            '2,1,Повтор,1,1,2019-09-24T21:08:21.567Z\n'
+            '3,1,Хорошо,3,8,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8',
+        )
+        (tmp_path / 'comments.csv').write_text(
+            'id,review_id,text,author,pub_date\n'
+            '1,2,К повтору,3,2019-09-24T21:08:21.567Z\n'
+            '2,3,Согласен,1,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8',
+        )
+        rejects = tmp_path / 'rejects.csv'
+        out = StringIO()
+        call_command(
+            'import_csv', path=tmp_path, rejects=rejects, stdout=out
+        )
+        assert sorted(Review.objects.values_list('id', flat=True)) == [1, 3], (
+            'Проверьте, что строка, нарушившая уникальность, отклоняется, '
+            'а остальные строки пачки загружаются.'
+        )
+        assert list(Comment.objects.values_list('id', flat=True)) == [2]
+        assert 'review.csv: 2 строк, уже было 0, отклонено 1' in (
+            out.getvalue()
+        )
+        assert Title.objects.get(pk=1).review_count == 2, (
+            'Проверьте, что после отклонённых строк импорт доходит до '
+            'пересчёта рейтингов.'
+        )
+        assert rejects.read_text(encoding='utf-8').count('\n') == 4
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review
+from tests.utils import create_reviews
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Export:
+
+    def test_01_export_permissions(self, client, user_client):
+        url = '/api/v1/export/reviews/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{url}` недоступен анонимному пользователю.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        assert user_client.get(
+            '/api/v1/export/users/'
+        ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_export_titles_ndjson(self, admin_client, admin, user,
+                                     user_client):
+        create_reviews(admin_client, {admin: admin_client, user: user_client})
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        titles = [
+            json.loads(line) for line in read_stream(response).splitlines()
+        ]
+        assert [title['name'] for title in titles] == [
+            'Терминатор', 'Крепкий орешек'
+        ]
+        assert titles[0]['genre'] == ['comedy', 'horror'], (
+            'Проверьте, что выгрузка произведений содержит slug жанров.'
+        )
+        assert titles[0]['category'] == 'films'
+        assert titles[0]['rating'] == 5 and titles[1]['rating'] is None
+
+        response = admin_client.get('/api/v1/export/titles/?since=2020-01-01')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что у произведений нет фильтра `since`.'
+        )
+
+    def test_03_export_reviews_csv_since(self, admin_client, admin, user,
+                                         user_client):
+        reviews, _ = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Review.objects.filter(id=reviews[0]['id']).update(
+            pub_date=datetime(2020, 1, 1, tzinfo=timezone.utc)
+        )
+        response = admin_client.get(
+            '/api/v1/export/reviews/', {'format': 'csv'}
+        )
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert [row['author'] for row in rows] == [
+            admin.username, user.username
+        ], (
+            'Проверьте, что выгрузка отзывов упорядочена по `pub_date`.'
+        )
+
+        response = admin_client.get(
+            '/api/v1/export/reviews/',
+            {'format': 'csv', 'since': '2021-01-01T00:00:00Z'}
+        )
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert [row['author'] for row in rows] == [user.username], (
+            'Проверьте, что `since` отбирает записи не раньше указанной '
+            'даты.'
+        )
+
+    def test_04_hidden_not_exported(self, admin_client, admin, user,
+                                    user_client):
+        reviews, _ = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        hidden, visible = (
+            Review.objects.get(id=review['id']) for review in reviews[:2]
+        )
+        Review.objects.filter(pk=hidden.pk).update(is_hidden=True)
+        Comment.objects.create(review=hidden, author=user, text='Под скрытым')
+        Comment.objects.create(review=visible, author=user, text='Скрытый',
+                               is_hidden=True)
+        Comment.objects.create(review=visible, author=user, text='Видимый')
+
+        response = admin_client.get('/api/v1/export/reviews/')
+        ids = [json.loads(line)['id'] for line in read_stream(
+            response
+        ).splitlines()]
+        assert hidden.pk not in ids and visible.pk in ids, (
+            'Проверьте, что скрытые отзывы не выгружаются.'
+        )
+        response = admin_client.get('/api/v1/export/comments/')
+        texts = [json.loads(line)['text'] for line in read_stream(
+            response
+        ).splitlines()]
+        assert texts == ['Видимый'], (
+            'Проверьте, что скрытые комментарии и комментарии к скрытым '
+            'отзывам не выгружаются.'
+        )
@@ -0,0 +1,173 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+MODERATION_URL = '/api/v1/moderation/'
+
+
+@pytest.fixture
+def spam(django_user_model, user, admin):
+    """Два произведения: в каждом отзыв спамера с комментариями и
+    обычный отзыв пользователя."""
+    spammer = django_user_model.objects.create_user(
+        username='spammer', email='spammer@yamdb.fake'
+    )
+    titles = [
+        Title.objects.create(name=f'Произведение {idx}', year=2000)
+        for idx in range(2)
+    ]
+    for title in titles:
+        spam_review = Review.objects.create(
+            title=title, author=spammer, text='Спам', score=1
+        )
+        Review.objects.create(
+            title=title, author=user, text='Отзыв', score=9
+        )
+        Comment.objects.create(review=spam_review, author=spammer, text='1')
+        Comment.objects.create(review=spam_review, author=admin, text='2')
+    return spammer, titles
+
+
+def scores(title):
+    title.refresh_from_db()
+    return title.score_sum, title.review_count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Moderation:
+
+    def test_01_moderation_permissions(self, client, user_client, spam):
+        data = {'target': 'reviews', 'action': 'delete', 'author': 'spammer'}
+        assert client.post(MODERATION_URL, data=data).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.post(MODERATION_URL, data=data).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            f'Проверьте, что `{MODERATION_URL}` недоступен обычному '
+            'пользователю.'
+        )
+        assert Review.objects.count() == 4
+
+    def test_02_moderation_validation(self, moderator_client, spam):
+        for data in (
+            {'target': 'reviews', 'action': 'delete'},
+            {'target': 'reviews', 'action': 'delete', 'author': 'spammer',
+             'ids': [1]},
+            {'target': 'users', 'action': 'delete', 'author': 'spammer'},
+            {'target': 'reviews', 'action': 'ban', 'author': 'spammer'},
+            {'target': 'reviews', 'action': 'delete', 'author': 'nobody'},
+        ):
+            response = moderator_client.post(
+                MODERATION_URL, data=data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{MODERATION_URL}` отвечает 400 на {data}.'
+            )
+
+    def test_03_delete_reviews_by_author(self, moderator_client, spam,
+                                         django_assert_max_num_queries):
+        _, titles = spam
+        # Пользователь токена, автор, id произведений, DELETE комментариев,
+        # DELETE отзывов, пересчёт рейтингов, SAVEPOINT и RELEASE.
+        with django_assert_max_num_queries(8):
+            response = moderator_client.post(
+                MODERATION_URL,
+                data={'target': 'reviews', 'action': 'delete',
+                      'author': 'spammer'},
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 2, 'comments': 4}
+        assert Review.objects.count() == 2
+        assert not Comment.objects.exists(), (
+            'Проверьте, что вместе с отзывами удаляются их комментарии.'
+        )
+        for title in titles:
+            assert scores(title) == (9, 1), (
+                'Проверьте, что после массового удаления рейтинг '
+                'произведений пересчитывается.'
+            )
+
+    def test_04_hide_and_show_reviews(self, moderator_client, client, spam):
+        spammer, titles = spam
+        ids = list(
+            Review.objects.filter(author=spammer).values_list('id', flat=True)
+        )
+        data = {'target': 'reviews', 'action': 'hide', 'ids': ids}
+        response = moderator_client.post(
+            MODERATION_URL, data=data, format='json'
+        )
+        assert response.json() == {'reviews': 2, 'comments': 0}
+        assert scores(titles[0]) == (9, 1), (
+            'Проверьте, что скрытые отзывы не учитываются в рейтинге.'
+        )
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        assert [r['author'] for r in client.get(url).json()['results']] == [
+            'TestUser'
+        ], 'Проверьте, что скрытые отзывы не попадают в список отзывов.'
+        assert client.get(f'{url}{ids[0]}/comments/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        response = moderator_client.post(
+            MODERATION_URL, data=data, format='json'
+        )
+        assert response.json() == {'reviews': 0, 'comments': 0}, (
+            'Проверьте, что повторное скрытие не затрагивает строки.'
+        )
+
+        data['action'] = 'show'
+        moderator_client.post(MODERATION_URL, data=data, format='json')
+        assert scores(titles[0]) == (10, 2), (
+            'Проверьте, что возвращённые отзывы снова учитываются в рейтинге.'
+        )
+
+    def test_05_hidden_review_save_keeps_rating(self, spam):
+        spammer, titles = spam
+        review = Review.objects.get(author=spammer, title=titles[0])
+        Review.objects.filter(pk=review.pk).update(is_hidden=True)
+        Title.recount_scores()
+        review = Review.objects.get(pk=review.pk)
+        review.score = 5
+        review.save()
+        assert scores(titles[0]) == (9, 1)
+        review.delete()
+        assert scores(titles[0]) == (9, 1), (
+            'Проверьте, что удаление скрытого отзыва не меняет рейтинг.'
+        )
+
+    def test_06_comments(self, moderator_client, client, spam):
+        spammer, titles = spam
+        data = {'target': 'comments', 'action': 'hide', 'author': 'spammer'}
+        response = moderator_client.post(MODERATION_URL, data=data)
+        assert response.json() == {'reviews': 0, 'comments': 2}
+        review = Review.objects.get(author=spammer, title=titles[0])
+        url = f'/api/v1/titles/{titles[0].id}/reviews/{review.id}/comments/'
+        assert [c['text'] for c in client.get(url).json()['results']] == [
+            '2'
+        ], 'Проверьте, что скрытые комментарии не попадают в список.'
+
+        data['action'] = 'delete'
+        response = moderator_client.post(MODERATION_URL, data=data)
+        assert response.json() == {'reviews': 0, 'comments': 2}
+        assert Comment.objects.count() == 2
+        assert scores(titles[0]) == (10, 2)
+
+    def test_07_is_hidden_not_in_responses(self, client, spam):
+        spammer, titles = spam
+        review = client.get(
+            f'/api/v1/titles/{titles[0].id}/reviews/'
+        ).json()['results'][0]
+        assert set(review) == {
+            'id', 'text', 'author', 'score', 'pub_date', 'title'
+        }, (
+            'Проверьте, что флаг модерации `is_hidden` не попадает в ответы '
+            'API отзывов.'
+        )
+        spam_review = Review.objects.get(title=titles[0], author=spammer)
+        comment = client.get(
+            f'/api/v1/titles/{titles[0].id}/reviews/{spam_review.id}'
+            '/comments/'
+        ).json()['results'][0]
+        assert set(comment) == {'id', 'text', 'author', 'pub_date', 'review'}
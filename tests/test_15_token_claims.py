@@ -0,0 +1,177 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.checks import check_token_version_cache
+from reviews.models import Title
+from users.models import ClaimsUser
+
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+class SharedCache(LocMemCache):
+    """Подменяет в проверке настроек общий кеш вроде Memcached."""
+
+LOGOUT_URL = '/api/v1/auth/logout/'
+
+
+def issue_token(client, user):
+    response = client.post(TOKEN_URL, data={
+        'username': user.username,
+        'confirmation_code': str(user.confirmation_code),
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['token']
+
+
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'users_user' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('claims_authentication')
+class Test15TokenClaims:
+
+    def test_01_token_contains_claims(self, client, admin):
+        token = AccessToken(issue_token(client, admin))
+        assert (token['username'], token['role'], token['is_staff'],
+                token['is_superuser'], token['ver']) == (
+            'TestAdmin', 'admin', False, False, 0
+        ), (
+            f'Проверьте, что токен от `{TOKEN_URL}` содержит имя, роль, '
+            'флаги и версию токенов пользователя.'
+        )
+
+    def test_02_no_user_query(self, client, admin):
+        admin_client = token_client(issue_token(client, admin))
+        admin_client.get('/api/v1/users/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(context), (
+            'Проверьте, что аутентификация по токену с ролью не загружает '
+            'пользователя из базы.'
+        )
+
+    def test_03_claims_user_as_author(self, client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        user_client = token_client(issue_token(client, user))
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_id = response.json()['id']
+        response = user_client.patch(f'{url}{review_id}/', data={'score': 8})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном без запроса к базе может '
+            'редактировать свой отзыв.'
+        )
+        with pytest.raises(TypeError):
+            ClaimsUser(pk=user.pk, username=user.username).save()
+
+    def test_04_role_change_revokes_token(self, client, admin_client, user):
+        old_token = issue_token(client, user)
+        user_client = token_client(old_token)
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что после смены роли ранее выданный токен '
+            'отклоняется.'
+        )
+        user.refresh_from_db()
+        new_token = AccessToken(issue_token(client, user))
+        assert (new_token['role'], new_token['ver']) == ('moderator', 1)
+        assert token_client(str(new_token)).get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.OK
+
+    def test_05_profile_update_keeps_token(self, client, user):
+        user_client = token_client(issue_token(client, user))
+        user_client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        ), (
+            'Проверьте, что изменение полей, которых нет в токене, не '
+            'отзывает его.'
+        )
+
+    def test_06_logout(self, client, user):
+        user_client = token_client(issue_token(client, user))
+        assert client.post(LOGOUT_URL).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(LOGOUT_URL).status_code == (
+            HTTPStatus.NO_CONTENT
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), f'Проверьте, что после `{LOGOUT_URL}` токен отклоняется.'
+
+    def test_07_deactivated_user(self, client, user):
+        user_client = token_client(issue_token(client, user))
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_08_role_change_without_snapshot(self, client, user):
+        user_client = token_client(issue_token(client, user))
+        partial = type(user).objects.only('id').get(pk=user.pk)
+        partial.role = 'admin'
+        partial.save()
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что смена роли у пользователя, загруженного без '
+            'полей токена, тоже отзывает выданные токены.'
+        )
+
+    def test_09_shared_version_cache_required(self, settings):
+        assert check_token_version_cache(None) == [], (
+            'Проверьте, что со стандартной JWTAuthentication общий кеш '
+            'версий не нужен.'
+        )
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_AUTHENTICATION_CLASSES': [
+                'api.v1.authentication.RoleClaimsJWTAuthentication',
+            ],
+        }
+        settings.TOKEN_VERSION_CACHE_ALIAS = 'token_versions'
+        for backend, errors in (
+            ('django.core.cache.backends.locmem.LocMemCache', ['api.E001']),
+            ('django.core.cache.backends.filebased.FileBasedCache',
+             ['api.E001']),
+            (f'{__name__}.SharedCache', []),
+        ):
+            settings.CACHES = {**settings.CACHES, 'token_versions': {
+                'BACKEND': backend,
+                'LOCATION': 'token-versions',
+            }}
+            assert [
+                error.id for error in check_token_version_cache(None)
+            ] == errors, (
+                'Проверьте, что RoleClaimsJWTAuthentication запускается '
+                'только с кешем версий, общим для всех процессов.'
+            )
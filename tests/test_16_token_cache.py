@@ -0,0 +1,103 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.authentication import TokenCache, issue_access_token, token_cache
+
+STATS_URL = '/api/v1/auth/token-cache/'
+
+
+@pytest.fixture(autouse=True)
+def clean_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {issue_access_token(user)}'
+    )
+    return client
+
+
+def raw(user_id, lifetime=60):
+    token = AccessToken()
+    token['user_id'] = user_id
+    token['exp'] = int(time.time()) + lifetime
+    return str(token).encode(), token
+
+
+class Test16TokenCacheUnit:
+
+    def test_01_lru_eviction(self):
+        cache = TokenCache(maxsize=2)
+        tokens = [raw(idx) for idx in range(3)]
+        cache.put(*tokens[0])
+        cache.put(*tokens[1])
+        assert cache.get(tokens[0][0]) is tokens[0][1]
+        cache.put(*tokens[2])
+        assert cache.get(tokens[1][0]) is None, (
+            'Проверьте, что при переполнении вытесняется давно не '
+            'использованный токен.'
+        )
+        assert cache.get(tokens[0][0]) is tokens[0][1]
+        assert cache.stats()['size'] == 2
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_02_expired_token(self):
+        cache = TokenCache(maxsize=10)
+        expired = raw(1, lifetime=-1)
+        cache.put(*expired)
+        assert cache.get(expired[0]) is None
+        assert cache.stats()['size'] == 0, (
+            'Проверьте, что истёкшие токены не отдаются из кеша.'
+        )
+
+    def test_03_evict_user(self):
+        cache = TokenCache(maxsize=10)
+        first, second, other = raw(1), raw(1, lifetime=120), raw(2)
+        for entry in (first, second, other):
+            cache.put(*entry)
+        cache.evict_user(1)
+        assert cache.get(first[0]) is None
+        assert cache.get(second[0]) is None
+        assert cache.get(other[0]) is other[1]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('claims_authentication')
+class Test16TokenCache:
+
+    def test_01_repeated_requests_hit(self, admin):
+        client = token_client(admin)
+        for _ in range(3):
+            assert client.get(STATS_URL).status_code == HTTPStatus.OK
+        stats = client.get(STATS_URL).json()
+        assert (stats['hits'], stats['misses'], stats['size']) == (3, 1, 1), (
+            'Проверьте, что повторные запросы с тем же токеном берут его '
+            'из кеша.'
+        )
+
+    def test_02_role_change_evicts(self, admin, user):
+        user_client = token_client(user)
+        user_client.get('/api/v1/users/me/')
+        assert token_cache.stats()['size'] == 1
+        user.role = 'moderator'
+        user.save()
+        assert token_cache.stats()['size'] == 0, (
+            'Проверьте, что при смене роли токены пользователя убираются '
+            'из кеша.'
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_03_stats_admin_only(self, user):
+        assert token_client(user).get(STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class CountingBackend(EmailBackend):
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingBackend.instances += 1
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+def run_outbox(**options):
+    call_command('run_outbox', once=True, stdout=StringIO(), **options)
+
+
+def sign_up(client, idx):
+    return client.post(SIGNUP_URL, data={
+        'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Outbox:
+
+    def test_01_signup_enqueues(self, client):
+        sign_up(client, 0)
+        assert not mail.outbox, (
+            f'Проверьте, что `{SIGNUP_URL}` не отправляет письмо во время '
+            'запроса.'
+        )
+        assert OutboxEmail.objects.filter(email='user0@yamdb.fake').exists()
+        sign_up(client, 0)
+        assert OutboxEmail.objects.count() == 1, (
+            'Проверьте, что повторная регистрация не ставит второе письмо '
+            'на тот же адрес.'
+        )
+
+    def test_02_run_outbox_reuses_connection(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_17_outbox.CountingBackend'
+        CountingBackend.instances = 0
+        for idx in range(5):
+            sign_up(client, idx)
+        run_outbox(batch_size=2)
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(5)
+        ]
+        assert CountingBackend.instances == 1, (
+            'Проверьте, что `run_outbox` отправляет все пачки через одно '
+            'соединение.'
+        )
+        assert not OutboxEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings):
+        settings.EMAIL_BACKEND = 'tests.test_17_outbox.FailingBackend'
+        sign_up(client, 0)
+        run_outbox()
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1
+        assert 'SMTP' in email.last_error
+        assert email.next_attempt_at > timezone.now() + timedelta(seconds=30), (
+            'Проверьте, что неудачная отправка откладывается.'
+        )
+        run_outbox()
+        assert OutboxEmail.objects.get().attempts == 1, (
+            'Проверьте, что письмо не повторяется до истечения задержки.'
+        )
+
+        OutboxEmail.objects.update(
+            next_attempt_at=timezone.now(),
+            attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        )
+        run_outbox()
+        assert OutboxEmail.objects.get().attempts == (
+            settings.OUTBOX_MAX_ATTEMPTS
+        ), 'Проверьте, что после последней попытки письмо не отправляется.'
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        sign_up(client, 0)
+        run_outbox()
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что повторная регистрация заново ставит письмо, '
+            'исчерпавшее попытки.'
+        )
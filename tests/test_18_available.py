@@ -0,0 +1,172 @@
+from http import HTTPStatus
+
+import pytest
+
+from users.bloom import BloomFilter, taken_names
+
+AVAILABLE_URL = '/api/v1/auth/available/'
+STATS_URL = '/api/v1/auth/available/stats/'
+
+
+@pytest.fixture
+def built_filter(monkeypatch):
+    monkeypatch.setattr(taken_names, 'REFRESH_INTERVAL', 3600)
+    taken_names.rebuild()
+
+
+class Test18BloomFilter:
+
+    def test_01_no_false_negatives(self):
+        bloom = BloomFilter(10_000, 0.01)
+        for idx in range(10_000):
+            bloom.add(f'user{idx}')
+        assert all(f'user{idx}' in bloom for idx in range(10_000)), (
+            'Проверьте, что фильтр Блума не теряет добавленные значения.'
+        )
+        false_positives = sum(
+            f'other{idx}' in bloom for idx in range(10_000)
+        )
+        assert false_positives < 200, (
+            'Проверьте, что доля ложных срабатываний близка к заданной.'
+        )
+        assert 0.005 < bloom.current_error_rate() < 0.02
+
+    def test_02_memory_follows_error_rate(self):
+        loose = BloomFilter(100_000, 0.01)
+        strict = BloomFilter(100_000, 0.0001)
+        assert len(loose.bits) == pytest.approx(119_814, rel=0.01)
+        assert len(strict.bits) == pytest.approx(2 * len(loose.bits), rel=0.01)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Available:
+
+    def test_01_free_values_skip_database(self, client, user, built_filter,
+                                          django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = client.get(AVAILABLE_URL, {
+                'username': 'free_name', 'email': 'free@yamdb.fake'
+            })
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'username': True, 'email': True}, (
+            f'Проверьте, что `{AVAILABLE_URL}` отвечает по фильтру Блума '
+            'без запроса к базе, если значения точно свободны.'
+        )
+
+    def test_02_taken_values(self, client, user, built_filter,
+                             django_assert_max_num_queries):
+        with django_assert_max_num_queries(1):
+            response = client.get(AVAILABLE_URL, {
+                'username': user.username, 'email': 'free@yamdb.fake'
+            })
+        assert response.json() == {'username': False, 'email': True}
+        response = client.get(AVAILABLE_URL, {'email': user.email})
+        assert response.json() == {'email': False}
+
+    def test_03_new_user_added(self, client, built_filter):
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'fresh', 'email': 'fresh@yamdb.fake'
+        })
+        response = client.get(AVAILABLE_URL, {'username': 'fresh'})
+        assert response.json() == {'username': False}, (
+            'Проверьте, что созданный пользователь сразу попадает в фильтр.'
+        )
+
+    def test_04_validation(self, client):
+        assert client.get(AVAILABLE_URL).status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+        response = client.get(AVAILABLE_URL, {'email': 'not-an-email'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_stale_filter_signup(self, client, built_filter,
+                                    django_user_model):
+        django_user_model.objects.bulk_create([django_user_model(
+            username='bulk', email='bulk@yamdb.fake'
+        )])
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'bulk', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что регистрация не ломается, если фильтр ещё не '
+            'знает о пользователе.'
+        )
+        assert 'username' in response.json()
+
+    def test_06_stats(self, admin_client, user_client, settings):
+        assert user_client.get(STATS_URL).status_code == HTTPStatus.FORBIDDEN
+        stats = admin_client.get(STATS_URL).json()
+        assert stats['error_rate'] == settings.SIGNUP_BLOOM['ERROR_RATE']
+        assert stats['capacity'] == settings.SIGNUP_BLOOM['CAPACITY']
+        assert stats['memory_bytes'] > 0
+        assert stats['entries'] == 4, (
+            'Проверьте, что фильтр содержит имя и почту каждого пользователя.'
+        )
+
+    def test_07_throttled(self, client, built_filter, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'available': '3/min'},
+        }
+        statuses = [
+            client.get(AVAILABLE_URL, {'username': f'name{idx}'}).status_code
+            for idx in range(4)
+        ]
+        assert statuses == [HTTPStatus.OK] * 3 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            f'Проверьте, что частые запросы к `{AVAILABLE_URL}` получают '
+            'ответ 429: иначе по нему можно бесплатно перебирать '
+            'зарегистрированные имена и адреса.'
+        )
+
+    def test_08_late_commit_below_max_pk(self, user, built_filter,
+                                         django_user_model):
+        def create(pk, name):
+            django_user_model.objects.bulk_create([django_user_model(
+                pk=pk, username=name, email=f'{name}@yamdb.fake'
+            )])
+
+        create(user.pk + 5, 'first')
+        taken_names.refresh()
+        # Транзакция с меньшим id закоммитилась позже.
+        create(user.pk + 2, 'late')
+        taken_names.refresh()
+        assert taken_names.maybe_taken(username='late') == {
+            'username': True
+        }, (
+            'Проверьте, что фильтр дочитывает пользователей с id меньше '
+            'уже прочитанного.'
+        )
+
+    def test_09_invalidated_by_other_process(self, user, built_filter,
+                                             django_user_model):
+        django_user_model.objects.bulk_create([django_user_model(
+            pk=user.pk + 10_000, username='imported',
+            email='imported@yamdb.fake',
+        )])
+        taken_names.refresh()
+        django_user_model.objects.bulk_create([django_user_model(
+            pk=user.pk + 5_000, username='explicit',
+            email='explicit@yamdb.fake',
+        )])
+        # Так import_csv в другом процессе сообщает о загрузке.
+        taken_names.get_cache().set(taken_names.VERSION_KEY, 'import', None)
+        taken_names.refresh()
+        rebuilder = taken_names.rebuilder
+        if rebuilder is not None:
+            rebuilder.join(5)
+        assert taken_names.version == 'import'
+        assert taken_names.maybe_taken(username='explicit') == {
+            'username': True
+        }, (
+            'Проверьте, что после загрузки в другом процессе фильтр '
+            'перестраивается.'
+        )
+
+    def test_10_built_at_startup(self, user):
+        taken_names.build_at_startup()
+        assert taken_names.built_at is not None
+        assert taken_names.maybe_taken(username=user.username) == {
+            'username': True
+        }
@@ -0,0 +1,136 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.settings import api_settings
+
+from api.v1.throttling import BucketStore, parse_rate
+from reviews.models import Review, Title
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+def signup_data(idx):
+    return {'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'}
+
+
+class Test19BucketStore:
+
+    def test_01_burst_and_refill(self):
+        store = BucketStore()
+        interval, burst = parse_rate('3/min')
+        assert (interval, burst) == (20, 3)
+        assert [store.take('k', interval, burst, now=0) for _ in range(3)] == [
+            0, 0, 0
+        ]
+        assert store.take('k', interval, burst, now=0) == 20, (
+            'Проверьте, что после исчерпания корзины возвращается время '
+            'ожидания до следующего маркера.'
+        )
+        assert store.take('k', interval, burst, now=5) == 15
+        assert store.take('k', interval, burst, now=20) == 0
+        assert store.take('other', interval, burst, now=20) == 0
+
+    def test_02_bounded_keys(self):
+        store = BucketStore(max_keys=1)
+        store.take('a', 10, 2, now=0)
+        store.take('b', 1, 1, now=0)
+        assert set(store.arrivals) == {'a', 'b'}, (
+            'Проверьте, что частично опустошённые корзины не вытесняются.'
+        )
+        for key in 'cde':
+            store.take(key, 1, 1, now=5)
+        assert set(store.arrivals) == {'a', 'c', 'd', 'e'}, (
+            'Проверьте, что при переполнении удаляются полные корзины.'
+        )
+        assert store.take('a', 10, 2, now=5) == 0
+        assert store.take('a', 10, 2, now=5) > 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Throttling:
+
+    def test_01_signup_throttled(self, client, settings,
+                                 django_assert_num_queries):
+        burst = int(
+            settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['signup']
+            .split('/')[0]
+        )
+        for idx in range(burst):
+            assert client.post(
+                SIGNUP_URL, data=signup_data(idx)
+            ).status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = client.post(SIGNUP_URL, data=signup_data(burst))
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{SIGNUP_URL}` получают '
+            'ответ со статусом 429 без обращения к базе.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After.'
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': 'user0', 'confirmation_code': 'wrong'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что у каждого эндпоинта своя корзина.'
+        )
+
+    def test_02_review_create_per_user(self, user_client, moderator_client,
+                                       settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'review_create': '2/min'},
+        }
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+        statuses = [
+            user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Текст', 'score': 5},
+            ).status_code
+            for title in titles
+        ]
+        assert statuses == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ]
+        assert Review.objects.count() == 2
+        response = moderator_client.post(
+            f'/api/v1/titles/{titles[2].id}/reviews/',
+            data={'text': 'Текст', 'score': 5},
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что корзина отзывов своя у каждого пользователя.'
+        )
+        response = user_client.get(f'/api/v1/titles/{titles[0].id}/reviews/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что чтение отзывов не ограничивается.'
+        )
+
+    def test_03_forwarded_for_ignored(self, client):
+        burst = int(
+            api_settings.DEFAULT_THROTTLE_RATES['signup'].split('/')[0]
+        )
+        statuses = [
+            client.post(
+                SIGNUP_URL, data=signup_data(idx),
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{idx}',
+            ).status_code
+            for idx in range(burst + 1)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без NUM_PROXIES анонимная корзина не зависит '
+            'от заголовка X-Forwarded-For.'
+        )
+
+    def test_04_rate_disabled(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'signup': None},
+        }
+        for idx in range(30):
+            assert client.post(
+                SIGNUP_URL, data=signup_data(idx)
+            ).status_code == HTTPStatus.OK
@@ -0,0 +1,142 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.test import AsyncClient
+from django.urls import resolve
+
+from api.v1 import async_views
+from reviews.models import Category, Genre, Review, Title
+
+
+def async_request(method, url, **kwargs):
+    async def send():
+        return await getattr(AsyncClient(), method)(url, **kwargs)
+    return async_to_sync(send)()
+
+
+def async_get(url, **kwargs):
+    return async_request('get', url, **kwargs)
+
+
+@pytest.fixture
+def catalog(user):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Ужасы', slug='horror')
+    title = Title.objects.create(name='Чужой', year=1979, category=category)
+    title.genre.add(genre)
+    Review.objects.create(title=title, author=user, text='Текст', score=8)
+    return title
+
+
+@pytest.fixture
+def db_hops(monkeypatch):
+    hops = []
+    original = async_views.run_in_db_thread
+
+    async def counting(func, *args, **kwargs):
+        hops.append(next(arg.path for arg in args if hasattr(arg, 'path')))
+        return await original(func, *args, **kwargs)
+
+    monkeypatch.setattr(async_views, 'run_in_db_thread', counting)
+    return hops
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20AsyncViews:
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/',
+        '/api/v1/titles/{id}/',
+        '/api/v1/titles/{id}/reviews/',
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/?genre=horror',
+    ))
+    def test_01_same_response_as_wsgi(self, client, catalog, db_hops, url):
+        url = url.format(id=catalog.id)
+        expected = client.get(url)
+        response = async_get(url)
+        assert response.status_code == expected.status_code == HTTPStatus.OK
+        assert response.json() == expected.json(), (
+            f'Проверьте, что `{url}` под ASGI отвечает так же, как под WSGI.'
+        )
+        assert response['Content-Type'] == expected['Content-Type']
+
+    def test_02_reads_use_db_pool(self, catalog, db_hops):
+        async_get(f'/api/v1/titles/{catalog.id}/')
+        assert db_hops == [f'/api/v1/titles/{catalog.id}/'], (
+            'Проверьте, что под ASGI чтение выполняется в пуле потоков базы.'
+        )
+
+    def test_03_cached_list_served_from_loop(self, catalog, db_hops,
+                                             settings):
+        # Кеш в памяти процесса читается без блокировки.
+        settings.RESPONSE_CACHE_ALIAS = 'default'
+        caches['default'].clear()
+        first = async_get('/api/v1/genres/')
+        second = async_get('/api/v1/genres/')
+        assert second.json() == first.json()
+        assert db_hops == ['/api/v1/genres/'], (
+            'Проверьте, что закешированный список отдаётся без перехода в '
+            'поток.'
+        )
+        async_get('/api/v1/genres/', authorization='Bearer invalid')
+        assert len(db_hops) == 2, (
+            'Проверьте, что запрос с токеном проходит аутентификацию DRF.'
+        )
+
+    def test_03_01_file_cache_read_off_loop(self, catalog, db_hops,
+                                         monkeypatch):
+        renders = []
+        original = async_views.render
+
+        def counting(view, request, **kwargs):
+            renders.append(request.path)
+            return original(view, request, **kwargs)
+
+        monkeypatch.setattr(async_views, 'render', counting)
+        first = async_get('/api/v1/genres/')
+        second = async_get('/api/v1/genres/')
+        assert second.json() == first.json()
+        assert db_hops == ['/api/v1/genres/'] * 2, (
+            'Проверьте, что файловый кеш читается в пуле потоков, а не в '
+            'цикле событий.'
+        )
+        assert renders == ['/api/v1/genres/'], (
+            'Проверьте, что закешированный список не выполняет вьюсет.'
+        )
+
+    def test_04_not_found(self, catalog):
+        response = async_get('/api/v1/titles/999999/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert async_get('/api/v1/titles/999999/reviews/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+
+    def test_05_writes_still_work(self, admin, catalog):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = async_request(
+            'post',
+            '/api/v1/genres/',
+            data={'name': 'Драма', 'slug': 'drama'},
+            content_type='application/json',
+            authorization=f'Bearer {AccessToken.for_user(admin)}',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Genre.objects.filter(slug='drama').exists()
+
+    def test_06_async_routes_only_under_asgi(self):
+        url = '/api/v1/titles/'
+        assert not asyncio.iscoroutinefunction(resolve(url).func), (
+            'Проверьте, что под WSGI каталог обслуживают обычные вьюсеты.'
+        )
+        assert asyncio.iscoroutinefunction(
+            resolve(url, urlconf=settings.ASGI_URLCONF).func
+        ), (
+            'Проверьте, что под ASGI подключены асинхронные представления.'
+        )
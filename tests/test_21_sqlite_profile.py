@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.utils import ConnectionHandler
+
+
+@pytest.fixture
+def production_db(settings, tmp_path):
+    """Соединения профиля production к одному файлу базы."""
+    opened = []
+
+    def connect(**options):
+        profile = settings.SQLITE_PRODUCTION
+        handler = ConnectionHandler({'default': {
+            **profile,
+            'NAME': str(tmp_path / 'db.sqlite3'),
+            'OPTIONS': {**profile['OPTIONS'], **options},
+        }})
+        opened.append(handler['default'])
+        return opened[-1]
+
+    yield connect
+    for wrapper in opened:
+        wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class Test21SqliteProfile:
+
+    def test_01_pragmas(self, production_db):
+        wrapper = production_db()
+        assert pragma(wrapper, 'journal_mode') == 'wal', (
+            'Проверьте, что профиль production включает журнал WAL.'
+        )
+        assert pragma(wrapper, 'synchronous') == 1
+        assert pragma(wrapper, 'busy_timeout') == 5000
+        assert pragma(wrapper, 'temp_store') == 2
+        assert pragma(wrapper, 'cache_size') == -64 * 1024
+        assert pragma(wrapper, 'foreign_keys') == 1, (
+            'Проверьте, что прагмы профиля не отменяют внешние ключи Django.'
+        )
+
+    def test_02_immediate_transactions(self, production_db):
+        writer = production_db()
+        other = production_db(pragmas={'busy_timeout': 10})
+        with writer.cursor() as cursor:
+            cursor.execute('CREATE TABLE item (value INTEGER)')
+            cursor.execute('INSERT INTO item VALUES (1)')
+        writer.set_autocommit(
+            False, force_begin_transaction_with_broken_autocommit=True
+        )
+        with writer.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+        with other.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            assert cursor.fetchone() == (1,), (
+                'Проверьте, что в режиме WAL чтение не ждёт транзакцию '
+                'записи.'
+            )
+            with pytest.raises(OperationalError, match='locked'):
+                cursor.execute('INSERT INTO item VALUES (2)')
+        writer.rollback()
+        writer.set_autocommit(True)
+
+    def test_03_invalid_transaction_mode(self, production_db):
+        with pytest.raises(ImproperlyConfigured):
+            production_db(transaction_mode='LAZY')
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='optimize_db обслуживает только SQLite.',
+    )
+    def test_04_optimize_db(self):
+        out = StringIO()
+        call_command('optimize_db', analyze=True, stdout=out)
+        assert 'ANALYZE' in out.getvalue()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master "
+                "WHERE name = 'sqlite_stat1'"
+            )
+            assert cursor.fetchone() == (1,), (
+                'Проверьте, что `manage.py optimize_db --analyze` собирает '
+                'статистику планировщика.'
+            )
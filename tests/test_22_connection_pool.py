@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+from django.db import connection
+
+from api_yamdb.backends import pool as pool_module
+from api_yamdb.backends.pool import ConnectionPool, PoolTimeout
+
+TITLES_URL = '/api/v1/titles/'
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options):
+    return ConnectionPool(
+        FakeConnection, lambda connection: connection.alive, **options
+    )
+
+
+class Test22ConnectionPool:
+
+    def test_01_reuse(self):
+        pool = make_pool()
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first, (
+            'Проверьте, что пул отдаёт возвращённое соединение повторно.'
+        )
+        assert pool.stats()['connects'] == 1
+        assert pool.stats()['reuses'] == 1
+
+    def test_02_bounded(self):
+        pool = make_pool(max_size=1, timeout=0.05)
+        busy = pool.acquire()
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.release, (busy,))
+        timer.start()
+        assert pool.acquire() is busy, (
+            'Проверьте, что ожидающий поток получает освободившееся '
+            'соединение.'
+        )
+        timer.join()
+        assert pool.stats()['size'] == 1
+
+    def test_03_health_check(self):
+        pool = make_pool(check_after=0)
+        dead = pool.acquire()
+        pool.release(dead)
+        dead.alive = False
+        fresh = pool.acquire()
+        assert fresh is not dead and dead.closed, (
+            'Проверьте, что пул закрывает соединение, не прошедшее '
+            'проверку, и открывает новое.'
+        )
+        assert pool.stats()['size'] == 1
+
+    def test_04_idle_and_broken(self):
+        pool = make_pool(max_idle=0)
+        idle = pool.acquire()
+        pool.release(idle)
+        assert pool.acquire() is not idle and idle.closed
+        broken = pool.acquire()
+        pool.release(broken, reusable=False)
+        assert broken.closed
+        assert pool.stats()['size'] == 1
+
+    def test_05_after_fork(self, monkeypatch):
+        pool = make_pool()
+        monkeypatch.setattr(pool_module, '_pools', {'key': pool})
+        monkeypatch.setattr(pool_module, '_inherited', [])
+        idle, in_use = pool.acquire(), pool.acquire()
+        pool.release(idle)
+        pool_module._after_fork()
+        assert pool.stats()['size'] == 0
+        pool.release(in_use)
+        assert not (idle.closed or in_use.closed), (
+            'Проверьте, что после fork пул не закрывает соединения '
+            'родительского процесса.'
+        )
+        assert pool.acquire() not in (idle, in_use)
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='Пул есть только у PostgreSQL.'
+)
+@pytest.mark.django_db(transaction=True)
+def test_requests_reuse_connection(client):
+    client.get(TITLES_URL)
+    before = connection.pool.stats()
+    for _ in range(3):
+        # Тестовый клиент не закрывает соединение в конце запроса, как
+        # это делает сервер при CONN_MAX_AGE = 0.
+        connection.close()
+        assert client.get(TITLES_URL).status_code == 200
+    after = connection.pool.stats()
+    assert after['reuses'] - before['reuses'] == 3
+    assert after['connects'] == before['connects'], (
+        'Проверьте, что запросы берут соединение из пула, а не открывают '
+        'новое.'
+    )
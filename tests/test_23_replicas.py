@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections
+
+from api_yamdb import replicas
+from reviews.models import Category, Genre, Title
+from tests.test_20_async_views import async_get
+
+TITLES_URL = '/api/v1/titles/'
+
+
+@pytest.fixture
+def replica(db, settings, tmp_path):
+    """Реплика — отдельный файл SQLite, который не догоняет основную
+    базу: видно, откуда прочитаны данные."""
+    alias = 'replica'
+    connections.settings[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    connections.ensure_defaults(alias)
+    connections.prepare_test_settings(alias)
+    call_command('migrate', database=alias, verbosity=0)
+    settings.DATABASE_REPLICAS = [alias]
+    replicas.replica_lag.clear()
+    replicas.get_pins().clear()
+    Title.objects.using(alias).create(name='С реплики', year=2000)
+    yield alias
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+def create_title(client):
+    Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.create(name='Драма', slug='drama')
+    response = client.post(TITLES_URL, data={
+        'name': 'Новое', 'year': 2000, 'category': 'films', 'genre': 'drama',
+    })
+    assert response.status_code == HTTPStatus.CREATED
+    return f'{TITLES_URL}{response.json()["id"]}/'
+
+
+def names(response):
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db
+class Test23Replicas:
+
+    def test_01_reads_from_replica(self, client, replica):
+        Title.objects.create(name='С основной', year=2000)
+        assert names(client.get(TITLES_URL)) == ['С реплики'], (
+            f'Проверьте, что GET-запрос к `{TITLES_URL}` читает с реплики.'
+        )
+        assert names(async_get(TITLES_URL)) == ['С реплики'], (
+            'Проверьте, что асинхронные представления тоже читают с '
+            'реплики.'
+        )
+        assert Title.objects.filter(name='С основной').exists(), (
+            'Проверьте, что вне запросов к API чтение идёт с основной базы.'
+        )
+
+    def test_02_writer_pinned_to_primary(self, admin_client, client,
+                                         replica):
+        url = create_title(admin_client)
+        assert not Title.objects.using(replica).filter(name='Новое').exists()
+        assert admin_client.get(url).json()['name'] == 'Новое', (
+            'Проверьте, что после записи пользователь читает с основной '
+            'базы и видит свои изменения.'
+        )
+        assert client.get(url).json().get('name') != 'Новое', (
+            'Проверьте, что другие клиенты по-прежнему читают с реплики.'
+        )
+
+    def test_03_pinning_disabled(self, admin_client, settings, replica):
+        settings.REPLICA_PIN_SECONDS = 0
+        url = create_title(admin_client)
+        assert admin_client.get(url).json().get('name') != 'Новое'
+
+    def test_04_lagging_replica(self, client, settings, monkeypatch,
+                                replica):
+        Title.objects.create(name='С основной', year=2000)
+        settings.REPLICA_MAX_LAG = 5
+        monkeypatch.setattr(replicas, 'measure_lag', lambda alias: 30)
+        assert names(client.get(TITLES_URL)) == ['С основной'], (
+            'Проверьте, что реплика с отставанием больше REPLICA_MAX_LAG '
+            'не получает чтений.'
+        )
+        monkeypatch.setattr(replicas, 'measure_lag', lambda alias: 1)
+        replicas.replica_lag.clear()
+        assert names(client.get(TITLES_URL)) == ['С реплики']
+
+    def test_05_without_replicas(self, client):
+        Title.objects.create(name='С основной', year=2000)
+        assert names(client.get(TITLES_URL)) == ['С основной']
+
+    def test_06_process_local_pins_rejected(self, settings, replica):
+        settings.REPLICA_PIN_CACHE_ALIAS = 'default'
+        with pytest.raises(ImproperlyConfigured):
+            replicas.ReplicaMiddleware(lambda request: None)
+        settings.REPLICA_PIN_SECONDS = 0
+        replicas.ReplicaMiddleware(lambda request: None)
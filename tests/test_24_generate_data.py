@@ -0,0 +1,135 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+
+from reviews.generator import Generator, Plan, review_counts
+from reviews.management.commands._bulk import secondary_indexes
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+COMMAND_OPTIONS = {
+    'users': 30, 'titles': 20, 'reviews': 200, 'categories': 3,
+    'genres': 5, 'comments': 0.5, 'batch_size': 64,
+}
+
+
+def constraint_names(model):
+    with connection.cursor() as cursor:
+        return set(connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        ))
+
+
+class Test24ReviewCounts:
+
+    def test_01_zipf(self):
+        counts = review_counts(100, 5000, 1000, 1.1)
+        assert sum(counts) == 5000
+        assert counts == sorted(counts, reverse=True), (
+            'Проверьте, что число отзывов не растёт с рангом произведения.'
+        )
+        assert counts[0] > 10 * counts[-1]
+
+    def test_02_capped_by_users(self):
+        counts = review_counts(10, 95, 10, 2.0)
+        assert sum(counts) == 95
+        assert max(counts) == 10, (
+            'Проверьте, что у произведения не больше отзывов, чем '
+            'пользователей: автор пишет один отзыв на произведение.'
+        )
+        with pytest.raises(ValueError):
+            review_counts(10, 101, 10, 1.1)
+
+    def test_03_seeded(self):
+        plan = Plan(users=50, titles=20, reviews=300, seed=7)
+        start = {model: 1 for model in (User, Title, Review, Comment)}
+
+        def rows(seed):
+            generator = Generator(
+                Plan(**{**plan.__dict__, 'seed': seed}), connection, start
+            )
+            return (
+                list(generator.reviews()),
+                list(generator.comments(range(1, 301))),
+            )
+
+        assert rows(7) == rows(7), (
+            'Проверьте, что одно зерно даёт одни и те же строки.'
+        )
+        assert rows(7) != rows(8)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24GenerateData:
+
+    def test_01_generate(self):
+        indexes = {
+            model: constraint_names(model) for model in (Review, Comment)
+        }
+        out = StringIO()
+        call_command('generate_data', stdout=out, **COMMAND_OPTIONS)
+        assert User.objects.count() == 30
+        assert Title.objects.count() == 20
+        assert Review.objects.count() == 200
+        assert Comment.objects.exists()
+        assert not Review.objects.values('title', 'author').annotate(
+            count=Count('id')
+        ).filter(count__gt=1).exists(), (
+            'Проверьте, что автор пишет не больше одного отзыва на '
+            'произведение.'
+        )
+        title = Title.objects.annotate(
+            reviews_total=Count('reviews')
+        ).order_by('-reviews_total').first()
+        assert title.review_count == title.reviews_total, (
+            'Проверьте, что после генерации рейтинги пересчитываются.'
+        )
+        for model, names in indexes.items():
+            assert constraint_names(model) == names, (
+                'Проверьте, что снятые на время вставки индексы '
+                'построены заново.'
+            )
+        assert 'reviews_review: 200 строк' in out.getvalue()
+
+        call_command('generate_data', stdout=StringIO(), **COMMAND_OPTIONS)
+        assert Review.objects.count() == 400, (
+            'Проверьте, что повторный запуск дописывает данные к '
+            'существующим.'
+        )
+        assert User.objects.create(username='new', email='new@fake.fake')
+
+    def test_02_reproducible(self):
+        call_command('generate_data', stdout=StringIO(), **COMMAND_OPTIONS)
+        first = list(Review.objects.order_by('pk').values_list(
+            'title', 'author', 'score', 'pub_date'
+        ))
+        Comment.objects.all().delete()
+        Review.objects.all().delete()
+        Title.objects.all().delete()
+        User.objects.all().delete()
+        call_command('generate_data', stdout=StringIO(), **COMMAND_OPTIONS)
+        second = list(Review.objects.order_by('pk').values_list(
+            'title__name', 'author__username', 'score', 'pub_date'
+        ))
+        assert [row[2:] for row in first] == [row[2:] for row in second]
+
+    def test_03_secondary_indexes(self):
+        names = {index.name for index in secondary_indexes(Review)}
+        assert {
+            'review_title_pub_date_idx', 'review_author_pub_date_idx'
+        } <= names
+        assert len(names) >= 4, (
+            'Проверьте, что снимаются и индексы внешних ключей.'
+        )
+
+    def test_04_invalid_options(self):
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_data', users=5, titles=2, reviews=11,
+                stdout=StringIO(),
+            )
+        with pytest.raises(CommandError):
+            call_command('generate_data', users=0, stdout=StringIO())